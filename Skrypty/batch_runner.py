@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse
+import concurrent.futures
+import os
+import time
+from typing import Iterator, List, NamedTuple, Optional
+
+from distance_store import GetDistanceStore
+from random_streams import CreateReplicateRandomGenerator
+from replicate_statistics import (DEFAULT_CONFIDENCE_LEVEL, MIN_REPLICATES_FOR_STOPPING,
+                                  CalculateObjectiveFunctionValue, ReplicatesAggregator)
+from results_store import ResultsStore, RunRecord
+from scenario_classes import GetScenarioTemplate
+from simulation import Simulation, SimulationResultsTuple, SolutionRecord
+
+# Stałe
+DEFAULT_MASTER_SEED: int = 0
+# Co tyle replikacji wypisywana jest przepustowość
+PROGRESS_REPORT_INTERVAL: int = 100
+# Większe paczki opóźniają zwracanie wyników i przerwanie serii, bo rozpoczętej paczki nie można anulować
+MAX_REPLICATES_PER_TASK: int = 8
+
+
+class ReplicateTask(NamedTuple):
+    scenario_path: str
+    master_seed: int
+    replicate_index: int
+
+
+class ReplicateResult(NamedTuple):
+    replicate_index: int
+    results: SimulationResultsTuple
+    solution: List[SolutionRecord]
+
+    def __repr__(self):
+        return f"replikacja: {self.replicate_index}, wyniki: {tuple(self.results)}"
+
+
+class ThroughputMeter:
+    """Mierzy liczbę wykonanych symulacji na sekundę od utworzenia obiektu"""
+    start_time: float
+    runs_count: int
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.runs_count = 0
+
+    def __repr__(self):
+        return f"wykonane symulacje: {self.runs_count}, przepustowość: {self.GetRunsPerSecond():.2f} symulacji/s"
+
+    def CountRun(self):
+        self.runs_count += 1
+
+    def GetRunsPerSecond(self) -> float:
+        elapsed_seconds: float = time.perf_counter() - self.start_time
+        return self.runs_count / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+
+def RunReplicate(task: ReplicateTask) -> ReplicateResult:
+    """
+    Wykonywane w procesie roboczym - każda replikacja ma własny generator, więc wynik nie zależy od procesu.
+    Scenariusz jest wczytywany tylko przy pierwszej replikacji w danym procesie. Procesy robocze puli nie wywołują
+    funkcji atexit, dlatego odległości policzone w trakcie replikacji są zapisywane od razu po niej
+    """
+    simulation: Simulation = Simulation(
+        GetScenarioTemplate(task.scenario_path),
+        random_generator=CreateReplicateRandomGenerator(task.master_seed, task.replicate_index)
+    )
+    replicate_result: ReplicateResult = ReplicateResult(
+        task.replicate_index, simulation.PerformSimulation(), simulation.solution
+    )
+    GetDistanceStore().Flush()
+    return replicate_result
+
+
+def IterateReplicatesResults(
+        scenario_path: str, replicates_count: int, master_seed: int = DEFAULT_MASTER_SEED,
+        workers_count: Optional[int] = None, throughput_meter: Optional[ThroughputMeter] = None
+) -> Iterator[ReplicateResult]:
+    """
+    Wykonuje replikacje scenariusza w puli procesów i zwraca wyniki w kolejności replikacji, gdy tylko są gotowe.
+    Generator replikacji jest wyprowadzany z ziarna głównego i jej numeru. Po przerwaniu iteracji replikacje jeszcze
+    nierozpoczęte są anulowane
+    """
+    if replicates_count < 0:
+        raise ValueError(f"Liczba replikacji nie może być ujemna: {replicates_count}")
+    tasks: Iterator[ReplicateTask] = (
+        ReplicateTask(scenario_path, master_seed, replicate_index)
+        for replicate_index in range(replicates_count)
+    )
+    workers_count = workers_count or os.cpu_count() or 1
+    # Kilka replikacji na zadanie zmniejsza narzut komunikacji między procesami przy krótkich symulacjach
+    chunk_size: int = max(1, min(replicates_count // (workers_count * 4), MAX_REPLICATES_PER_TASK))
+    executor: concurrent.futures.ProcessPoolExecutor = concurrent.futures.ProcessPoolExecutor(max_workers=workers_count)
+    try:
+        for replicate_result in executor.map(RunReplicate, tasks, chunksize=chunk_size):
+            if throughput_meter is not None:
+                throughput_meter.CountRun()
+            yield replicate_result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def RunReplicatesUntilPrecisionReached(
+        scenario_path: str, max_replicates_count: int, target_half_width: Optional[float],
+        master_seed: int = DEFAULT_MASTER_SEED, workers_count: Optional[int] = None,
+        confidence_level: float = DEFAULT_CONFIDENCE_LEVEL, min_replicates_count: int = MIN_REPLICATES_FOR_STOPPING,
+        throughput_meter: Optional[ThroughputMeter] = None, results_store: Optional[ResultsStore] = None,
+        print_progress: bool = False
+) -> ReplicatesAggregator:
+    """
+    Wykonuje replikacje, dopóki połowa szerokości przedziału ufności funkcji celu jest większa od docelowej, ale nie
+    więcej niż max_replicates_count. Wyniki są przetwarzane w kolejności replikacji, więc miejsce zatrzymania nie
+    zależy od szybkości procesów. Każda replikacja jest dopisywana do magazynu wyników, jeśli go podano - zapis
+    niezapisanych przebiegów (Flush) należy do wywołującego
+    """
+    aggregator: ReplicatesAggregator = ReplicatesAggregator(confidence_level=confidence_level)
+    scenario_name: str = os.path.splitext(os.path.basename(scenario_path))[0]
+    for replicate_result in IterateReplicatesResults(
+            scenario_path, max_replicates_count, master_seed, workers_count, throughput_meter
+    ):
+        aggregator.AddResults(replicate_result.results)
+        if results_store is not None:
+            results_store.AppendRun(RunRecord(
+                scenario_name, master_seed, replicate_result.replicate_index, replicate_result.results,
+                CalculateObjectiveFunctionValue(replicate_result.results, aggregator.weights), replicate_result.solution
+            ))
+        if print_progress:
+            print(replicate_result)
+            if throughput_meter is not None and throughput_meter.runs_count % PROGRESS_REPORT_INTERVAL == 0:
+                print(throughput_meter)
+        if aggregator.IsPrecisionReached(target_half_width, min_replicates_count):
+            if print_progress:
+                print("Osiągnięto docelową szerokość przedziału ufności funkcji celu")
+            break
+    return aggregator
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Wykonuje wiele replikacji symulacji scenariusza równolegle, bez interfejsu graficznego"
+    )
+    parser.add_argument("scenario", help="ścieżka do pliku scenariusza")
+    parser.add_argument("replicates_count", type=int, help="(maksymalna) liczba replikacji")
+    parser.add_argument("--master-seed", type=int, default=DEFAULT_MASTER_SEED, help="ziarno główne serii replikacji")
+    parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--target-half-width", type=float, default=None,
+                        help="docelowa połowa szerokości przedziału ufności funkcji celu - po jej osiągnięciu "
+                             "replikacje są przerywane")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE_LEVEL, help="poziom ufności")
+    parser.add_argument("--min-replicates", type=int, default=MIN_REPLICATES_FOR_STOPPING,
+                        help="minimalna liczba replikacji przed przerwaniem")
+    parser.add_argument("--results-store", default=None,
+                        help="katalog magazynu wyników, do którego dopisywane są wszystkie replikacje")
+    arguments: argparse.Namespace = parser.parse_args()
+    throughput_meter: ThroughputMeter = ThroughputMeter()
+    results_store: Optional[ResultsStore] = ResultsStore(arguments.results_store) if arguments.results_store else None
+    aggregator: ReplicatesAggregator = RunReplicatesUntilPrecisionReached(
+        arguments.scenario, arguments.replicates_count, arguments.target_half_width, arguments.master_seed,
+        arguments.workers, arguments.confidence, arguments.min_replicates, throughput_meter, results_store,
+        print_progress=True
+    )
+    if results_store is not None:
+        results_store.Flush()
+    print(throughput_meter)
+    print(aggregator)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse
+import glob
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from places_database import GetPlacesDatabase, PlacesDatabase
+from scenario_classes import ADDRESS_DATA_TITLE
+from utilities import (GEOCODING_API_URL, GeocodeAddressUsingAPI, NormalizeAddressString, PLACES_CSV_FILE,
+                       PLACES_CSV_FILE_ADDRESS_COLUMN_NAME, PlaceAddress)
+
+# Własne typy
+Coordinates = Tuple[float, float]
+
+# Stałe
+TEAMS_CSV_FILE: str = "../Dane/ZRM.csv"
+TEAMS_CSV_ADDRESS_COLUMN_NAME: str = "Adres"
+HOSPITALS_CSV_FILE: str = "../Dane/SOR.csv"
+HOSPITALS_CSV_ADDRESS_COLUMN_NAME: str = "Adres"
+SCENARIOS_FILES_PATTERN: str = "../Scenariusze/Scenariusz *.txt"
+DEFAULT_REQUESTS_PER_SECOND: float = 5.0
+DEFAULT_WORKERS_COUNT: int = 8
+RETRIES_COUNT: int = 3
+RETRY_BACKOFF_FACTOR_SECONDS: float = 0.5
+RETRY_STATUS_CODES: List[int] = [429, 500, 502, 503, 504]
+
+
+class RateLimiter:
+    """Rozkłada zapytania z wielu wątków równomiernie w czasie, tak aby nie przekroczyć zadanej liczby na sekundę"""
+    interval_seconds: float
+    next_request_time: float
+    lock: threading.Lock
+
+    def __init__(self, requests_per_second: float):
+        if requests_per_second <= 0:
+            raise ValueError("Liczba zapytań na sekundę musi być dodatnia")
+        self.interval_seconds = 1 / requests_per_second
+        self.next_request_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def Wait(self):
+        with self.lock:
+            request_time: float = max(self.next_request_time, time.monotonic())
+            self.next_request_time = request_time + self.interval_seconds
+        time.sleep(max(request_time - time.monotonic(), 0))
+
+
+class BulkGeocodingSummary(NamedTuple):
+    unknown_addresses_count: int
+    geocoded_addresses_count: int
+    failed_addresses: List[str]
+
+    def __repr__(self):
+        return (f"nieznane adresy: {self.unknown_addresses_count}, zakodowane: {self.geocoded_addresses_count}, "
+                f"błędy: {self.failed_addresses}")
+
+
+def CreatePooledSession(workers_count: int = DEFAULT_WORKERS_COUNT) -> requests.Session:
+    """
+    Sesja z pulą połączeń dla wszystkich wątków - bez ponawiania w adapterze, bo ponowienia muszą przechodzić przez
+    ogranicznik liczby zapytań
+    """
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(pool_connections=workers_count, pool_maxsize=workers_count)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def ToAddressForAPIRequests(address_string: str) -> str:
+    return PlaceAddress.GetAddressForAPIRequestsFromParts(
+        PlaceAddress.DivideAddressIntoParts(NormalizeAddressString(address_string))
+    )
+
+
+def ReadAddressesFromDataFiles(teams_csv_file: str = TEAMS_CSV_FILE, hospitals_csv_file: str = HOSPITALS_CSV_FILE,
+                               scenarios_paths: Optional[List[str]] = None) -> List[str]:
+    """Zbiera bez powtórzeń adresy baz ZRM, szpitali i miejsc zdarzeń ze scenariuszy"""
+    address_strings: List[str] = []
+    for csv_file, column_name in [(teams_csv_file, TEAMS_CSV_ADDRESS_COLUMN_NAME),
+                                  (hospitals_csv_file, HOSPITALS_CSV_ADDRESS_COLUMN_NAME)]:
+        address_strings.extend(
+            pd.read_csv(csv_file, encoding="utf-8-sig", sep=";", index_col=0)[column_name].dropna().tolist()
+        )
+    if scenarios_paths is None:
+        scenarios_paths = sorted(glob.glob(SCENARIOS_FILES_PATTERN))
+    for scenario_path in scenarios_paths:
+        with open(scenario_path, encoding="utf-8") as file:
+            address_part: str = file.read().split("\n\n")[-1]
+        address_strings.append(address_part.strip()[len(ADDRESS_DATA_TITLE):])
+    return list(dict.fromkeys(ToAddressForAPIRequests(address_string) for address_string in address_strings))
+
+
+def ReadKnownAddresses(places_csv_file: str = PLACES_CSV_FILE,
+                       places_database: Optional[PlacesDatabase] = None) -> Set[str]:
+    if places_database is not None:
+        return {
+            address for address, in places_database.GetConnection().execute("SELECT address FROM places").fetchall()
+        }
+    places_coordinates_df: pd.DataFrame = pd.read_csv(places_csv_file, header=0, index_col=0, encoding="utf-8")
+    return set(places_coordinates_df[PLACES_CSV_FILE_ADDRESS_COLUMN_NAME].dropna())
+
+
+def IsRetryableError(error: requests.RequestException) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return error.response is not None and error.response.status_code in RETRY_STATUS_CODES
+
+
+def GeocodeAddresses(addresses: List[str], url: str = GEOCODING_API_URL,
+                     requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                     workers_count: int = DEFAULT_WORKERS_COUNT,
+                     retry_backoff_seconds: float = RETRY_BACKOFF_FACTOR_SECONDS
+                     ) -> Tuple[Dict[str, Coordinates], List[str]]:
+    """
+    Koduje adresy równolegle, zwraca słownik współrzędnych oraz listę adresów, których nie udało się zakodować.
+    Zapytania odrzucone przez serwer (429, 5xx) lub przerwane są ponawiane z rosnącym odstępem - każda próba czeka
+    na ogranicznik, więc ponowienia nie przekraczają zadanej liczby zapytań na sekundę
+    """
+    rate_limiter: RateLimiter = RateLimiter(requests_per_second)
+    session: requests.Session = CreatePooledSession(workers_count)
+
+    def GeocodeOneAddress(address: str) -> Optional[Coordinates]:
+        for attempt in range(RETRIES_COUNT + 1):
+            if attempt:
+                time.sleep(retry_backoff_seconds * 2 ** (attempt - 1))
+            rate_limiter.Wait()
+            try:
+                return GeocodeAddressUsingAPI(address, url, session)
+            except requests.RequestException as error:
+                if not IsRetryableError(error):
+                    return None
+            except (KeyError, IndexError, ValueError):
+                return None
+        return None
+
+    with session, ThreadPoolExecutor(max_workers=workers_count) as executor:
+        results: List[Optional[Coordinates]] = list(executor.map(GeocodeOneAddress, addresses))
+    coordinates: Dict[str, Coordinates] = {
+        address: result for address, result in zip(addresses, results) if result is not None
+    }
+    failed_addresses: List[str] = [address for address, result in zip(addresses, results) if result is None]
+    return coordinates, failed_addresses
+
+
+def SaveCoordinatesBatch(coordinates: Dict[str, Coordinates], places_csv_file: str = PLACES_CSV_FILE,
+                         places_database: Optional[PlacesDatabase] = None):
+    """Zapisuje wszystkie nowe współrzędne jednym zapisem pliku (lub jedną transakcją bazy)"""
+    if not coordinates:
+        return
+    if places_database is not None:
+        connection = places_database.GetConnection()
+        with places_database.connection_lock, connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT OR IGNORE INTO places (address, latitude, longitude) VALUES (?, ?, ?)",
+                [(address, latitude, longitude) for address, (latitude, longitude) in coordinates.items()]
+            )
+        return
+    places_coordinates_df: pd.DataFrame = pd.read_csv(places_csv_file, header=0, index_col=0, encoding="utf-8")
+    for address, (latitude, longitude) in coordinates.items():
+        places_coordinates_df.loc[len(places_coordinates_df.index) + 1] = [
+            address, ",".join([str(latitude), str(longitude)])
+        ]
+    places_coordinates_df.to_csv(places_csv_file, header=True, index_label="Lp.", encoding="utf-8")
+
+
+def GeocodeUnknownAddresses(addresses: List[str], url: str = GEOCODING_API_URL,
+                            requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                            workers_count: int = DEFAULT_WORKERS_COUNT,
+                            places_csv_file: str = PLACES_CSV_FILE) -> BulkGeocodingSummary:
+    places_database: Optional[PlacesDatabase] = GetPlacesDatabase()
+    known_addresses: Set[str] = ReadKnownAddresses(places_csv_file, places_database)
+    unknown_addresses: List[str] = [address for address in addresses if address not in known_addresses]
+    coordinates, failed_addresses = GeocodeAddresses(unknown_addresses, url, requests_per_second, workers_count)
+    SaveCoordinatesBatch(coordinates, places_csv_file, places_database)
+    return BulkGeocodingSummary(len(unknown_addresses), len(coordinates), failed_addresses)
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Koduje na współrzędne wszystkie nieznane adresy z plików ZRM.csv, SOR.csv i scenariuszy"
+    )
+    parser.add_argument("scenarios", nargs="*", help="ścieżki do plików scenariuszy (domyślnie wszystkie)")
+    parser.add_argument("--url", default=GEOCODING_API_URL, help="adres API geokodowania")
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="maksymalna liczba zapytań na sekundę")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS_COUNT, help="liczba równoległych wątków")
+    arguments: argparse.Namespace = parser.parse_args()
+    addresses: List[str] = ReadAddressesFromDataFiles(scenarios_paths=arguments.scenarios or None)
+    print(GeocodeUnknownAddresses(addresses, arguments.url, arguments.requests_per_second, arguments.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from distance_store import DistanceSource, GetDistanceStore
+from scenario_classes import Scenario
+from utilities import (CalculateDrivingMatrixUsingAPI, MATRIX_API_MAX_PLACES_PER_REQUEST, MATRIX_API_URL,
+                       PlaceAddress)
+
+# Własne typy
+PlacesPair = Tuple[PlaceAddress, PlaceAddress]
+
+
+class PrefetchSummary(NamedTuple):
+    required_pairs_count: int
+    missing_pairs_count: int
+    requests_count: int
+
+    def __repr__(self):
+        return (f"wymagane pary: {self.required_pairs_count}, brakujące pary: {self.missing_pairs_count}, "
+                f"zapytania do API: {self.requests_count}")
+
+
+class ReverseDirectionReport(NamedTuple):
+    required_pairs_count: int
+    missing_pairs_count: int
+    covered_by_reverse_direction_count: int
+
+    def __repr__(self):
+        return (f"wymagane pary: {self.required_pairs_count}, brakujące pary: {self.missing_pairs_count}, "
+                f"zaoszczędzone zapytania dzięki parom odwrotnym: {self.covered_by_reverse_direction_count}")
+
+
+def GetRequiredPlacesPairs(scenario: Scenario) -> List[PlacesPair]:
+    """
+    Zwraca pary miejsc, między którymi mogą przemieszczać się zespoły w trakcie symulacji: z baz i szpitali na miejsce
+    zdarzenia oraz z miejsca zdarzenia do szpitali
+    """
+    incident_address: PlaceAddress = scenario.address
+    teams_bases: List[PlaceAddress] = UniqueAddresses([team.origin_location_address for team in scenario.teams])
+    hospitals_addresses: List[PlaceAddress] = UniqueAddresses([hospital.address for hospital in scenario.hospitals])
+    required_pairs: List[PlacesPair] = [
+        (origin, incident_address) for origin in UniqueAddresses(teams_bases + hospitals_addresses)
+    ]
+    required_pairs.extend((incident_address, hospital_address) for hospital_address in hospitals_addresses)
+    return [(origin, destination) for origin, destination in required_pairs if origin != destination]
+
+
+def UniqueAddresses(addresses: List[PlaceAddress]) -> List[PlaceAddress]:
+    unique_addresses: Dict[str, PlaceAddress] = {}
+    for address in addresses:
+        unique_addresses.setdefault(address.address_for_api_requests, address)
+    return list(unique_addresses.values())
+
+
+def FindMissingPlacesPairs(required_pairs: List[PlacesPair], distance_store: DistanceSource) -> List[PlacesPair]:
+    return [
+        (origin, destination) for origin, destination in required_pairs
+        if not distance_store.IsPairPresent(origin.address_for_api_requests, destination.address_for_api_requests)
+    ]
+
+
+def PrefetchMissingDistances(scenario: Scenario, distance_store: Optional[DistanceSource] = None,
+                             api_url: str = MATRIX_API_URL) -> PrefetchSummary:
+    """Uzupełnia brakujące odległości dla scenariusza kilkoma zbiorczymi zapytaniami N×M"""
+    if distance_store is None:
+        distance_store = GetDistanceStore()
+    required_pairs: List[PlacesPair] = GetRequiredPlacesPairs(scenario)
+    missing_pairs: List[PlacesPair] = FindMissingPlacesPairs(required_pairs, distance_store)
+    requests_count: int = 0
+    for origins, destinations in DivideMissingPairsIntoBatches(missing_pairs):
+        distances, durations = CalculateDrivingMatrixUsingAPI(origins, destinations, api_url)
+        requests_count += 1
+        for i, origin in enumerate(origins):
+            for j, destination in enumerate(destinations):
+                if origin != destination:
+                    distance_store.SaveDistanceAndDuration(
+                        origin.address_for_api_requests, destination.address_for_api_requests,
+                        distances[i][j], durations[i][j]
+                    )
+    distance_store.Flush()
+    return PrefetchSummary(len(required_pairs), len(missing_pairs), requests_count)
+
+
+def CountPairsCoveredByReverseDirection(scenario: Scenario, distance_store: Optional[DistanceSource] = None) \
+        -> ReverseDirectionReport:
+    """Zlicza brakujące pary scenariusza, dla których zapisana jest para odwrotna - bez zapytań do API"""
+    if distance_store is None:
+        distance_store = GetDistanceStore()
+    required_pairs: List[PlacesPair] = GetRequiredPlacesPairs(scenario)
+    fallback_settings: Tuple[bool, float] = (distance_store.reverse_direction_fallback, distance_store.asymmetry_factor)
+    try:
+        distance_store.SetReverseDirectionFallback(False)
+        missing_pairs: List[PlacesPair] = FindMissingPlacesPairs(required_pairs, distance_store)
+        covered_pairs: List[PlacesPair] = FindMissingPlacesPairs(
+            [(destination, origin) for origin, destination in missing_pairs], distance_store
+        )
+    finally:
+        distance_store.SetReverseDirectionFallback(*fallback_settings)
+    return ReverseDirectionReport(len(required_pairs), len(missing_pairs), len(missing_pairs) - len(covered_pairs))
+
+
+def DivideMissingPairsIntoBatches(missing_pairs: List[PlacesPair]) \
+        -> List[Tuple[List[PlaceAddress], List[PlaceAddress]]]:
+    """
+    Dzieli brakujące pary na zapytania: pary o tym samym miejscu docelowym są grupowane, a każde zapytanie obejmuje
+    co najwyżej MATRIX_API_MAX_PLACES_PER_REQUEST miejsc początkowych i docelowych
+    """
+    origins_by_destination: Dict[str, List[PlaceAddress]] = {}
+    destinations: Dict[str, PlaceAddress] = {}
+    for origin, destination in missing_pairs:
+        destinations.setdefault(destination.address_for_api_requests, destination)
+        origins_by_destination.setdefault(destination.address_for_api_requests, []).append(origin)
+    destinations_by_origins: Dict[Tuple[str, ...], List[PlaceAddress]] = {}
+    origins_for_key: Dict[Tuple[str, ...], List[PlaceAddress]] = {}
+    for destination_key, origins in origins_by_destination.items():
+        origins_key: Tuple[str, ...] = tuple(sorted(origin.address_for_api_requests for origin in origins))
+        destinations_by_origins.setdefault(origins_key, []).append(destinations[destination_key])
+        origins_for_key.setdefault(origins_key, origins)
+    batches: List[Tuple[List[PlaceAddress], List[PlaceAddress]]] = []
+    for origins_key, batch_destinations in destinations_by_origins.items():
+        batch_origins: List[PlaceAddress] = origins_for_key[origins_key]
+        for i in range(0, len(batch_origins), MATRIX_API_MAX_PLACES_PER_REQUEST):
+            for j in range(0, len(batch_destinations), MATRIX_API_MAX_PLACES_PER_REQUEST):
+                batches.append((
+                    batch_origins[i:i + MATRIX_API_MAX_PLACES_PER_REQUEST],
+                    batch_destinations[j:j + MATRIX_API_MAX_PLACES_PER_REQUEST]
+                ))
+    return batches
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Pobiera brakujące odległości i czasy przejazdu dla scenariuszy przed symulacją"
+    )
+    parser.add_argument("scenarios", nargs="+", help="ścieżki do plików scenariuszy")
+    parser.add_argument("--api-url", default=MATRIX_API_URL, help="adres API macierzy odległości")
+    parser.add_argument("--reverse-direction-report", action="store_true",
+                        help="tylko zlicza brakujące pary, które można zastąpić parami odwrotnymi, bez zapytań do API")
+    arguments: argparse.Namespace = parser.parse_args()
+    for scenario_path in arguments.scenarios:
+        if arguments.reverse_direction_report:
+            print(f"{scenario_path}: {CountPairsCoveredByReverseDirection(Scenario(scenario_path))}")
+        else:
+            print(f"{scenario_path}: {PrefetchMissingDistances(Scenario(scenario_path), api_url=arguments.api_url)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import atexit
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional, Protocol, Set, Tuple, runtime_checkable
+
+# Własne typy
+PlacesPair = Tuple[str, str]
+DistancesDictionary = Dict[str, Dict[str, Dict[str, float]]]
+
+# Stałe
+DISTANCES_JSON_FILE: str = "../Dane/Odległości.json"
+DISTANCE_KEY: str = "odległość [km]"
+DURATION_KEY: str = "czas podróży [min]"
+JOURNAL_FILE_SUFFIX: str = "_dziennik.jsonl"
+JOURNAL_ORIGIN_KEY: str = "miejsce początkowe"
+JOURNAL_DESTINATION_KEY: str = "miejsce docelowe"
+JOURNAL_COMPACTION_THRESHOLD: int = 500
+
+
+@runtime_checkable
+class DistanceSource(Protocol):
+    """Interfejs wspólny dla DistanceStore i PlacesDatabase - każde z nich może być magazynem odległości procesu"""
+    filename: str
+    reverse_direction_fallback: bool
+    asymmetry_factor: float
+
+    def ReadDistanceAndDuration(self, origin: str, destination: str) -> Optional[Tuple[float, float]]:
+        ...
+
+    def SaveDistanceAndDuration(self, origin: str, destination: str, distance: float, duration: float):
+        ...
+
+    def IsPairPresent(self, origin: str, destination: str) -> bool:
+        ...
+
+    def IterateStoredPairs(self) -> Iterator[Tuple[PlacesPair, Tuple[float, float]]]:
+        ...
+
+    def SetReverseDirectionFallback(self, enabled: bool, asymmetry_factor: float = 1.0):
+        ...
+
+    def Flush(self):
+        ...
+
+    def GetStatistics(self) -> DistanceStoreStatistics:
+        ...
+
+
+class DistanceStore:
+    """
+    Klasa przechowująca w pamięci odległości i czasy przejazdu między miejscami. Stan wczytywany jest raz z pliku JSON
+    (migawki) i dziennika, do którego przy wywołaniu Flush dopisywane są tylko nowe pary - Compact scala dziennik
+    z migawką
+    """
+    filename: str
+    journal_filename: str
+    distances: Dict[PlacesPair, Tuple[float, float]]
+    unsaved_pairs: Set[PlacesPair]
+    journal_pairs_count: int
+    hits_count: int
+    reverse_hits_count: int
+    misses_count: int
+    is_loaded: bool
+    files_lock: threading.Lock
+    compaction_thread: Optional[threading.Thread]
+    reverse_direction_fallback: bool
+    asymmetry_factor: float
+
+    def __init__(self, filename: str = DISTANCES_JSON_FILE, reverse_direction_fallback: bool = False,
+                 asymmetry_factor: float = 1.0):
+        self.filename = filename
+        self.journal_filename = GetJournalFilename(filename)
+        self.distances = {}
+        self.unsaved_pairs = set()
+        self.journal_pairs_count = 0
+        self.hits_count = self.reverse_hits_count = self.misses_count = 0
+        self.is_loaded = False
+        # Chroni pliki oraz stan zmieniany także przez wątek scalania dziennika
+        self.files_lock = threading.Lock()
+        self.compaction_thread = None
+        self.SetReverseDirectionFallback(reverse_direction_fallback, asymmetry_factor)
+
+    def __repr__(self):
+        return f"DistanceStore({self.filename}, {self.GetStatistics()})"
+
+    def Load(self):
+        with self.files_lock:
+            self.AddDistancesFromDictionary(self.ReadDistancesDictionaryFromFile())
+            journal_entries: List[Tuple[PlacesPair, Tuple[float, float]]] = self.ReadJournal(self.journal_filename)
+            for pair, distance_and_duration in journal_entries:
+                self.distances.setdefault(pair, distance_and_duration)
+            self.journal_pairs_count = len(journal_entries)
+            self.is_loaded = True
+
+    def AddDistancesFromDictionary(self, saved_distances: DistancesDictionary):
+        for origin, info_for_origin in saved_distances.items():
+            for destination, info_for_origin_destination in info_for_origin.items():
+                self.distances.setdefault(
+                    (origin, destination),
+                    (info_for_origin_destination[DISTANCE_KEY], info_for_origin_destination[DURATION_KEY])
+                )
+
+    def ReadDistancesDictionaryFromFile(self) -> DistancesDictionary:
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                file_contents: str = file.read()
+        except FileNotFoundError:
+            return {}
+        if not file_contents:
+            return {}
+        return json.loads(file_contents)
+
+    @staticmethod
+    def ReadJournal(journal_filename: str) -> List[Tuple[PlacesPair, Tuple[float, float]]]:
+        journal_entries: List[Tuple[PlacesPair, Tuple[float, float]]] = []
+        try:
+            with open(journal_filename, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry: Dict[str, str | float] = json.loads(line)
+                    except json.JSONDecodeError:  # niedokończony zapis, np. po przerwaniu programu
+                        continue
+                    journal_entries.append((
+                        (entry[JOURNAL_ORIGIN_KEY], entry[JOURNAL_DESTINATION_KEY]),
+                        (entry[DISTANCE_KEY], entry[DURATION_KEY])
+                    ))
+        except FileNotFoundError:
+            pass
+        return journal_entries
+
+    def ReadDistanceAndDuration(self, origin: str, destination: str) -> Optional[Tuple[float, float]]:
+        if not self.is_loaded:
+            self.Load()
+        distance_and_duration: Optional[Tuple[float, float]] = self.distances.get((origin, destination))
+        if distance_and_duration is not None:
+            self.hits_count += 1
+            return distance_and_duration
+        if self.reverse_direction_fallback:
+            distance_and_duration = self.distances.get((destination, origin))
+            if distance_and_duration is not None:
+                self.reverse_hits_count += 1
+                return self.CorrectReverseDirection(distance_and_duration)
+        self.misses_count += 1
+        return None
+
+    def IterateStoredPairs(self) -> Iterator[Tuple[PlacesPair, Tuple[float, float]]]:
+        """Zwraca migawkę zapisanych par (bez par odwrotnych) - wspólny interfejs z PlacesDatabase"""
+        if not self.is_loaded:
+            self.Load()
+        with self.files_lock:
+            stored_pairs: List[Tuple[PlacesPair, Tuple[float, float]]] = list(self.distances.items())
+        return iter(stored_pairs)
+
+    def IsPairPresent(self, origin: str, destination: str) -> bool:
+        """Sprawdza obecność pary (lub pary odwrotnej, jeśli jest dozwolona) bez wpływu na liczniki trafień"""
+        if not self.is_loaded:
+            self.Load()
+        if (origin, destination) in self.distances:
+            return True
+        return self.reverse_direction_fallback and (destination, origin) in self.distances
+
+    def SetReverseDirectionFallback(self, enabled: bool, asymmetry_factor: float = 1.0):
+        """
+        Pozwala użyć zapisanej pary B→A, gdy brakuje pary A→B - odległość i czas są mnożone przez współczynnik
+        asymetrii (np. z powodu ulic jednokierunkowych)
+        """
+        if asymmetry_factor <= 0:
+            raise ValueError("Współczynnik asymetrii musi być dodatni")
+        self.reverse_direction_fallback = enabled
+        self.asymmetry_factor = asymmetry_factor
+
+    def CorrectReverseDirection(self, distance_and_duration: Tuple[float, float]) -> Tuple[float, float]:
+        distance, duration = distance_and_duration
+        return distance * self.asymmetry_factor, duration * self.asymmetry_factor
+
+    def SaveDistanceAndDuration(self, origin: str, destination: str, distance: float, duration: float):
+        if not self.is_loaded:
+            self.Load()
+        with self.files_lock:
+            if (origin, destination) in self.distances:
+                return
+            self.distances[origin, destination] = (distance, duration)
+            self.unsaved_pairs.add((origin, destination))
+
+    def Flush(self):
+        """Dopisuje niezapisane pary na koniec dziennika - koszt zapisu nie zależy od liczby zapisanych już par"""
+        with self.files_lock:
+            if not self.unsaved_pairs:
+                return
+            AppendPairsToJournal(self.journal_filename, [
+                (pair, self.distances[pair]) for pair in sorted(self.unsaved_pairs)
+            ])
+            self.journal_pairs_count += len(self.unsaved_pairs)
+            self.unsaved_pairs.clear()
+            is_compaction_needed: bool = self.journal_pairs_count >= JOURNAL_COMPACTION_THRESHOLD
+        if is_compaction_needed:
+            self.CompactInBackground()
+
+    def Compact(self):
+        """Scala dziennik z migawką w pliku JSON i usuwa dziennik"""
+        with self.files_lock:
+            compacted_journal_filename: str = self.journal_filename + ".scalanie"
+            try:
+                # Dziennik jest najpierw przenoszony, aby wpisy dopisywane w trakcie scalania trafiły do nowego pliku
+                os.replace(self.journal_filename, compacted_journal_filename)
+            except FileNotFoundError:
+                return
+            saved_distances: DistancesDictionary = self.ReadDistancesDictionaryFromFile()
+            journal_entries: List[Tuple[PlacesPair, Tuple[float, float]]] = self.ReadJournal(
+                compacted_journal_filename
+            )
+            for (origin, destination), (distance, duration) in journal_entries:
+                saved_distances.setdefault(origin, {}).setdefault(
+                    destination, {DISTANCE_KEY: distance, DURATION_KEY: duration}
+                )
+            temporary_filename: str = self.filename + ".tmp"
+            with open(temporary_filename, "w", encoding="utf-8") as file:
+                json.dump(saved_distances, file, ensure_ascii=False, indent=2)
+            os.replace(temporary_filename, self.filename)
+            os.remove(compacted_journal_filename)
+            # Dopisywanie do dziennika wymaga blokady, więc scalony dziennik zawierał wszystkie policzone pary
+            self.journal_pairs_count = 0
+            self.AddDistancesFromDictionary(saved_distances)
+
+    def CompactInBackground(self) -> threading.Thread:
+        """Jeśli poprzednie scalanie jeszcze trwa, nowe nie jest uruchamiane - zwracany jest trwający wątek"""
+        with self.files_lock:
+            if self.compaction_thread is None or not self.compaction_thread.is_alive():
+                self.compaction_thread = threading.Thread(target=self.Compact, name="Scalanie dziennika odległości")
+                self.compaction_thread.start()
+            return self.compaction_thread
+
+    def GetStatistics(self) -> DistanceStoreStatistics:
+        return DistanceStoreStatistics(self.hits_count, self.misses_count, len(self.distances), self.reverse_hits_count)
+
+
+def GetJournalFilename(filename: str) -> str:
+    return os.path.splitext(filename)[0] + JOURNAL_FILE_SUFFIX
+
+
+def AppendPairsToJournal(journal_filename: str, entries: List[Tuple[PlacesPair, Tuple[float, float]]]):
+    """Dopisuje pary bez wczytywania migawki ani dziennika - duplikaty są pomijane przy wczytywaniu i scalaniu"""
+    journal_lines: List[str] = [
+        json.dumps({
+            JOURNAL_ORIGIN_KEY: origin, JOURNAL_DESTINATION_KEY: destination,
+            DISTANCE_KEY: distance, DURATION_KEY: duration
+        }, ensure_ascii=False) + "\n"
+        for (origin, destination), (distance, duration) in entries
+    ]
+    with open(journal_filename, "a", encoding="utf-8") as file:
+        file.write("".join(journal_lines))
+
+
+class DistanceStoreStatistics(NamedTuple):
+    hits_count: int
+    misses_count: int
+    stored_pairs_count: int
+    reverse_hits_count: int = 0  # każde takie trafienie to zaoszczędzone zapytanie do API
+
+    def __repr__(self):
+        return (f"trafienia: {self.hits_count}, trafienia w parę odwrotną: {self.reverse_hits_count}, "
+                f"chybienia: {self.misses_count}, zapisane pary: {self.stored_pairs_count}")
+
+
+current_distance_store: DistanceSource = DistanceStore()
+
+
+def GetDistanceStore() -> DistanceSource:
+    return current_distance_store
+
+
+def GetDistanceStoreForFile(filename: str) -> Optional[DistanceSource]:
+    """Zwraca magazyn używany w całym procesie, jeśli przechowuje odległości w podanym pliku"""
+    if os.path.abspath(current_distance_store.filename) == os.path.abspath(filename):
+        return current_distance_store
+    return None
+
+
+def SetDistanceStore(new_distance_store: DistanceSource) -> DistanceSource:
+    """Podmienia magazyn odległości używany w całym procesie, zwraca poprzedni (po zapisaniu jego zmian)"""
+    global current_distance_store
+    previous_distance_store: DistanceSource = current_distance_store
+    previous_distance_store.Flush()
+    current_distance_store = new_distance_store
+    return previous_distance_store
+
+
+def FlushCurrentDistanceStore():
+    current_distance_store.Flush()
+
+
+atexit.register(FlushCurrentDistanceStore)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sor_classes import Hospital
+
+# Własne typy
+DisciplineId = int
+HospitalRank = int
+
+
+class HospitalAvailabilityIndex:
+    """
+    Indeks od dziedziny medycyny do szpitali (w kolejności listy szpitali), które mają dla niej wolne łóżka po
+    odjęciu poszkodowanych już wiezionych do szpitala. Dla każdej dziedziny trzymany jest kopiec pozycji szpitali
+    z wolnymi łóżkami - szpitale bez łóżek są usuwane z kopca przy odczycie. Po każdej rezerwacji lub zwolnieniu
+    łóżka należy odświeżyć dany szpital
+    """
+    source_hospitals: List[Hospital]
+    hospitals: List[Hospital]
+    ranks_by_hospital_id: Dict[int, HospitalRank]
+    available_beds: Dict[Tuple[DisciplineId, HospitalRank], int]
+    heaps: Dict[DisciplineId, List[HospitalRank]]
+    ranks_in_heaps: Dict[DisciplineId, Set[HospitalRank]]
+
+    def __init__(self, hospitals: List[Hospital]):
+        self.source_hospitals = hospitals
+        self.hospitals = list(hospitals)
+        self.ranks_by_hospital_id = {}
+        for rank, hospital in enumerate(self.hospitals):
+            if hospital.id_ in self.ranks_by_hospital_id:
+                raise ValueError(f"Szpital {hospital.id_} występuje więcej niż raz")
+            self.ranks_by_hospital_id[hospital.id_] = rank
+        self.available_beds = {}
+        self.heaps = {}
+        self.ranks_in_heaps = {}
+        for hospital in self.hospitals:
+            self.RefreshHospital(hospital)
+
+    def __repr__(self):
+        return f"HospitalAvailabilityIndex(szpitale: {len(self.hospitals)}, dziedziny: {len(self.heaps)})"
+
+    def IsBuiltFrom(self, hospitals: List[Hospital]) -> bool:
+        """Podmiana listy szpitali lub usunięcie z niej szpitala wymaga zbudowania indeksu od nowa"""
+        return hospitals is self.source_hospitals and len(hospitals) == len(self.hospitals)
+
+    def RefreshHospital(self, hospital: Hospital):
+        rank: Optional[HospitalRank] = self.ranks_by_hospital_id.get(hospital.id_)
+        if rank is None:
+            return
+        hospital_available_beds: Dict[DisciplineId, int] = {}
+        for department in hospital.departments:
+            department_available_beds: int = max(hospital.AvailableBedsInDepartment(department), 0)
+            for medicine_discipline_id in set(department.medical_categories):
+                hospital_available_beds[medicine_discipline_id] = (
+                    hospital_available_beds.get(medicine_discipline_id, 0) + department_available_beds
+                )
+        for medicine_discipline_id, beds_count in hospital_available_beds.items():
+            self.available_beds[medicine_discipline_id, rank] = beds_count
+            ranks_in_heap: Set[HospitalRank] = self.ranks_in_heaps.setdefault(medicine_discipline_id, set())
+            if beds_count > 0 and rank not in ranks_in_heap:
+                heapq.heappush(self.heaps.setdefault(medicine_discipline_id, []), rank)
+                ranks_in_heap.add(rank)
+
+    def GetFirstAvailableRank(self, medicine_discipline_id: DisciplineId) -> Optional[HospitalRank]:
+        heap: List[HospitalRank] = self.heaps.get(medicine_discipline_id, [])
+        while heap:
+            if self.available_beds[medicine_discipline_id, heap[0]] > 0:
+                return heap[0]
+            self.ranks_in_heaps[medicine_discipline_id].discard(heapq.heappop(heap))
+        return None
+
+    def FindFirstHospital(self, medicine_disciplines_ids: Iterable[DisciplineId]) -> Optional[Hospital]:
+        """Zwraca pierwszy na liście szpital z wolnym łóżkiem dla którejkolwiek z podanych dziedzin"""
+        first_ranks: List[HospitalRank] = [
+            rank for rank in map(self.GetFirstAvailableRank, medicine_disciplines_ids) if rank is not None
+        ]
+        return self.hospitals[min(first_ranks)] if first_ranks else None
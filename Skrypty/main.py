@@ -4,6 +4,7 @@ import PyQt6.QtWidgets as Qt
 import datetime
 from typing import List
 
+import replicate_statistics as rep_stat
 import scenario_editor as sc_edit
 import simulation as sim
 
@@ -70,11 +71,11 @@ class MainApp(Qt.QMainWindow):
         self.ReloadScenario()
 
     def Simulate(self):
-        simulation: sim.Simulation = sim.Simulation(self.current_scenario)
+        simulation: sim.Simulation = sim.Simulation(self.current_scenario, prefetch_distances=True)
         simulation_results: sim.SimulationResultsTuple = simulation.PerformSimulation()
         results_window: MessageBoxWithScrollArea = MessageBoxWithScrollArea()
         results_window.setWindowTitle("Wyniki symulacji")
-        weights = (
+        weights: rep_stat.ObjectiveFunctionWeights = rep_stat.ObjectiveFunctionWeights(
             self.dead_count_weight_spinbox.value(), self.average_RPM_weight_spinbox.value(),
             self.total_sim_time_weight_spinbox.value(), self.average_help_time_weight_spinbox.value()
         )
@@ -84,12 +85,7 @@ class MainApp(Qt.QMainWindow):
             f"{TOTAL_SIM_TIME_TEXT}: {str(simulation_results.total_simulation_time_minutes)}, waga: {str(weights[2])}",
             f"{AVERAGE_HELP_TIME_TEXT}: {str(simulation_results.average_help_time_minutes)}, waga: {str(weights[3])}"
         ]
-        objective_function_value: float = (
-                simulation_results.dead_victims_count * weights[0] +
-                simulation_results.victims_average_RPM * weights[1] +
-                simulation_results.total_simulation_time_minutes * weights[2] +
-                simulation_results.average_help_time_minutes * weights[3]
-        )
+        objective_function_value: float = rep_stat.CalculateObjectiveFunctionValue(simulation_results, weights)
         message_lines.append(f"Obliczona wartość funkcji celu: {objective_function_value:.2f}")
         results_window.setText("\n".join(message_lines))
         solution_as_strings: List[str] = ["Rozwiązanie"] + [str(item) for item in simulation.solution]
@@ -144,22 +140,24 @@ class MainApp(Qt.QMainWindow):
         self.dead_count_weight_spinbox: Qt.QDoubleSpinBox = Qt.QDoubleSpinBox()
         self.AddWeightToLayout(
             weights_layout_lower, DEAD_COUNT_TEXT,
-            self.dead_count_weight_spinbox, -1.0
+            self.dead_count_weight_spinbox, rep_stat.DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS.dead_victims_count
         )
         self.average_RPM_weight_spinbox = Qt.QDoubleSpinBox()
         self.AddWeightToLayout(
             weights_layout_lower, AVERAGE_RPM_TEXT,
-            self.average_RPM_weight_spinbox, 4.0
+            self.average_RPM_weight_spinbox, rep_stat.DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS.victims_average_RPM
         )
         self.total_sim_time_weight_spinbox = Qt.QDoubleSpinBox()
         self.AddWeightToLayout(
             weights_layout_upper, TOTAL_SIM_TIME_TEXT,
-            self.total_sim_time_weight_spinbox, -0.25
+            self.total_sim_time_weight_spinbox,
+            rep_stat.DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS.total_simulation_time_minutes
         )
         self.average_help_time_weight_spinbox = Qt.QDoubleSpinBox()
         self.AddWeightToLayout(
             weights_layout_upper, AVERAGE_HELP_TIME_TEXT,
-            self.average_help_time_weight_spinbox, -0.3
+            self.average_help_time_weight_spinbox,
+            rep_stat.DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS.average_help_time_minutes
         )
         weights_layout.addLayout(weights_layout_lower)
         weights_layout.addLayout(weights_layout_upper)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse
+import sqlite3
+import threading
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from distance_store import (DISTANCES_JSON_FILE, DistanceSource, DistanceStore, DistanceStoreStatistics, PlacesPair,
+                            SetDistanceStore)
+
+# Stałe
+PLACES_DATABASE_FILE: str = "../Dane/Miejsca.sqlite"
+PLACES_CSV_FILE: str = "../Dane/Miejsca.csv"
+PLACES_CSV_FILE_ADDRESS_COLUMN_NAME: str = "adres"
+PLACES_CSV_COORDINATES_COLUMN_NAME: str = "współrzędne"
+DATABASE_BUSY_TIMEOUT_SECONDS: float = 30.0
+DATABASE_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS places (
+    address TEXT PRIMARY KEY,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS distances (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    distance REAL NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (origin, destination)
+) WITHOUT ROWID;
+"""
+
+
+class ImportSummary(NamedTuple):
+    imported_places_count: int
+    imported_pairs_count: int
+
+    def __repr__(self):
+        return f"zaimportowane miejsca: {self.imported_places_count}, zaimportowane pary: {self.imported_pairs_count}"
+
+
+class PlacesDatabase:
+    """
+    Baza SQLite ze współrzędnymi miejsc i odległościami między nimi - spełnia interfejs DistanceSource, tak jak
+    DistanceStore, więc może go zastąpić w całym procesie. Tryb WAL pozwala na jednoczesny odczyt i zapis przez kilka
+    symulacji
+    """
+    filename: str
+    connection: Optional[sqlite3.Connection]
+    connection_lock: threading.Lock
+    hits_count: int
+    reverse_hits_count: int
+    misses_count: int
+    reverse_direction_fallback: bool
+    asymmetry_factor: float
+
+    def __init__(self, filename: str = PLACES_DATABASE_FILE, reverse_direction_fallback: bool = False,
+                 asymmetry_factor: float = 1.0):
+        self.filename = filename
+        self.connection = None
+        self.connection_lock = threading.Lock()
+        self.hits_count = self.reverse_hits_count = self.misses_count = 0
+        self.SetReverseDirectionFallback(reverse_direction_fallback, asymmetry_factor)
+
+    def __repr__(self):
+        return f"PlacesDatabase({self.filename}, {self.GetStatistics()})"
+
+    def GetConnection(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(
+                self.filename, timeout=DATABASE_BUSY_TIMEOUT_SECONDS, check_same_thread=False, isolation_level=None
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(DATABASE_SCHEMA)
+        return self.connection
+
+    def Close(self):
+        if self.connection is None:
+            return
+        with self.connection_lock:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    def ReadCoordinates(self, address: str) -> Optional[Tuple[float, float]]:
+        with self.connection_lock:
+            row: Optional[Tuple[float, float]] = self.GetConnection().execute(
+                "SELECT latitude, longitude FROM places WHERE address = ?", (address,)
+            ).fetchone()
+        return row
+
+    def SaveCoordinates(self, address: str, latitude: float, longitude: float):
+        with self.connection_lock:
+            self.GetConnection().execute(
+                "INSERT OR IGNORE INTO places (address, latitude, longitude) VALUES (?, ?, ?)",
+                (address, latitude, longitude)
+            )
+
+    def ReadDistanceAndDuration(self, origin: str, destination: str) -> Optional[Tuple[float, float]]:
+        row: Optional[Tuple[float, float]] = self.SelectDistanceAndDuration(origin, destination)
+        if row is not None:
+            self.hits_count += 1
+            return row
+        if self.reverse_direction_fallback:
+            row = self.SelectDistanceAndDuration(destination, origin)
+            if row is not None:
+                self.reverse_hits_count += 1
+                return row[0] * self.asymmetry_factor, row[1] * self.asymmetry_factor
+        self.misses_count += 1
+        return None
+
+    def SelectDistanceAndDuration(self, origin: str, destination: str) -> Optional[Tuple[float, float]]:
+        with self.connection_lock:
+            return self.GetConnection().execute(
+                "SELECT distance, duration FROM distances WHERE origin = ? AND destination = ?", (origin, destination)
+            ).fetchone()
+
+    def IterateStoredPairs(self) -> Iterator[Tuple[PlacesPair, Tuple[float, float]]]:
+        with self.connection_lock:
+            rows: List[Tuple[str, str, float, float]] = self.GetConnection().execute(
+                "SELECT origin, destination, distance, duration FROM distances"
+            ).fetchall()
+        return (((origin, destination), (distance, duration)) for origin, destination, distance, duration in rows)
+
+    def IsPairPresent(self, origin: str, destination: str) -> bool:
+        """Sprawdza obecność pary (lub pary odwrotnej, jeśli jest dozwolona) bez wpływu na liczniki trafień"""
+        if self.SelectDistanceAndDuration(origin, destination) is not None:
+            return True
+        return self.reverse_direction_fallback and self.SelectDistanceAndDuration(destination, origin) is not None
+
+    def SetReverseDirectionFallback(self, enabled: bool, asymmetry_factor: float = 1.0):
+        if asymmetry_factor <= 0:
+            raise ValueError("Współczynnik asymetrii musi być dodatni")
+        self.reverse_direction_fallback = enabled
+        self.asymmetry_factor = asymmetry_factor
+
+    def SaveDistanceAndDuration(self, origin: str, destination: str, distance: float, duration: float):
+        with self.connection_lock:
+            self.GetConnection().execute(
+                "INSERT OR IGNORE INTO distances (origin, destination, distance, duration) VALUES (?, ?, ?, ?)",
+                (origin, destination, distance, duration)
+            )
+
+    def Flush(self):
+        """
+        Każdy zapis jest osobną, krótką transakcją, aby nie blokować innych procesów piszących do bazy - metoda istnieje
+        dla zgodności z DistanceStore
+        """
+        if self.connection is None:
+            return
+        with self.connection_lock:
+            self.connection.commit()
+
+    def GetStatistics(self) -> DistanceStoreStatistics:
+        with self.connection_lock:
+            stored_pairs_count: int = self.GetConnection().execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+        return DistanceStoreStatistics(self.hits_count, self.misses_count, stored_pairs_count, self.reverse_hits_count)
+
+    def ImportFromFiles(self, places_csv_file: str = PLACES_CSV_FILE,
+                        distances_json_file: str = DISTANCES_JSON_FILE) -> ImportSummary:
+        """Jednorazowo przenosi do bazy współrzędne z pliku CSV oraz odległości z pliku JSON (wraz z dziennikiem)"""
+        places_coordinates_df: pd.DataFrame = pd.read_csv(
+            places_csv_file, header=0, index_col=0, encoding="utf-8"
+        ).dropna()
+        places_rows: List[Tuple[str, float, float]] = []
+        for address, coordinates in zip(places_coordinates_df[PLACES_CSV_FILE_ADDRESS_COLUMN_NAME],
+                                        places_coordinates_df[PLACES_CSV_COORDINATES_COLUMN_NAME]):
+            latitude, longitude = [float(coordinate) for coordinate in coordinates.split(",")]
+            places_rows.append((address, latitude, longitude))
+        distance_store: DistanceStore = DistanceStore(distances_json_file)
+        distance_store.Load()
+        distances_rows: List[Tuple[str, str, float, float]] = [
+            (origin, destination, distance, duration)
+            for (origin, destination), (distance, duration) in distance_store.distances.items()
+        ]
+        with self.connection_lock:
+            connection: sqlite3.Connection = self.GetConnection()
+            places_count_before: int = connection.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+            pairs_count_before: int = connection.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT OR IGNORE INTO places (address, latitude, longitude) VALUES (?, ?, ?)", places_rows
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO distances (origin, destination, distance, duration) VALUES (?, ?, ?, ?)",
+                    distances_rows
+                )
+            places_count_after: int = connection.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+            pairs_count_after: int = connection.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+        return ImportSummary(places_count_after - places_count_before, pairs_count_after - pairs_count_before)
+
+
+current_places_database: Optional[PlacesDatabase] = None
+replaced_distance_store: Optional[DistanceSource] = None
+
+
+def GetPlacesDatabase() -> Optional[PlacesDatabase]:
+    return current_places_database
+
+
+def UsePlacesDatabase(places_database: Optional[PlacesDatabase]) -> Optional[PlacesDatabase]:
+    """
+    Włącza bazę jako źródło współrzędnych i odległości w całym procesie (None przywraca pliki CSV i JSON), zwraca
+    poprzednio używaną bazę
+    """
+    global current_places_database, replaced_distance_store
+    previous_places_database: Optional[PlacesDatabase] = current_places_database
+    if places_database is not None:
+        previous_distance_store: DistanceSource = SetDistanceStore(places_database)
+        if previous_places_database is None:
+            replaced_distance_store = previous_distance_store
+    elif replaced_distance_store is not None:
+        SetDistanceStore(replaced_distance_store)
+        replaced_distance_store = None
+    current_places_database = places_database
+    return previous_places_database
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Importuje współrzędne miejsc i odległości z plików CSV i JSON do bazy SQLite"
+    )
+    parser.add_argument("--database", default=PLACES_DATABASE_FILE, help="ścieżka do pliku bazy")
+    parser.add_argument("--places-csv", default=PLACES_CSV_FILE, help="ścieżka do pliku ze współrzędnymi")
+    parser.add_argument("--distances-json", default=DISTANCES_JSON_FILE, help="ścieżka do pliku z odległościami")
+    arguments: argparse.Namespace = parser.parse_args()
+    places_database: PlacesDatabase = PlacesDatabase(arguments.database)
+    print(places_database.ImportFromFiles(arguments.places_csv, arguments.distances_json))
+    places_database.Close()
+
+
+if __name__ == '__main__':
+    main()
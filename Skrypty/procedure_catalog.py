@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import types
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from victim_classes import HealthProblem, Procedure
+
+# Stałe
+PROCEDURES_CSV_FILE: str = "../Dane/Procedury.csv"
+PROCEDURES_CSV_TIME_COLUMN_NAME: str = "Czas wykonania przez ratowników [min]"
+PROCEDURES_CSV_PROCEDURE_COLUMN_NAME: str = "Procedura medyczna"
+PROCEDURE_NOT_AVAILABLE_SYMBOL: str = "-"
+
+
+class ProcedureCatalog:
+    """
+    Niezmienny katalog procedur dostępnych dla ratowników ze słownikiem od problemu zdrowotnego do procedury.
+    Wczytywany raz na proces i współdzielony przez wszystkie symulacje
+    """
+    procedures: Tuple[Procedure, ...]
+    procedures_by_health_problem: Mapping[HealthProblem, Procedure]
+
+    def __init__(self, procedures: List[Procedure]):
+        self.procedures = tuple(procedures)
+        procedures_by_health_problem: Dict[HealthProblem, Procedure] = {}
+        for procedure in self.procedures:
+            # Tak jak przy przeszukiwaniu listy - przy powtórzeniach obowiązuje pierwsza procedura
+            procedures_by_health_problem.setdefault(procedure.health_problem, procedure)
+        self.procedures_by_health_problem = types.MappingProxyType(procedures_by_health_problem)
+
+    def __repr__(self):
+        return f"ProcedureCatalog(procedury: {len(self.procedures)})"
+
+    @classmethod
+    def FromFile(cls, filename: str = PROCEDURES_CSV_FILE) -> ProcedureCatalog:
+        procedures_dataframe: pd.DataFrame = pd.read_csv(filename, index_col=0, header=0, encoding="utf8", sep=";")
+        available_procedures: pd.DataFrame = procedures_dataframe[
+            procedures_dataframe[PROCEDURES_CSV_TIME_COLUMN_NAME] != PROCEDURE_NOT_AVAILABLE_SYMBOL
+        ]
+        times: pd.Series = available_procedures[PROCEDURES_CSV_TIME_COLUMN_NAME]
+        procedure_symbols: pd.Series = available_procedures[PROCEDURES_CSV_PROCEDURE_COLUMN_NAME]
+        return cls([
+            Procedure.FromString(procedure_string, time)
+            for procedure_string, time in zip(procedure_symbols.values, times.values)
+        ])
+
+    def GetProcedure(self, health_problem: HealthProblem) -> Optional[Procedure]:
+        return self.procedures_by_health_problem.get(health_problem)
+
+
+current_procedure_catalog: Optional[ProcedureCatalog] = None
+
+
+def GetProcedureCatalog() -> ProcedureCatalog:
+    global current_procedure_catalog
+    if current_procedure_catalog is None:
+        current_procedure_catalog = ProcedureCatalog.FromFile()
+    return current_procedure_catalog
@@ -33,11 +33,6 @@ PROFILES_DIRECTORY: str = "Profile pacjentów"
 STATE_TITLE: str = "Stan "
 TIME_UNIT: str = "min"
 
-# Włączenie Qt
-app = Qt.QApplication(sys.argv)
-sys.excepthook = lambda *args: (traceback.print_exception(*args, file=sys.stdout))
-app.setFont(Qg.QFont("Arial", FONT_SIZE))
-
 
 class MainApp(Qt.QMainWindow):
     """Klasa odpowiadająca głównej aplikacji"""
@@ -390,6 +385,11 @@ class MainApp(Qt.QMainWindow):
 
 
 if __name__ == '__main__':
+    # Włączenie Qt
+    app = Qt.QApplication(sys.argv)
+    sys.excepthook = lambda *args: (traceback.print_exception(*args, file=sys.stdout))
+    app.setFont(Qg.QFont("Arial", FONT_SIZE))
+
     window = MainApp()
     window.show()
     app.exec()
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import random
+import types
+from typing import Union
+
+# Własne typy
+# Moduł random ma te same metody co random.Random i oznacza globalny generator
+RandomGenerator = Union[random.Random, types.ModuleType]
+
+
+def CreateReplicateRandomGenerator(master_seed: int, replicate_index: int) -> random.Random:
+    """
+    Tworzy generator replikacji z ziarnem wyprowadzonym z ziarna głównego i numeru replikacji przez SHA-512 - kolejne
+    replikacje mają niezależne strumienie liczb, a wynik nie zależy od procesu ani kolejności wykonania
+    """
+    seed_bytes: bytes = hashlib.sha512(f"{master_seed}:{replicate_index}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(seed_bytes, "big"))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import math
+import statistics
+from typing import Dict, NamedTuple, Optional
+
+from simulation import SimulationResultsTuple
+
+# Stałe
+DEFAULT_CONFIDENCE_LEVEL: float = 0.95
+# Przy mniejszej liczbie replikacji przybliżenie rozkładem normalnym zaniża szerokość przedziału ufności
+MIN_REPLICATES_FOR_STOPPING: int = 30
+OBJECTIVE_FUNCTION_NAME: str = "objective_function_value"
+
+
+class ObjectiveFunctionWeights(NamedTuple):
+    dead_victims_count: float
+    victims_average_RPM: float
+    total_simulation_time_minutes: float
+    average_help_time_minutes: float
+
+
+DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS: ObjectiveFunctionWeights = ObjectiveFunctionWeights(-1.0, 4.0, -0.25, -0.3)
+
+
+def CalculateObjectiveFunctionValue(
+        results: SimulationResultsTuple, weights: ObjectiveFunctionWeights = DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS
+) -> float:
+    return sum(value * weight for value, weight in zip(results, weights))
+
+
+class ConfidenceInterval(NamedTuple):
+    mean: float
+    half_width: float
+
+    def __repr__(self):
+        return f"{self.mean:.4f} ± {self.half_width:.4f}"
+
+
+class RunningStatistics:
+    """Średnia i wariancja liczone na bieżąco algorytmem Welforda - bez przechowywania wszystkich wartości"""
+    count: int
+    mean: float
+    sum_of_squared_deviations: float
+
+    def __init__(self):
+        self.count = 0
+        self.mean = self.sum_of_squared_deviations = 0.0
+
+    def __repr__(self):
+        return f"RunningStatistics(n: {self.count}, średnia: {self.mean}, wariancja: {self.GetVariance()})"
+
+    def Add(self, value: float):
+        self.count += 1
+        delta: float = value - self.mean
+        self.mean += delta / self.count
+        self.sum_of_squared_deviations += delta * (value - self.mean)
+
+    def GetVariance(self) -> float:
+        """Wariancja z próby (nieobciążona)"""
+        if self.count < 2:
+            return math.nan
+        return self.sum_of_squared_deviations / (self.count - 1)
+
+    def GetConfidenceInterval(self, confidence_level: float = DEFAULT_CONFIDENCE_LEVEL) -> ConfidenceInterval:
+        if not 0 < confidence_level < 1:
+            raise ValueError(f"Poziom ufności musi być z przedziału (0, 1): {confidence_level}")
+        if self.count < 2:
+            return ConfidenceInterval(self.mean, math.inf)
+        quantile: float = statistics.NormalDist().inv_cdf((1 + confidence_level) / 2)
+        return ConfidenceInterval(self.mean, quantile * math.sqrt(self.GetVariance() / self.count))
+
+
+class ReplicatesAggregator:
+    """
+    Zbiera wyniki kolejnych replikacji - dla każdego pola SimulationResultsTuple i dla funkcji celu prowadzi
+    statystyki bieżące i ocenia, czy przedział ufności funkcji celu jest już wystarczająco wąski
+    """
+    weights: ObjectiveFunctionWeights
+    confidence_level: float
+    statistics_by_name: Dict[str, RunningStatistics]
+
+    def __init__(
+            self, weights: ObjectiveFunctionWeights = DEFAULT_OBJECTIVE_FUNCTION_WEIGHTS,
+            confidence_level: float = DEFAULT_CONFIDENCE_LEVEL
+    ):
+        self.weights = weights
+        self.confidence_level = confidence_level
+        self.statistics_by_name = {
+            name: RunningStatistics() for name in SimulationResultsTuple._fields + (OBJECTIVE_FUNCTION_NAME,)
+        }
+
+    def __repr__(self):
+        return "\n".join(
+            f"{name}: {interval}" for name, interval in self.GetConfidenceIntervals().items()
+        )
+
+    @property
+    def count(self) -> int:
+        return self.statistics_by_name[OBJECTIVE_FUNCTION_NAME].count
+
+    def AddResults(self, results: SimulationResultsTuple):
+        for name, value in zip(SimulationResultsTuple._fields, results):
+            self.statistics_by_name[name].Add(value)
+        self.statistics_by_name[OBJECTIVE_FUNCTION_NAME].Add(CalculateObjectiveFunctionValue(results, self.weights))
+
+    def GetConfidenceIntervals(self) -> Dict[str, ConfidenceInterval]:
+        return {
+            name: running_statistics.GetConfidenceInterval(self.confidence_level)
+            for name, running_statistics in self.statistics_by_name.items()
+        }
+
+    def IsPrecisionReached(
+            self, target_half_width: Optional[float], min_replicates_count: int = MIN_REPLICATES_FOR_STOPPING
+    ) -> bool:
+        """Bez docelowej szerokości (None) replikacje nigdy nie są przerywane"""
+        if target_half_width is None or self.count < max(min_replicates_count, 2):
+            return False
+        objective_function_interval: ConfidenceInterval = self.statistics_by_name[
+            OBJECTIVE_FUNCTION_NAME
+        ].GetConfidenceInterval(self.confidence_level)
+        return objective_function_interval.half_width <= target_half_width
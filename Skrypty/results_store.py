@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import glob
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from replicate_statistics import OBJECTIVE_FUNCTION_NAME
+from simulation import SimulationResultsTuple, SolutionRecord
+
+# Własne typy
+Columns = Dict[str, np.ndarray]
+
+# Stałe
+RESULTS_DIRECTORY: str = "../Wyniki"
+CHUNK_FILE_PREFIX: str = "wyniki_"
+CHUNK_FILE_EXTENSION: str = ".npz"
+DEFAULT_CHUNK_SIZE: int = 1000
+# Wyniki zaimportowane z plików tekstowych nie mają zapisanego ziarna
+UNKNOWN_SEED: int = -1
+RUNS_TABLE_PREFIX: str = "przebiegi/"
+SOLUTION_TABLE_PREFIX: str = "rozwiazania/"
+RUN_ID_COLUMN: str = "run_id"
+SCENARIO_NAME_COLUMN: str = "scenario_name"
+MASTER_SEED_COLUMN: str = "master_seed"
+REPLICATE_INDEX_COLUMN: str = "replicate_index"
+RUNS_COLUMNS: List[str] = [
+    RUN_ID_COLUMN, SCENARIO_NAME_COLUMN, MASTER_SEED_COLUMN, REPLICATE_INDEX_COLUMN,
+    *SimulationResultsTuple._fields, OBJECTIVE_FUNCTION_NAME
+]
+SOLUTION_COLUMNS: List[str] = [RUN_ID_COLUMN, *SolutionRecord._fields]
+RESULTS_DATA_TYPES: Dict[str, type] = {
+    "dead_victims_count": np.int64, "victims_average_RPM": np.float64,
+    "total_simulation_time_minutes": np.int64, "average_help_time_minutes": np.float64
+}
+OBJECTIVE_FUNCTION_LINE_PREFIX: str = "Obliczona wartość funkcji celu"
+RESULTS_FILE_NAME_SEPARATOR: str = " - wyniki"
+SOLUTION_LINE_PATTERN: re.Pattern = re.compile(
+    r"(\d+)\. \(id poszkodowanego: (\d+), id zespołu: (.*), id oddziału szpitalnego: (.*), "
+    r"czas przyjęcia do szpitala: (\d+)\)"
+)
+
+
+class RunRecord(NamedTuple):
+    scenario_name: str
+    master_seed: int
+    replicate_index: int
+    results: SimulationResultsTuple
+    objective_function_value: float
+    solution: List[SolutionRecord]
+
+    def __repr__(self):
+        return (f"scenariusz: {self.scenario_name}, ziarno: {self.master_seed}, replikacja: {self.replicate_index}, "
+                f"wyniki: {tuple(self.results)}, funkcja celu: {self.objective_function_value}")
+
+
+class ResultsStore:
+    """
+    Kolumnowy magazyn wyników wielu symulacji w katalogu plików .npz. Przebiegi dodane przez AppendRun są buforowane
+    w pamięci i zapisywane paczkami - każdy Flush tworzy nowy plik z tabelą przebiegów (wskaźniki, ziarna) i płaską
+    tabelą rozwiązań powiązaną numerem przebiegu. Odczyt łączy kolumny wszystkich plików w tablice numpy
+    """
+    directory: str
+    chunk_size: int
+    pending_runs: List[RunRecord]
+    next_run_id: int
+    chunks_count: int
+
+    def __init__(self, directory: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError(f"Rozmiar paczki musi być dodatni: {chunk_size}")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.pending_runs = []
+        chunk_files: List[str] = self.ListChunkFiles()
+        self.chunks_count = len(chunk_files)
+        self.next_run_id = 0
+        if chunk_files:
+            with np.load(chunk_files[-1], allow_pickle=False) as last_chunk:
+                last_runs_ids: np.ndarray = last_chunk[RUNS_TABLE_PREFIX + RUN_ID_COLUMN]
+                self.next_run_id = int(last_runs_ids.max()) + 1 if last_runs_ids.size else 0
+
+    def __repr__(self):
+        return (f"ResultsStore({self.directory}, zapisane przebiegi: {self.next_run_id - len(self.pending_runs)}, "
+                f"niezapisane przebiegi: {len(self.pending_runs)})")
+
+    def ListChunkFiles(self) -> List[str]:
+        chunk_files_pattern: str = f"{CHUNK_FILE_PREFIX}*{CHUNK_FILE_EXTENSION}"
+        return sorted(glob.glob(os.path.join(glob.escape(self.directory), chunk_files_pattern)))
+
+    def AppendRun(self, run: RunRecord):
+        self.pending_runs.append(run)
+        self.next_run_id += 1
+        if len(self.pending_runs) >= self.chunk_size:
+            self.Flush()
+
+    def Flush(self):
+        if not self.pending_runs:
+            return
+        first_run_id: int = self.next_run_id - len(self.pending_runs)
+        columns: Columns = {}
+        for column_name, column in self.CreateRunsColumns(first_run_id).items():
+            columns[RUNS_TABLE_PREFIX + column_name] = column
+        for column_name, column in self.CreateSolutionColumns(first_run_id).items():
+            columns[SOLUTION_TABLE_PREFIX + column_name] = column
+        os.makedirs(self.directory, exist_ok=True)
+        chunk_path: str = os.path.join(
+            self.directory, f"{CHUNK_FILE_PREFIX}{self.chunks_count:06d}{CHUNK_FILE_EXTENSION}"
+        )
+        # Zapis do pliku tymczasowego - przerwany zapis nie zostawia uszkodzonej paczki
+        temporary_path: str = chunk_path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            np.savez_compressed(file, **columns)
+        os.replace(temporary_path, chunk_path)
+        self.chunks_count += 1
+        self.pending_runs = []
+
+    def CreateRunsColumns(self, first_run_id: int) -> Columns:
+        return {
+            RUN_ID_COLUMN: np.arange(first_run_id, first_run_id + len(self.pending_runs), dtype=np.int64),
+            SCENARIO_NAME_COLUMN: np.array([run.scenario_name for run in self.pending_runs], dtype=str),
+            MASTER_SEED_COLUMN: np.array([run.master_seed for run in self.pending_runs], dtype=np.int64),
+            REPLICATE_INDEX_COLUMN: np.array([run.replicate_index for run in self.pending_runs], dtype=np.int64),
+            **{
+                name: np.array([run.results[i] for run in self.pending_runs], dtype=RESULTS_DATA_TYPES[name])
+                for i, name in enumerate(SimulationResultsTuple._fields)
+            },
+            OBJECTIVE_FUNCTION_NAME: np.array(
+                [run.objective_function_value for run in self.pending_runs], dtype=np.float64
+            )
+        }
+
+    def CreateSolutionColumns(self, first_run_id: int) -> Columns:
+        runs_ids: List[int] = []
+        records: List[SolutionRecord] = []
+        for run_id, run in enumerate(self.pending_runs, first_run_id):
+            runs_ids.extend([run_id] * len(run.solution))
+            records.extend(run.solution)
+        return {
+            RUN_ID_COLUMN: np.array(runs_ids, dtype=np.int64),
+            "number": np.array([record.number for record in records], dtype=np.int64),
+            "victim_id": np.array([record.victim_id for record in records], dtype=np.int64),
+            "team_id": np.array([record.team_id for record in records], dtype=str),
+            "hospital_department_id": np.array([record.hospital_department_id for record in records], dtype=str),
+            "elapsed_simulation_time": np.array(
+                [record.elapsed_simulation_time for record in records], dtype=np.int64
+            )
+        }
+
+    def ReadRunsColumns(self) -> Columns:
+        """Niezapisane przebiegi nie są odczytywane - należy wcześniej wywołać Flush"""
+        return self.ReadTable(RUNS_TABLE_PREFIX, RUNS_COLUMNS)
+
+    def ReadSolutionColumns(self) -> Columns:
+        return self.ReadTable(SOLUTION_TABLE_PREFIX, SOLUTION_COLUMNS)
+
+    def ReadTable(self, table_prefix: str, column_names: List[str]) -> Columns:
+        chunks_columns: Dict[str, List[np.ndarray]] = {name: [] for name in column_names}
+        for chunk_file in self.ListChunkFiles():
+            with np.load(chunk_file, allow_pickle=False) as chunk:
+                for name in column_names:
+                    chunks_columns[name].append(chunk[table_prefix + name])
+        return {
+            name: np.concatenate(chunks) if chunks else np.array([]) for name, chunks in chunks_columns.items()
+        }
+
+
+def ExtractValueFromLine(line: str) -> str:
+    return line.split(":")[1].split(",")[0].strip()
+
+
+def ReadRunFromResultsFile(file_path: str) -> RunRecord:
+    """
+    Wczytuje plik tekstowy zapisany przez MainApp.Simulate: cztery linie wskaźników z wagami, linię z wartością
+    funkcji celu i opcjonalnie listę rozwiązania
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        lines: List[str] = f.read().splitlines()
+    if len(lines) < 5 or not lines[4].startswith(OBJECTIVE_FUNCTION_LINE_PREFIX):
+        raise ValueError(f"Plik {file_path} nie zawiera wszystkich wskaźników i wartości funkcji celu")
+    results: SimulationResultsTuple = SimulationResultsTuple(
+        int(ExtractValueFromLine(lines[0])), float(ExtractValueFromLine(lines[1])),
+        int(ExtractValueFromLine(lines[2])), float(ExtractValueFromLine(lines[3]))
+    )
+    solution: List[SolutionRecord] = []
+    for line in lines[5:]:
+        match: Optional[re.Match] = SOLUTION_LINE_PATTERN.fullmatch(line.strip())
+        if match:
+            solution.append(SolutionRecord(
+                int(match[1]), int(match[2]), match[3], match[4], int(match[5])
+            ))
+    scenario_name: str = os.path.basename(file_path).split(RESULTS_FILE_NAME_SEPARATOR)[0]
+    return RunRecord(
+        scenario_name, UNKNOWN_SEED, UNKNOWN_SEED, results, float(ExtractValueFromLine(lines[4])), solution
+    )
+
+
+def ImportResultsDirectory(dir_path: str, results_store: ResultsStore) -> int:
+    """Przenosi do magazynu wszystkie pliki .txt z katalogu wyników, zwraca liczbę zaimportowanych przebiegów"""
+    imported_count: int = 0
+    for file_path in sorted(glob.glob(os.path.join(glob.escape(dir_path), "*.txt"))):
+        results_store.AppendRun(ReadRunFromResultsFile(file_path))
+        imported_count += 1
+    results_store.Flush()
+    return imported_count
+
+
+def main():
+    for dir_path in sorted(glob.glob(os.path.join(RESULTS_DIRECTORY, "S*"))):
+        if not os.path.isdir(dir_path):
+            continue
+        results_store: ResultsStore = ResultsStore(os.path.join(dir_path, "magazyn"))
+        if not results_store.ListChunkFiles():
+            ImportResultsDirectory(dir_path, results_store)
+        runs_columns: Columns = results_store.ReadRunsColumns()
+        print("=========================================")
+        print(os.path.basename(dir_path))
+        for name in (*SimulationResultsTuple._fields, OBJECTIVE_FUNCTION_NAME):
+            print(f"{name}: {runs_columns[name].mean()}")
+
+
+if __name__ == '__main__':
+    main()
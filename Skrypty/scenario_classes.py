@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 import pandas as pd
 from typing import Dict, List, Tuple
 
@@ -33,6 +34,18 @@ class Scenario:
         self.ParseVictims(victims_part, total_victims_part)
         self.ParseAddress(address_part)
 
+    @classmethod
+    def FromParts(
+            cls, hospitals: List[Hospital], teams: List[ZRM], victims: List[Victim], address: PlaceAddress
+    ) -> Scenario:
+        """Tworzy scenariusz z gotowych obiektów, bez wczytywania pliku"""
+        scenario: Scenario = cls.__new__(cls)
+        scenario.hospitals = hospitals
+        scenario.teams = teams
+        scenario.victims = victims
+        scenario.address = address
+        return scenario
+
     def ParseDepartments(self, departments_string: str):
         departments_data: List[str] = departments_string.split("\n")[DATA_TITLE_OFFSET:]
         SOR_table: pd.DataFrame = pd.read_csv("../Dane/SOR.csv", encoding="utf-8", sep=";", index_col=0)
@@ -113,3 +126,48 @@ class Scenario:
     def ParseAddress(self, address_part: str):
         address_part_without_title: str = address_part[len(ADDRESS_DATA_TITLE):]
         self.address = PlaceAddress.FromString(address_part_without_title.replace(",", ""))
+
+
+class ScenarioTemplate:
+    """
+    Scenariusz wczytany raz z pliku - przechowuje wzorcowe szpitale, zespoły i poszkodowanych, których nie przekazuje
+    na zewnątrz. Instantiate tworzy z nich nowe obiekty do jednej symulacji, bez ponownego parsowania i deepcopy
+    """
+    scenario_filename: str
+    prototype: Scenario
+
+    def __init__(self, scenario_filename: str):
+        self.scenario_filename = scenario_filename
+        self.prototype = Scenario(scenario_filename)
+
+    def __repr__(self):
+        return f"ScenarioTemplate({self.scenario_filename})"
+
+    def Instantiate(self) -> Scenario:
+        return Scenario.FromParts(
+            hospitals=[
+                Hospital(hospital.id_, hospital.name, hospital.address, [
+                    Department(department.id_, department.name, list(department.medical_categories),
+                               department.current_beds_count)
+                    for department in hospital.departments
+                ])
+                for hospital in self.prototype.hospitals
+            ],
+            teams=[
+                ZRM(team.id_, team.dispatch, team.type, team.origin_location_address) for team in self.prototype.teams
+            ],
+            victims=[
+                Victim(victim.id_, [state.CreateCopy() for state in victim.states]) for victim in self.prototype.victims
+            ],
+            address=self.prototype.address
+        )
+
+
+scenario_templates: Dict[str, ScenarioTemplate] = {}
+
+
+def GetScenarioTemplate(scenario_filename: str) -> ScenarioTemplate:
+    """Szablony są wczytywane raz na proces dla każdego pliku scenariusza"""
+    if scenario_filename not in scenario_templates:
+        scenario_templates[scenario_filename] = ScenarioTemplate(scenario_filename)
+    return scenario_templates[scenario_filename]
@@ -1,51 +1,92 @@
 from __future__ import annotations
-import pandas as pd
+import heapq
+import numpy as np
 import random
-from typing import List, NamedTuple, Optional, Set, Tuple
-
-from scenario_classes import Scenario
+from typing import List, NamedTuple, Optional, Set, Tuple, Union
+
+from distance_prefetch import PrefetchMissingDistances
+from distance_store import GetDistanceStore
+from hospital_availability import HospitalAvailabilityIndex
+from procedure_catalog import GetProcedureCatalog, ProcedureCatalog
+from random_streams import RandomGenerator
+from scenario_classes import Scenario, ScenarioTemplate
 from sor_classes import Department, Hospital, IncidentPlace
+from spatial_index import AreDurationsBoundedByStraightLine, MINIMAL_MINUTES_PER_STRAIGHT_LINE_KM, SpatialIndex
+from travel_time_matrix import GetTravelTimeMatrix, TravelTimeMatrix
 from utilities import PlaceAddress, TargetDestination
-from victim_classes import HealthProblem, Procedure, TriageColour, Victim
-from zrm_classes import Specialist, ZRM
+from victim_classes import DeteriorationScheduler, HealthProblem, Procedure, TriageColour, Victim
+from victim_collections import AssessedVictims, TransportReadyVictimsQueue, VictimsCollection
+from zrm_classes import Specialist, TeamRegistry, ZRM
 
 # Stałe
-PROCEDURES_CSV_TIME_COLUMN_NAME: str = "Czas wykonania przez ratowników [min]"
-PROCEDURES_CSV_PROCEDURE_COLUMN_NAME: str = "Procedura medyczna"
+# Poniżej tej liczby zespołów przeliczenie czasów dojazdu wszystkich zespołów jest tańsze niż użycie indeksu - przy 23
+# zespołach z 16 baz wektorowe przeliczenie jest kilkukrotnie szybsze od przeszukiwania drzewa
+SPATIAL_INDEX_MIN_TEAMS_COUNT: int = 50
 
 
 class Simulation:
     # additional_scenarios: List[Scenario]
     incidents: List[IncidentPlace]  # czy zmienić na tylko jedno miejsce?
     all_hospitals: List[Hospital]
-    idle_teams: List[ZRM]
-    teams_in_action: List[ZRM]
+    hospital_availability_index: HospitalAvailabilityIndex
+    teams_registry: TeamRegistry
     all_victims: List[Victim]
-    unknown_status_victims: List[Victim]
-    assessed_victims: List[Victim]
-    transport_ready_victims: List[Victim]
-    available_procedures: List[Procedure]
+    deterioration_scheduler: DeteriorationScheduler
+    unknown_status_pool: VictimsCollection
+    assessed_victims_collection: AssessedVictims
+    transport_ready_queue: TransportReadyVictimsQueue
+    procedure_catalog: ProcedureCatalog
+    available_procedures: Tuple[Procedure, ...]
     elapsed_simulation_time: int
     solution: List[SolutionRecord]
     current_solution_index: int
-
-    def __init__(self, main_scenario_path: str):  # , additional_scenarios_paths: List[str]):
-        main_scenario: Scenario = Scenario(main_scenario_path)
+    places_spatial_index: SpatialIndex
+    spatial_index_min_teams_count: int
+    is_fast_forward_enabled: bool
+    # Domyślnie globalny generator modułu random, dla powtarzalnych replikacji - z CreateReplicateRandomGenerator
+    random_generator: RandomGenerator
+
+    def __init__(
+            self, main_scenario_source: Union[str, ScenarioTemplate], prefetch_distances: bool = False,
+            fast_forward: bool = True, random_generator: RandomGenerator = random
+    ):
+        """Scenariusz jest podawany jako ścieżka do pliku albo szablon wczytany wcześniej - wtedy nie jest parsowany"""
+        # , additional_scenarios_paths: List[str]):
+        main_scenario: Scenario = (
+            main_scenario_source.Instantiate() if isinstance(main_scenario_source, ScenarioTemplate)
+            else Scenario(main_scenario_source)
+        )
+        if prefetch_distances:
+            # Wszystkie potrzebne odległości są pobierane przed symulacją, aby nie odpytywać API w jej trakcie
+            PrefetchMissingDistances(main_scenario)
         # self.additional_scenarios = []
         # for additional_scenario_path in additional_scenarios_paths:
         #     self.additional_scenarios.append(Scenario(additional_scenario_path))
-        main_incident: IncidentPlace = IncidentPlace(main_scenario.address, main_scenario.victims)
+        scenario_places: List[PlaceAddress] = (
+            [main_scenario.address] + [hospital.address for hospital in main_scenario.hospitals] +
+            [team.origin_location_address for team in main_scenario.teams]
+        )
+        GetTravelTimeMatrix().Build(scenario_places)
+        self.places_spatial_index = SpatialIndex(scenario_places)
+        self.spatial_index_min_teams_count = SPATIAL_INDEX_MIN_TEAMS_COUNT
+        self.is_fast_forward_enabled = fast_forward
+        self.random_generator = random_generator
+        main_incident: IncidentPlace = IncidentPlace(
+            main_scenario.address, main_scenario.victims, self.random_generator
+        )
         self.incidents = [main_incident]
         self.all_hospitals = main_scenario.hospitals
         self.SortHospitals()
-        self.idle_teams = main_scenario.teams
-        self.teams_in_action = []
+        self.hospital_availability_index = HospitalAvailabilityIndex(self.all_hospitals)
+        self.teams_registry = TeamRegistry(main_scenario.teams)
         self.all_victims = main_scenario.victims
-        random.shuffle(self.all_victims)
-        self.unknown_status_victims = self.all_victims[:]
-        self.assessed_victims = []
-        self.transport_ready_victims = []
-        self.available_procedures = self.LoadProcedures()
+        self.random_generator.shuffle(self.all_victims)
+        self.deterioration_scheduler = DeteriorationScheduler(self.all_victims)
+        self.unknown_status_pool = VictimsCollection(self.all_victims)
+        self.assessed_victims_collection = AssessedVictims()
+        self.transport_ready_queue = TransportReadyVictimsQueue()
+        self.procedure_catalog = GetProcedureCatalog()
+        self.available_procedures = self.procedure_catalog.procedures
         self.elapsed_simulation_time = 0
         self.solution = []
         self.current_solution_index = 1
@@ -53,31 +94,49 @@ class Simulation:
     def __repr__(self):
         return str(self.__dict__)
 
+    @property
+    def idle_teams(self) -> List[ZRM]:
+        return self.teams_registry.GetIdleTeams()
+
+    @property
+    def teams_in_action(self) -> List[ZRM]:
+        return self.teams_registry.GetTeamsInAction()
+
+    @property
+    def unknown_status_victims(self) -> VictimsCollection:
+        return self.unknown_status_pool
+
+    @unknown_status_victims.setter
+    def unknown_status_victims(self, victims: List[Victim]):
+        self.unknown_status_pool = VictimsCollection(victims)
+
+    @property
+    def assessed_victims(self) -> AssessedVictims:
+        return self.assessed_victims_collection
+
+    @assessed_victims.setter
+    def assessed_victims(self, victims: List[Victim]):
+        self.assessed_victims_collection = AssessedVictims(victims)
+
+    @property
+    def transport_ready_victims(self) -> TransportReadyVictimsQueue:
+        return self.transport_ready_queue
+
+    @transport_ready_victims.setter
+    def transport_ready_victims(self, victims: List[Victim]):
+        self.transport_ready_queue = TransportReadyVictimsQueue(victims)
+
     def SortHospitals(self):
-        hospitals_times_to_incident: List[float] = []
-        for hospital in self.all_hospitals:
-            hospitals_times_to_incident.append(
-                self.incidents[0].address.GetDistanceAndDurationToOtherPlace(hospital.address)[1]
-            )
-        hospitals_and_times: List[Tuple[Hospital, float]] = list(zip(self.all_hospitals, hospitals_times_to_incident))
-        hospitals_and_times.sort(key=lambda x: x[1])
-        hospitals_tuple, _ = list(zip(*hospitals_and_times))
-        self.all_hospitals = list(hospitals_tuple)
+        hospitals_times_to_incident: np.ndarray = GetTravelTimeMatrix().GetDurationsFromOrigin(
+            self.incidents[0].address, [hospital.address for hospital in self.all_hospitals]
+        )
+        self.all_hospitals = [
+            self.all_hospitals[i] for i in np.argsort(hospitals_times_to_incident, kind="stable")
+        ]
 
     @staticmethod
     def LoadProcedures() -> List[Procedure]:
-        procedures_dataframe: pd.DataFrame = pd.read_csv(
-            "../Dane/Procedury.csv", index_col=0, header=0, encoding="utf8", sep=";"
-        )
-        available_procedures: pd.DataFrame = procedures_dataframe[
-            procedures_dataframe[PROCEDURES_CSV_TIME_COLUMN_NAME] != "-"
-            ]
-        times: pd.Series = available_procedures[PROCEDURES_CSV_TIME_COLUMN_NAME]
-        procedure_symbols: pd.Series = available_procedures[PROCEDURES_CSV_PROCEDURE_COLUMN_NAME]
-        return [
-            Procedure.FromString(procedure_string, time)
-            for procedure_string, time in zip(procedure_symbols.values, times.values)
-        ]
+        return list(GetProcedureCatalog().procedures)
 
     def PerformSimulation(self) -> SimulationResultsTuple:
         main_incident: IncidentPlace = self.incidents[0]
@@ -85,22 +144,77 @@ class Simulation:
             main_incident, main_incident.reported_victims_count
         )
         while not self.CheckIfSimulationEndReached():
+            if self.is_fast_forward_enabled and self.IsWaitingForEvent(first_team):
+                self.FastForward()
             self.SimulationTimeProgresses()
-            for incident in self.incidents:
-                self.TryHandleReconnaissance(first_team, incident)
-            for team in self.teams_in_action:
-                if not team.IsDriving() and not team.are_specialists_outside:
-                    self.OrderIdleTeamInAction(team)
-                if team.are_specialists_outside and team.AreSpecialistsIdle():
-                    self.OrderIdleSpecialists(team)
+            self.OrderTeamsAndSpecialists(first_team)
         return self.SimulationResults()
 
+    def IsWaitingForEvent(self, first_team: ZRM) -> bool:
+        """
+        Sprawdza, czy w następnej minucie nikt nie podejmie działania - zespoły jadą albo ich specjaliści pracują,
+        a żaden specjalista nie opiekuje się zmarłym poszkodowanym
+        """
+        for team in self.teams_in_action:
+            if team.are_specialists_outside:
+                if team.AreSpecialistsIdle():
+                    return False
+                for specialist in team.specialists:
+                    if specialist.target_victim and specialist.target_victim.IsDead():
+                        return False
+            elif not team.IsDriving():
+                return False
+        return not any(self.CanReconnaissanceProceed(first_team, incident) for incident in self.incidents)
+
+    @staticmethod
+    def CanReconnaissanceProceed(first_team: ZRM, incident_place: IncidentPlace) -> bool:
+        if not incident_place.NeedsReconnaissance():
+            return False
+        if first_team.are_specialists_outside:
+            return first_team.AreSpecialistsIdle()
+        return not first_team.IsDriving()
+
+    def GetMinutesUntilNextEvent(self) -> int:
+        """Liczba minut do najbliższego końca dojazdu, końca procedury lub granicy przedziału pogorszenia RPM"""
+        minutes: int = (
+            self.deterioration_scheduler.GetNextDeteriorationTime(self.elapsed_simulation_time) -
+            self.elapsed_simulation_time
+        )
+        for team in self.teams_in_action:
+            if team.IsDriving():
+                # Dojazd w obrębie tego samego miejsca trwa 0 minut i kończy się w następnej minucie
+                minutes = min(minutes, max(team.time_until_destination_in_minutes, 1))
+            if not team.are_specialists_outside:
+                continue
+            for specialist in team.specialists:
+                if specialist.time_until_procedure_is_finished is not None:
+                    minutes = min(minutes, specialist.time_until_procedure_is_finished)
+        return minutes
+
+    def FastForward(self):
+        """Przeskakuje jednym krokiem minuty bez zdarzeń - następny krok symulacji trafia w najbliższe zdarzenie"""
+        self.SkipMinutesWithoutEvents(self.GetMinutesUntilNextEvent() - 1)
+
+    def SkipMinutesWithoutEvents(self, minutes: int):
+        if minutes <= 0:
+            return
+        for team in self.teams_in_action:
+            team.SkipMinutesWithoutEvents(minutes)
+        self.elapsed_simulation_time += minutes
+
+    def OrderTeamsAndSpecialists(self, first_team: ZRM):
+        for incident in self.incidents:
+            self.TryHandleReconnaissance(first_team, incident)
+        for team in self.teams_in_action:
+            if not team.IsDriving() and not team.are_specialists_outside:
+                self.OrderIdleTeamInAction(team)
+            if team.are_specialists_outside and team.AreSpecialistsIdle():
+                self.OrderIdleSpecialists(team)
+
     def SendOutNTeamsToTheIncidentReturnFirst(self, incident_place: IncidentPlace, n_teams_to_send: int) -> ZRM:
         """Wysyła pierwsze zespoły na miejsce wypadku, zwraca ten, który przyjedzie pierwszy"""
         teams_times_to_reach_incident: List[Tuple[str, float]] = (
-            self.GetTeamsWithoutQueueAndTimesToReachTheAddressAscending(
-                self.idle_teams, incident_place.address
-            )
+            self.GetNIdleTeamsAndTimesToReachTheAddressAscending(incident_place.address, max(n_teams_to_send, 1))
         )
         for count, team_and_time in enumerate(teams_times_to_reach_incident):
             team_id, _ = team_and_time
@@ -115,55 +229,102 @@ class Simulation:
     @staticmethod
     def GetTeamsWithoutQueueAndTimesToReachTheAddressAscending(teams: List[ZRM], address: PlaceAddress) \
             -> List[Tuple[str, float]]:
-        teams_times_to_reach_incident: List[Tuple[str, float]] = []
-        for team in teams:
-            if team.queue_of_next_targets or team.are_specialists_outside:
-                continue
-            if team.IsDriving():
-                time_to_reach_address: float = (
-                        team.time_until_destination_in_minutes +
-                        team.target_location.address.GetDistanceAndDurationToOtherPlace(address)[1]
-                )
-            else:
+        """Czasy dojazdu wszystkich zespołów są liczone jedną operacją na wektorze z macierzy czasów przejazdu"""
+        available_teams: List[ZRM] = [
+            team for team in teams if not team.queue_of_next_targets and not team.are_specialists_outside
+        ]
+        if not available_teams:
+            return []
+        travel_time_matrix: TravelTimeMatrix = GetTravelTimeMatrix()
+        # Zespół w drodze najpierw dojeżdża do obecnego celu, a dopiero potem rusza pod wskazany adres
+        departure_addresses: List[PlaceAddress] = [
+            team.target_location.address if team.IsDriving() else team.origin_location_address
+            for team in available_teams
+        ]
+        remaining_driving_times: np.ndarray = np.array([
+            team.time_until_destination_in_minutes if team.IsDriving() else 0 for team in available_teams
+        ])
+        times_to_reach_address: np.ndarray = (
+            remaining_driving_times + travel_time_matrix.GetDurationsToDestination(departure_addresses, address)
+        )
+        return [
+            (available_teams[i].id_, float(times_to_reach_address[i]))
+            for i in np.argsort(times_to_reach_address, kind="stable")
+        ]
+
+    def GetNIdleTeamsAndTimesToReachTheAddressAscending(self, address: PlaceAddress, n_teams: int) \
+            -> List[Tuple[str, float]]:
+        """
+        Zwraca n wolnych zespołów, które najszybciej dotrą pod adres. Przy dużej flocie dokładne czasy są liczone tylko
+        dla zespołów z baz najbliższych w linii prostej, pogrupowanych przez rejestr zespołów. Kopiec n najlepszych
+        kandydatów daje od razu czas n-tego z nich - kolejne bazy są pomijane, gdy nawet przy najwyższej możliwej
+        prędkości nie mogą dać lepszego czasu. Jeśli czasy przejazdu mogą być krótsze od tego ograniczenia
+        (szacunki, pary odwrotne), sprawdzane są wszystkie zespoły
+        """
+        travel_time_matrix: TravelTimeMatrix = GetTravelTimeMatrix()
+        if (len(self.teams_registry.idle_teams) < self.spatial_index_min_teams_count or
+                not AreDurationsBoundedByStraightLine() or travel_time_matrix.has_durations_below_straight_line_bound):
+            return self.GetTeamsWithoutQueueAndTimesToReachTheAddressAscending(self.idle_teams, address)[:n_teams]
+        # Kopiec maksymalny n najlepszych kandydatów: (-czas dojazdu, -pozycja zespołu, id zespołu)
+        best_candidates: List[Tuple[float, int, str]] = []
+
+        def AddCandidatesFromPlace(place_key: str):
+            for team in self.teams_registry.GetIdleTeamsAtPlace(place_key):
+                if team.queue_of_next_targets or team.are_specialists_outside:
+                    continue
                 time_to_reach_address: float = (
-                    team.origin_location_address.GetDistanceAndDurationToOtherPlace(address)[1]
+                    team.time_until_destination_in_minutes +
+                    travel_time_matrix.GetDistanceAndDuration(team.target_location.address, address)[1]
+                    if team.IsDriving() else
+                    travel_time_matrix.GetDistanceAndDuration(team.origin_location_address, address)[1]
                 )
-            teams_times_to_reach_incident.append(
-                (
-                    team.id_,
-                    time_to_reach_address
+                candidate: Tuple[float, int, str] = (
+                    -time_to_reach_address, -self.teams_registry.GetTeamOrder(team.id_), team.id_
                 )
-            )
-        teams_times_to_reach_incident.sort(key=lambda x: x[1])
-        return teams_times_to_reach_incident
+                if len(best_candidates) < n_teams:
+                    heapq.heappush(best_candidates, candidate)
+                elif candidate[:2] > best_candidates[0][:2]:
+                    heapq.heapreplace(best_candidates, candidate)
+
+        places_keys_left: Set[str] = set(self.teams_registry.GetIdleTeamsPlacesKeys())
+        for place_key in places_keys_left - self.places_spatial_index.places_keys:
+            AddCandidatesFromPlace(place_key)
+        places_keys_left &= self.places_spatial_index.places_keys
+        for straight_line_distance, place in self.places_spatial_index.IterateNearestPlaces(address):
+            if not places_keys_left:
+                break
+            if (len(best_candidates) >= n_teams and
+                    -best_candidates[0][0] < straight_line_distance * MINIMAL_MINUTES_PER_STRAIGHT_LINE_KM):
+                break
+            if place.address_for_api_requests in places_keys_left:
+                places_keys_left.remove(place.address_for_api_requests)
+                AddCandidatesFromPlace(place.address_for_api_requests)
+        return [(team_id, float(-negated_time)) for negated_time, _, team_id in sorted(best_candidates, reverse=True)]
 
     def GetTeamById(self, team_id: str) -> Optional[ZRM]:
-        for team in self.idle_teams + self.teams_in_action:
-            if team.id_ == team_id:
-                return team
-        return None
+        return self.teams_registry.GetTeamById(team_id)
 
     def TeamIntoAction(self, team: ZRM):
-        if team not in self.idle_teams:
-            return
-        self.idle_teams.remove(team)
-        self.teams_in_action.append(team)
+        self.teams_registry.TeamIntoAction(team)
 
     def CheckIfSimulationEndReached(self) -> bool:
         if self.unknown_status_victims or self.transport_ready_victims or self.AnyRemainingAliveAssessedVictims():
             return False
-        return len([victim.IsDead() for victim in self.assessed_victims]) + len(self.solution) == len(self.all_victims)
+        return len(self.assessed_victims) + len(self.solution) == len(self.all_victims)
 
     def AnyRemainingAliveAssessedVictims(self) -> bool:
-        return any([not victim.IsDead() for victim in self.assessed_victims])
+        return self.assessed_victims_collection.AnyAliveVictim()
 
     def SimulationTimeProgresses(self):
         self.elapsed_simulation_time += 1
         for team in self.teams_in_action:
             self.MoveTeam(team)
-            team.SpecialistsContinuePerformingProcedures()
-        for victim in self.all_victims:
-            victim.LowerRPM(self.elapsed_simulation_time)
+            for helped_victim in team.SpecialistsContinuePerformingProcedures():
+                self.assessed_victims_collection.RefreshVictim(helped_victim)
+        self.deterioration_scheduler.LowerRPMOfNotAdmittedVictims(self.elapsed_simulation_time)
+        if self.deterioration_scheduler.IsDeteriorationTime(self.elapsed_simulation_time):
+            self.assessed_victims_collection.MarkRPMChanged()
+            self.transport_ready_queue.MarkRPMChanged()
 
     def MoveTeam(self, team: ZRM):
         target_location: TargetDestination = team.target_location
@@ -172,11 +333,14 @@ class Simulation:
             if isinstance(target_location, Hospital):
                 target_location.RemoveVictimFromIncoming(transported_victim)
                 if transported_victim.IsDead():
+                    self.hospital_availability_index.RefreshHospital(target_location)
                     self.assessed_victims.append(transported_victim)
                     return
                 chosen_department: Department = target_location.TakeInVictimToOneOfDepartments(
                     transported_victim, self.elapsed_simulation_time
                 )
+                self.hospital_availability_index.RefreshHospital(target_location)
+                self.deterioration_scheduler.RemoveAdmittedVictim(transported_victim)
                 self.solution.append(SolutionRecord(
                     self.current_solution_index, transported_victim.id_, team.id_,
                     self.HospitalAndDepartmentId(target_location, chosen_department),
@@ -201,7 +365,7 @@ class Simulation:
             elif first_team.AreSpecialistsIdle():
                 n_newfound_victims: int = len(incident_place.victims) - incident_place.reported_victims_count
                 incident_place.reported_victims_count = len(incident_place.victims)
-                if self.idle_teams:
+                if self.teams_registry.AnyIdleTeams():
                     _ = self.SendOutNTeamsToTheIncidentReturnFirst(incident_place, n_newfound_victims)
 
     def PerformReconnaissance(self, first_team: ZRM):
@@ -213,10 +377,7 @@ class Simulation:
         return self.GetProcedureByDisciplineAndNumber(0, 0)
 
     def GetProcedureByDisciplineAndNumber(self, discipline: int, number: int) -> Optional[Procedure]:
-        for procedure in self.available_procedures:
-            if procedure.health_problem.discipline == discipline and procedure.health_problem.number == number:
-                return procedure
-        return None
+        return self.procedure_catalog.GetProcedure(HealthProblem(discipline, number))
 
     def OrderIdleTeamInAction(self, team: ZRM):
         if team.queue_of_next_targets:
@@ -229,23 +390,38 @@ class Simulation:
             team.SpecialistsLeaveTheVehicle()
 
     def HandleTransportReadyVictims(self, team: ZRM):
-        self.SortVictimsListByRPM(self.transport_ready_victims)
-        for victim in self.transport_ready_victims[:]:
+        self.transport_ready_queue.SortByRPM()
+        victim: Optional[Victim] = self.transport_ready_queue.PeekFirst()
+        while victim is not None:
             if victim.IsDead():
-                self.MoveVictimFromTransportReadyToAssessed(victim)
+                self.assessed_victims.append(self.transport_ready_queue.PopFirst())
+                victim = self.transport_ready_queue.PeekFirst()
                 continue
             target_hospital: Hospital = self.FindAppropriateAvailableHospital(victim)
             if not target_hospital:
                 raise RuntimeError("Nie ma szpitala, mogącego przyjąć tego pacjenta")
             team.StartTransportingAVictim(victim, target_hospital)
-            self.transport_ready_victims.remove(victim)
+            self.transport_ready_queue.PopFirst()
             break
 
     def FindAppropriateAvailableHospital(self, target_victim: Victim) -> Optional[Hospital]:
-        for hospital in self.all_hospitals:
-            if hospital.CanVictimBeTakenIn(target_victim):
+        """
+        Indeks wskazuje pierwszy szpital z wolnym łóżkiem dla którejś z dziedzin poszkodowanego, a wybór oddziału
+        i rezerwacja odbywają się jak dotąd w CanVictimBeTakenIn. Jeśli stan szpitala zmienił się poza symulacją,
+        szpital jest odświeżany w indeksie i wyszukiwanie jest powtarzane
+        """
+        if not self.hospital_availability_index.IsBuiltFrom(self.all_hospitals):
+            self.hospital_availability_index = HospitalAvailabilityIndex(self.all_hospitals)
+        while True:
+            hospital: Optional[Hospital] = self.hospital_availability_index.FindFirstHospital(
+                target_victim.GetCurrentHealthProblemDisciplines()
+            )
+            if hospital is None:
+                return None
+            is_victim_taken_in: bool = hospital.CanVictimBeTakenIn(target_victim)
+            self.hospital_availability_index.RefreshHospital(hospital)
+            if is_victim_taken_in:
                 return hospital
-        return None
 
     @staticmethod
     def SortVictimsListByRPM(victims_list: List[Victim], descending: bool = False):
@@ -267,10 +443,10 @@ class Simulation:
                 team.TrySpecialistsComeBackToTheVehicle()
 
     def AnyRemainingAssessedVictimsNeedingProcedures(self) -> bool:
-        return any([not (victim.IsDead() or victim.under_procedure) for victim in self.assessed_victims])
+        return self.assessed_victims_collection.AnyVictimWaitingForProcedure()
 
     def PerformTriage(self, specialist: Specialist):
-        random_unknown_status_victim: Victim = random.choice(self.unknown_status_victims)
+        random_unknown_status_victim: Victim = self.random_generator.choice(self.unknown_status_victims)
         self.MoveVictimFromUnknownStatusToAssessed(random_unknown_status_victim)
         specialist.StartPerformingProcedure(self.GetTriageProcedure())
 
@@ -297,6 +473,7 @@ class Simulation:
                         break
                 else:
                     specialist.StartPerformingProcedure(non_critical_procedure_to_perform, target_victim)
+                    self.assessed_victims_collection.RefreshVictim(target_victim)
                     return
             else:
                 health_problem_to_treat: HealthProblem = target_victim_critical_problems.pop()
@@ -304,27 +481,17 @@ class Simulation:
                     health_problem_to_treat.discipline, health_problem_to_treat.number
                 )
                 specialist.StartPerformingProcedure(procedure_to_be_performed, target_victim)
+                self.assessed_victims_collection.RefreshVictim(target_victim)
                 return
         if specialist == team.specialists[-1]:
             team.TrySpecialistsComeBackToTheVehicle()
 
     def GetTargetVictimForProcedure(self) -> Optional[Victim]:
-        victims_yellow: List[Victim] = []
-        victims_red: List[Victim] = []
-        for victim in self.assessed_victims:
-            if victim.under_procedure:
-                continue
-            match victim.current_state.triage_colour:
-                case TriageColour.YELLOW:
-                    victims_yellow.append(victim)
-                case TriageColour.RED:
-                    victims_red.append(victim)
-        if victims_red:
-            self.SortVictimsListByRPM(victims_red)
-            return victims_red[0]
-        elif victims_yellow:
-            self.SortVictimsListByRPM(victims_yellow)
-            return victims_yellow[0]
+        """Najpierw czerwoni, potem żółci - w obrębie koloru poszkodowany z najniższym RPM"""
+        for triage_colour in [TriageColour.RED, TriageColour.YELLOW]:
+            target_victim: Optional[Victim] = self.assessed_victims_collection.PeekBest(triage_colour)
+            if target_victim is not None:
+                return target_victim
         return None
 
     def GetAnyPossibleProcedureToPerform(self, target_victim: Victim):
@@ -416,3 +583,4 @@ class SimulationResultsTuple(NamedTuple):
 if __name__ == '__main__':
     scenario_path: str = "../Scenariusze/Scenariusz 6.txt"
     print(Simulation(scenario_path).PerformSimulation())
+    print(GetDistanceStore().GetStatistics())
@@ -4,6 +4,7 @@ import math
 import random
 from typing import Dict, List, Optional
 
+from random_streams import RandomGenerator
 from utilities import PlaceAddress, TargetDestination
 from victim_classes import Victim
 
@@ -11,10 +12,12 @@ from victim_classes import Victim
 class IncidentPlace(TargetDestination):
     victims: List[Victim]
     reported_victims_count: int
+    random_generator: RandomGenerator
 
-    def __init__(self, address: PlaceAddress, victims: List[Victim]):
+    def __init__(self, address: PlaceAddress, victims: List[Victim], random_generator: RandomGenerator = random):
         super().__init__(address)
         self.victims = victims
+        self.random_generator = random_generator
         self.reported_victims_count = self.GetStartingAmountOfVictims()
 
     def __repr__(self):
@@ -22,7 +25,7 @@ class IncidentPlace(TargetDestination):
 
     def GetStartingAmountOfVictims(self) -> int:
         victims_total_count: int = len(self.victims)
-        return math.floor(random.uniform(0.3, 0.75) * victims_total_count)
+        return math.floor(self.random_generator.uniform(0.3, 0.75) * victims_total_count)
 
     def TryTakeVictim(self, victim_id: int) -> Optional[Victim]:
         for victim in self.victims:
@@ -115,13 +118,17 @@ class Hospital(TargetDestination):
         return False
 
     def IsVictimInIncomingVictims(self, victim: Victim) -> bool:
-        all_incoming_victims: List[Victim] = list(itertools.chain.from_iterable(self.incoming_victims.values()))
-        return victim in all_incoming_victims
+        """Poszkodowani są rozróżniani po id - porównanie całych obiektów przegląda wszystkie ich stany"""
+        return any(
+            incoming_victim.id_ == victim.id_
+            for incoming_victim in itertools.chain.from_iterable(self.incoming_victims.values())
+        )
 
     def RemoveVictimFromIncoming(self, transported_victim: Victim):
         for department_id, victim_list in self.incoming_victims.items():
-            if transported_victim in victim_list:
-                self.incoming_victims[department_id].remove(transported_victim)
-                if not self.incoming_victims[department_id]:
-                    self.incoming_victims.pop(department_id)
-                return
+            for i, incoming_victim in enumerate(victim_list):
+                if incoming_victim.id_ == transported_victim.id_:
+                    victim_list.pop(i)
+                    if not victim_list:
+                        self.incoming_victims.pop(department_id)
+                    return
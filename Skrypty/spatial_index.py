@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import heapq
+import math
+from typing import Iterator, List, Optional, Set, Tuple
+
+from distance_store import GetDistanceStore
+from travel_time_estimator import EstimationMode, GetTravelTimeEstimator, TravelTimeEstimator
+from utilities import PlaceAddress
+
+# Własne typy
+ProjectedPoint = Tuple[float, float]
+
+# Stałe
+KM_PER_LATITUDE_DEGREE: float = 111.195
+# Dolne ograniczenie czasu przejazdu na kilometr w linii prostej - żadna droga nie pozwala jechać szybciej niż 140 km/h
+MINIMAL_MINUTES_PER_STRAIGHT_LINE_KM: float = 60 / 140
+
+
+def AreDurationsBoundedByStraightLine() -> bool:
+    """
+    Sprawdza, czy obecne źródła czasów przejazdu dotrzymują dolnego ograniczenia MINIMAL_MINUTES_PER_STRAIGHT_LINE_KM.
+    Mogą je naruszyć szacunki z modelu o ujemnym wyrazie wolnym lub małej prędkości na km w linii prostej oraz pary
+    odwrotne skracane współczynnikiem asymetrii mniejszym od 1
+    """
+    estimator: Optional[TravelTimeEstimator]
+    estimator, estimation_mode = GetTravelTimeEstimator()
+    if (estimation_mode != EstimationMode.DISABLED and estimator is not None and
+            not estimator.IsDurationAtLeast(MINIMAL_MINUTES_PER_STRAIGHT_LINE_KM)):
+        return False
+    distance_store = GetDistanceStore()
+    return not (distance_store.reverse_direction_fallback and distance_store.asymmetry_factor < 1)
+
+
+class KDTreeNode:
+    place_index: int
+    axis: int
+    left: Optional[KDTreeNode]
+    right: Optional[KDTreeNode]
+
+    def __init__(self, place_index: int, axis: int, left: Optional[KDTreeNode], right: Optional[KDTreeNode]):
+        self.place_index = place_index
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class SpatialIndex:
+    """
+    Drzewo k-wymiarowe nad współrzędnymi miejsc rzutowanymi na płaszczyznę (w km) - zwraca miejsca w kolejności
+    rosnącej odległości w linii prostej, co pozwala ograniczyć dokładne liczenie czasów przejazdu do najbliższych
+    """
+    places: List[PlaceAddress]
+    places_keys: Set[str]
+    points: List[ProjectedPoint]
+    reference_latitude: float
+    root: Optional[KDTreeNode]
+
+    def __init__(self, places: List[PlaceAddress]):
+        self.places = list({place.address_for_api_requests: place for place in places}.values())
+        self.places_keys = {place.address_for_api_requests for place in self.places}
+        self.reference_latitude = (
+            sum(place.latitude for place in self.places) / len(self.places) if self.places else 0.0
+        )
+        self.points = [self.ProjectCoordinates(place) for place in self.places]
+        self.root = self.BuildSubtree(list(range(len(self.places))), depth=0)
+
+    def __repr__(self):
+        return f"SpatialIndex(miejsca: {len(self.places)})"
+
+    def ProjectCoordinates(self, place: PlaceAddress) -> ProjectedPoint:
+        """Rzut równoodległościowy - przy odległościach rzędu kilkudziesięciu km błąd jest pomijalny"""
+        return (
+            place.longitude * KM_PER_LATITUDE_DEGREE * math.cos(math.radians(self.reference_latitude)),
+            place.latitude * KM_PER_LATITUDE_DEGREE
+        )
+
+    def BuildSubtree(self, places_indices: List[int], depth: int) -> Optional[KDTreeNode]:
+        if not places_indices:
+            return None
+        axis: int = depth % 2
+        places_indices.sort(key=lambda i: self.points[i][axis])
+        median: int = len(places_indices) // 2
+        return KDTreeNode(
+            places_indices[median], axis,
+            self.BuildSubtree(places_indices[:median], depth + 1),
+            self.BuildSubtree(places_indices[median + 1:], depth + 1)
+        )
+
+    def IterateNearestPlaces(self, address: PlaceAddress) -> Iterator[Tuple[float, PlaceAddress]]:
+        """
+        Zwraca kolejno pary (odległość w linii prostej w km, miejsce) od najbliższego - przeszukiwanie best-first,
+        w którym poddrzewa są rozwijane dopiero wtedy, gdy mogą zawierać bliższe miejsce niż już znalezione
+        """
+        if self.root is None:
+            return
+        query_point: ProjectedPoint = self.ProjectCoordinates(address)
+        # Elementy kopca: (dolne ograniczenie odległości, licznik, węzeł) lub (odległość, licznik, indeks miejsca)
+        counter: int = 0
+        heap: List[Tuple[float, int, object]] = [(0.0, counter, self.root)]
+        while heap:
+            lower_bound, _, element = heapq.heappop(heap)
+            if not isinstance(element, KDTreeNode):
+                yield lower_bound, self.places[element]
+                continue
+            node_point: ProjectedPoint = self.points[element.place_index]
+            counter += 1
+            heapq.heappush(heap, (math.dist(query_point, node_point), counter, element.place_index))
+            difference: float = query_point[element.axis] - node_point[element.axis]
+            near_child, far_child = (element.left, element.right) if difference < 0 else (element.right, element.left)
+            if near_child is not None:
+                counter += 1
+                heapq.heappush(heap, (lower_bound, counter, near_child))
+            if far_child is not None:
+                counter += 1
+                heapq.heappush(heap, (max(lower_bound, abs(difference)), counter, far_child))
+
+    def QueryKNearestPlaces(self, address: PlaceAddress, k: int) -> List[PlaceAddress]:
+        nearest_places: List[PlaceAddress] = []
+        for _, place in self.IterateNearestPlaces(address):
+            if len(nearest_places) >= k:
+                break
+            nearest_places.append(place)
+        return nearest_places
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse
+import enum
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from distance_store import DistanceSource, GetDistanceStore, PlacesPair
+from places_database import PLACES_CSV_COORDINATES_COLUMN_NAME, PLACES_CSV_FILE, PLACES_CSV_FILE_ADDRESS_COLUMN_NAME
+
+# Własne typy
+Coordinates = Tuple[float, float]
+
+# Stałe
+EARTH_RADIUS_KM: float = 6371.0
+DEFAULT_CIRCUITY_FACTOR: float = 1.3
+DEFAULT_MINUTES_PER_KM: float = 1.2
+MINIMAL_PAIRS_COUNT_FOR_FIT: int = 2
+
+
+class EstimationMode(enum.Enum):
+    """Typ wyliczeniowy określający, kiedy czas przejazdu jest szacowany zamiast pobierany z API"""
+    DISABLED = 0
+    FALLBACK = 1
+    PRIMARY = 2
+
+
+class FitStatistics(NamedTuple):
+    pairs_count: int
+    distance_rmse: float
+    distance_mae: float
+    duration_rmse: float
+    duration_mae: float
+
+    def __repr__(self):
+        return (f"pary: {self.pairs_count}, odległość RMSE: {self.distance_rmse:.2f} km, "
+                f"MAE: {self.distance_mae:.2f} km, czas RMSE: {self.duration_rmse:.2f} min, "
+                f"MAE: {self.duration_mae:.2f} min")
+
+
+def HaversineDistance(origin: Coordinates, destination: Coordinates) -> float:
+    """Zwraca odległość w linii prostej w kilometrach między dwoma punktami zadanymi jako (szerokość, długość)"""
+    origin_latitude, origin_longitude = map(math.radians, origin)
+    destination_latitude, destination_longitude = map(math.radians, destination)
+    haversine: float = (
+        math.sin((destination_latitude - origin_latitude) / 2) ** 2
+        + math.cos(origin_latitude) * math.cos(destination_latitude)
+        * math.sin((destination_longitude - origin_longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(haversine))
+
+
+class TravelTimeEstimator:
+    """
+    Szacuje odległość drogową jako odległość w linii prostej pomnożoną przez współczynnik krętości dróg, a czas
+    przejazdu liniowym modelem prędkości - oba modele są dopasowywane do par zapisanych już w magazynie odległości
+    """
+    circuity_factor: float
+    duration_intercept: float
+    minutes_per_km: float
+    fit_statistics: Optional[FitStatistics]
+
+    def __init__(self, circuity_factor: float = DEFAULT_CIRCUITY_FACTOR, duration_intercept: float = 0.0,
+                 minutes_per_km: float = DEFAULT_MINUTES_PER_KM):
+        self.circuity_factor = circuity_factor
+        self.duration_intercept = duration_intercept
+        self.minutes_per_km = minutes_per_km
+        self.fit_statistics = None
+
+    def __repr__(self):
+        return (f"TravelTimeEstimator(krętość: {self.circuity_factor:.3f}, czas = {self.duration_intercept:.2f} + "
+                f"{self.minutes_per_km:.3f} * odległość, {self.fit_statistics})")
+
+    @classmethod
+    def FromDistanceStore(cls, distance_store: Optional[DistanceSource] = None,
+                          places_csv_file: str = PLACES_CSV_FILE) -> TravelTimeEstimator:
+        """Przyjmuje DistanceStore lub PlacesDatabase - oba udostępniają zapisane pary przez IterateStoredPairs"""
+        if distance_store is None:
+            distance_store = GetDistanceStore()
+        estimator: TravelTimeEstimator = cls()
+        estimator.Fit(dict(distance_store.IterateStoredPairs()), ReadPlacesCoordinates(places_csv_file))
+        return estimator
+
+    def Fit(self, distances: Dict[PlacesPair, Tuple[float, float]],
+            places_coordinates: Dict[str, Coordinates]) -> FitStatistics:
+        """Dopasowuje modele metodą najmniejszych kwadratów, pomijając pary bez współrzędnych obu miejsc"""
+        straight_line_distances: List[float] = []
+        road_distances: List[float] = []
+        durations: List[float] = []
+        for (origin, destination), (distance, duration) in distances.items():
+            if origin not in places_coordinates or destination not in places_coordinates:
+                continue
+            straight_line_distances.append(
+                HaversineDistance(places_coordinates[origin], places_coordinates[destination])
+            )
+            road_distances.append(distance)
+            durations.append(duration)
+        if len(road_distances) < MINIMAL_PAIRS_COUNT_FOR_FIT:
+            raise RuntimeError("Za mało zapisanych par ze znanymi współrzędnymi, aby dopasować model")
+        straight_line_distances_array: np.ndarray = np.array(straight_line_distances)
+        road_distances_array: np.ndarray = np.array(road_distances)
+        durations_array: np.ndarray = np.array(durations)
+        straight_line_distances_squares_sum: float = float(
+            np.dot(straight_line_distances_array, straight_line_distances_array)
+        )
+        if straight_line_distances_squares_sum == 0:
+            raise RuntimeError("Wszystkie zapisane pary łączą miejsca o tych samych współrzędnych, nie można dopasować "
+                               "modelu")
+        # Regresja przez początek układu - para miejsc w tym samym punkcie ma zerową odległość
+        self.circuity_factor = float(
+            np.dot(straight_line_distances_array, road_distances_array) / straight_line_distances_squares_sum
+        )
+        self.minutes_per_km, self.duration_intercept = map(float, np.polyfit(road_distances_array, durations_array, 1))
+        estimated_distances: np.ndarray = self.circuity_factor * straight_line_distances_array
+        estimated_durations: np.ndarray = self.duration_intercept + self.minutes_per_km * estimated_distances
+        self.fit_statistics = FitStatistics(
+            len(road_distances),
+            float(np.sqrt(np.mean((estimated_distances - road_distances_array) ** 2))),
+            float(np.mean(np.abs(estimated_distances - road_distances_array))),
+            float(np.sqrt(np.mean((estimated_durations - durations_array) ** 2))),
+            float(np.mean(np.abs(estimated_durations - durations_array)))
+        )
+        return self.fit_statistics
+
+    def IsDurationAtLeast(self, minutes_per_straight_line_km: float) -> bool:
+        """Sprawdza, czy każdy szacowany czas jest nie krótszy niż odległość w linii prostej razy podana wartość"""
+        return (self.duration_intercept >= 0 and
+                self.minutes_per_km * self.circuity_factor >= minutes_per_straight_line_km)
+
+    def EstimateDistanceAndDuration(self, origin: Coordinates, destination: Coordinates) -> Tuple[float, float]:
+        distance: float = self.circuity_factor * HaversineDistance(origin, destination)
+        if distance == 0:
+            return 0, 0
+        return distance, max(self.duration_intercept + self.minutes_per_km * distance, 0.0)
+
+
+def ReadPlacesCoordinates(places_csv_file: str = PLACES_CSV_FILE) -> Dict[str, Coordinates]:
+    places_coordinates_df: pd.DataFrame = pd.read_csv(
+        places_csv_file, header=0, index_col=0, encoding="utf-8"
+    ).dropna()
+    places_coordinates: Dict[str, Coordinates] = {}
+    for address, coordinates in zip(places_coordinates_df[PLACES_CSV_FILE_ADDRESS_COLUMN_NAME],
+                                    places_coordinates_df[PLACES_CSV_COORDINATES_COLUMN_NAME]):
+        latitude, longitude = [float(coordinate) for coordinate in coordinates.split(",")]
+        places_coordinates[address] = (latitude, longitude)
+    return places_coordinates
+
+
+current_travel_time_estimator: Optional[TravelTimeEstimator] = None
+current_estimation_mode: EstimationMode = EstimationMode.DISABLED
+
+
+def GetTravelTimeEstimator() -> Tuple[Optional[TravelTimeEstimator], EstimationMode]:
+    return current_travel_time_estimator, current_estimation_mode
+
+
+def UseTravelTimeEstimator(estimator: Optional[TravelTimeEstimator],
+                           mode: EstimationMode = EstimationMode.FALLBACK) -> Tuple[Optional[TravelTimeEstimator],
+                                                                                     EstimationMode]:
+    """
+    Włącza szacowanie czasów przejazdu w całym procesie: FALLBACK - gdy pary nie ma w magazynie, a zapytanie do API się
+    nie powiodło, PRIMARY - zawsze dla brakujących par, bez zapytań do API. Zwraca poprzednie ustawienia
+    """
+    global current_travel_time_estimator, current_estimation_mode
+    previous_settings: Tuple[Optional[TravelTimeEstimator], EstimationMode] = GetTravelTimeEstimator()
+    if estimator is None:
+        mode = EstimationMode.DISABLED
+    current_travel_time_estimator, current_estimation_mode = estimator, mode
+    return previous_settings
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Dopasowuje model szacowania czasów przejazdu do zapisanych odległości i wypisuje błąd dopasowania"
+    )
+    parser.add_argument("--places-csv", default=PLACES_CSV_FILE, help="ścieżka do pliku ze współrzędnymi")
+    arguments: argparse.Namespace = parser.parse_args()
+    print(TravelTimeEstimator.FromDistanceStore(places_csv_file=arguments.places_csv))
+
+
+if __name__ == '__main__':
+    main()
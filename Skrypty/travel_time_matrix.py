@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from distance_store import DistanceSource, GetDistanceStore
+from spatial_index import AreDurationsBoundedByStraightLine
+from utilities import PlaceAddress
+
+# Stałe
+INITIAL_MATRIX_CAPACITY: int = 64
+
+
+class TravelTimeMatrix:
+    """
+    Gęste macierze odległości i czasów przejazdu indeksowane numerami miejsc nadawanymi przy wczytywaniu scenariusza.
+    Brakujące wartości (NaN) są uzupełniane z magazynu odległości przy pierwszym odwołaniu
+    """
+    place_ids: Dict[str, int]
+    places: List[PlaceAddress]
+    distances: np.ndarray
+    durations: np.ndarray
+    source_distance_store: DistanceSource
+    has_durations_below_straight_line_bound: bool
+
+    def __init__(self, capacity: int = INITIAL_MATRIX_CAPACITY):
+        self.place_ids = {}
+        self.places = []
+        self.distances = np.full((capacity, capacity), np.nan)
+        self.durations = np.full((capacity, capacity), np.nan)
+        self.source_distance_store = GetDistanceStore()
+        self.has_durations_below_straight_line_bound = False
+
+    def __repr__(self):
+        return f"TravelTimeMatrix(miejsca: {len(self.places)}, znane pary: {self.GetKnownPairsCount()})"
+
+    def GetKnownPairsCount(self) -> int:
+        places_count: int = len(self.places)
+        return int(np.count_nonzero(~np.isnan(self.durations[:places_count, :places_count])))
+
+    def GetPlaceId(self, place: PlaceAddress) -> int:
+        place_id: Optional[int] = self.place_ids.get(place.address_for_api_requests)
+        if place_id is None:
+            place_id = len(self.places)
+            if place_id >= self.durations.shape[0]:
+                self.IncreaseCapacity()
+            self.place_ids[place.address_for_api_requests] = place_id
+            self.places.append(place)
+            self.distances[place_id, place_id] = self.durations[place_id, place_id] = 0
+        place.place_id = place_id
+        return place_id
+
+    def IncreaseCapacity(self):
+        old_capacity: int = self.durations.shape[0]
+        for attribute_name in ["distances", "durations"]:
+            enlarged_matrix: np.ndarray = np.full((2 * old_capacity, 2 * old_capacity), np.nan)
+            enlarged_matrix[:old_capacity, :old_capacity] = getattr(self, attribute_name)
+            setattr(self, attribute_name, enlarged_matrix)
+
+    def Build(self, places: Iterable[PlaceAddress]):
+        """Nadaje numery miejscom i jednorazowo wypełnia macierze parami obecnymi w magazynie odległości"""
+        self.CheckDistanceStore()
+        unique_places: List[PlaceAddress] = [
+            self.places[place_id] for place_id in sorted({self.GetPlaceId(place) for place in places})
+        ]
+        for origin in unique_places:
+            for destination in unique_places:
+                if (np.isnan(self.durations[origin.place_id, destination.place_id]) and
+                        self.source_distance_store.IsPairPresent(origin.address_for_api_requests,
+                                                                 destination.address_for_api_requests)):
+                    self.FillPair(origin, destination)
+
+    def CheckDistanceStore(self):
+        """Po podmianie magazynu odległości zapamiętane wartości są zapominane, numery miejsc pozostają bez zmian"""
+        if GetDistanceStore() is self.source_distance_store:
+            return
+        self.source_distance_store = GetDistanceStore()
+        self.distances.fill(np.nan)
+        self.durations.fill(np.nan)
+        np.fill_diagonal(self.distances, 0)
+        np.fill_diagonal(self.durations, 0)
+        self.has_durations_below_straight_line_bound = False
+
+    def FillPair(self, origin: PlaceAddress, destination: PlaceAddress):
+        distance, duration = origin.GetDistanceAndDurationToOtherPlace(destination)
+        if not AreDurationsBoundedByStraightLine():
+            self.has_durations_below_straight_line_bound = True
+        self.distances[origin.place_id, destination.place_id] = distance
+        self.durations[origin.place_id, destination.place_id] = duration
+
+    def GetDistanceAndDuration(self, origin: PlaceAddress, destination: PlaceAddress) -> Tuple[float, float]:
+        self.CheckDistanceStore()
+        origin_id: int = self.GetPlaceId(origin)
+        destination_id: int = self.GetPlaceId(destination)
+        if np.isnan(self.durations[origin_id, destination_id]):
+            self.FillPair(origin, destination)
+        return float(self.distances[origin_id, destination_id]), float(self.durations[origin_id, destination_id])
+
+    def GetDurationsToDestination(self, origins: List[PlaceAddress], destination: PlaceAddress) -> np.ndarray:
+        """Zwraca wektor czasów przejazdu z każdego z miejsc początkowych do jednego miejsca docelowego"""
+        self.CheckDistanceStore()
+        origins_ids: np.ndarray = np.fromiter(
+            (self.GetPlaceId(origin) for origin in origins), dtype=np.intp, count=len(origins)
+        )
+        destination_id: int = self.GetPlaceId(destination)
+        durations: np.ndarray = self.durations[origins_ids, destination_id]
+        missing_indices: np.ndarray = np.flatnonzero(np.isnan(durations))
+        if missing_indices.size:
+            for i in missing_indices:
+                self.FillPair(origins[i], destination)
+            durations = self.durations[origins_ids, destination_id]
+        return durations
+
+    def GetDurationsFromOrigin(self, origin: PlaceAddress, destinations: List[PlaceAddress]) -> np.ndarray:
+        """Zwraca wektor czasów przejazdu z jednego miejsca początkowego do każdego z miejsc docelowych"""
+        self.CheckDistanceStore()
+        origin_id: int = self.GetPlaceId(origin)
+        destinations_ids: np.ndarray = np.fromiter(
+            (self.GetPlaceId(destination) for destination in destinations), dtype=np.intp, count=len(destinations)
+        )
+        durations: np.ndarray = self.durations[origin_id, destinations_ids]
+        missing_indices: np.ndarray = np.flatnonzero(np.isnan(durations))
+        if missing_indices.size:
+            for i in missing_indices:
+                self.FillPair(origin, destinations[i])
+            durations = self.durations[origin_id, destinations_ids]
+        return durations
+
+
+current_travel_time_matrix: TravelTimeMatrix = TravelTimeMatrix()
+
+
+def GetTravelTimeMatrix() -> TravelTimeMatrix:
+    return current_travel_time_matrix
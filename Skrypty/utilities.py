@@ -1,22 +1,27 @@
 from __future__ import annotations
 from dotenv import load_dotenv
-import json
 from os import getenv
 import pandas as pd
 import re
 import requests
 from typing import Dict, List, Optional, Tuple
 
+from distance_store import (DISTANCE_KEY, DISTANCES_JSON_FILE, DURATION_KEY, AppendPairsToJournal, DistanceSource,
+                            DistanceStore, GetDistanceStore, GetDistanceStoreForFile, GetJournalFilename)
+from places_database import (GetPlacesDatabase, PLACES_CSV_COORDINATES_COLUMN_NAME, PLACES_CSV_FILE,
+                             PLACES_CSV_FILE_ADDRESS_COLUMN_NAME, PlacesDatabase)
+from travel_time_estimator import EstimationMode, GetTravelTimeEstimator, TravelTimeEstimator
+
 load_dotenv()
 
 # Stałe
-PLACES_CSV_FILE: str = "../Dane/Miejsca.csv"
 PLACES_CSV_FILE_FIRST_ROW_NUMBER: int = 2
-PLACES_CSV_FILE_ADDRESS_COLUMN_NAME: str = "adres"
-PLACES_CSV_COORDINATES_COLUMN_NAME: str = "współrzędne"
-DISTANCES_JSON_FILE: str = "../Dane/Odległości.json"
-DISTANCE_KEY: str = "odległość [km]"
-DURATION_KEY: str = "czas podróży [min]"
+MATRIX_API_URL: str = "https://trueway-matrix.p.rapidapi.com/CalculateDrivingMatrix"
+GEOCODING_API_URL: str = "https://trueway-geocoding.p.rapidapi.com/Geocode"
+MATRIX_API_MAX_PLACES_PER_REQUEST: int = 25
+
+# Własne typy
+AddressKey = Tuple[str, Optional[float], Optional[float]]
 
 
 class PlaceAddress:
@@ -24,6 +29,7 @@ class PlaceAddress:
     address_for_places_data: str
     latitude: Optional[float]
     longitude: Optional[float]
+    place_id: Optional[int]
 
     def __init__(self, street: str, number: str, postal_code: str, city: str,
                  latitude: Optional[float] = None, longitude: Optional[float] = None):
@@ -33,23 +39,44 @@ class PlaceAddress:
         self.address_for_places_data = " ".join([address_first_part, address_second_part])
         self.latitude = latitude
         self.longitude = longitude
+        self.place_id = None  # numer nadawany przez macierz czasów przejazdu
         if latitude is None or longitude is None:
             self.Geocoding()
 
     def __eq__(self, other):
         if not isinstance(other, PlaceAddress):
             return False
-        return vars(self) == vars(other)
+        return self.GetKey() == other.GetKey()
+
+    def __hash__(self):
+        # Współrzędne mogą zostać uzupełnione po utworzeniu obiektu, dlatego nie wchodzą do skrótu
+        return hash(self.address_for_api_requests)
 
     def __repr__(self):
         return str(self.__dict__)
 
+    def GetKey(self) -> AddressKey:
+        return self.address_for_api_requests, self.latitude, self.longitude
+
     @classmethod
     def FromString(cls, address_string: str) -> PlaceAddress:
-        address_parts: Tuple[str, str, str, str] = cls.DivideAddressIntoParts(address_string)
-        return PlaceAddress(
-            street=address_parts[0], number=address_parts[1], postal_code=address_parts[2], city=address_parts[3]
-        )
+        """
+        Zwraca wspólny dla całego procesu, zakodowany już obiekt adresu - adresy są rejestrowane po znormalizowaniu
+        """
+        address_parts: Tuple[str, str, str, str] = cls.DivideAddressIntoParts(NormalizeAddressString(address_string))
+        address_for_api_requests: str = cls.GetAddressForAPIRequestsFromParts(address_parts)
+        registered_address: Optional[PlaceAddress] = addresses_registry.get(address_for_api_requests)
+        if registered_address is None:
+            registered_address = PlaceAddress(
+                street=address_parts[0], number=address_parts[1], postal_code=address_parts[2], city=address_parts[3]
+            )
+            addresses_registry[address_for_api_requests] = registered_address
+        return registered_address
+
+    @staticmethod
+    def GetAddressForAPIRequestsFromParts(address_parts: Tuple[str, str, str, str]) -> str:
+        street, number, postal_code, city = address_parts
+        return f"{street} {number}, {postal_code} {city}"
 
     @staticmethod
     def DivideAddressIntoParts(address_string: str) -> Tuple[str, str, str, str]:
@@ -69,12 +96,32 @@ class PlaceAddress:
         """Funkcja kodująca adres na współrzędne geograficzne"""
         if self.longitude and self.latitude:
             return
-        if self.AreCoordinatesSavedInDataFrame():
-            self.ReadCoordinatesFromDataFrame()
+        registered_address: Optional[PlaceAddress] = addresses_registry.get(self.address_for_api_requests)
+        if registered_address is not None and registered_address.AreCoordinatesPresent():
+            self.latitude, self.longitude = registered_address.latitude, registered_address.longitude
+            return
+        places_database: Optional[PlacesDatabase] = GetPlacesDatabase()
+        if places_database is not None:
+            self.GeocodingUsingDatabase(places_database)
+            return
+        places_coordinates_df: pd.DataFrame = pd.read_csv(PLACES_CSV_FILE, header=0, index_col=0, encoding="utf-8")
+        if self.AreCoordinatesSavedInDataFrame(places_coordinates_df):
+            self.ReadCoordinatesFromDataFrame(places_coordinates_df)
             return
         self.GeocodeUsingAPI()
         self.SavePlaceCoordinatesToFile()
 
+    def GeocodingUsingDatabase(self, places_database: PlacesDatabase):
+        saved_coordinates: Optional[Tuple[float, float]] = places_database.ReadCoordinates(
+            self.address_for_api_requests
+        )
+        if saved_coordinates is not None:
+            self.latitude, self.longitude = saved_coordinates
+            return
+        self.GeocodeUsingAPI()
+        places_database.SaveCoordinates(self.address_for_api_requests, self.latitude, self.longitude)
+        places_database.Flush()
+
     def AreCoordinatesSavedInDataFrame(self, places_coordinates_df: Optional[pd.DataFrame] = None) -> bool:
         if places_coordinates_df is None:
             places_coordinates_df = pd.read_csv(
@@ -97,13 +144,7 @@ class PlaceAddress:
         self.latitude, self.longitude = [float(coordinate) for coordinate in coordinates.split(",")]
 
     def GeocodeUsingAPI(self, ):
-        url = "https://trueway-geocoding.p.rapidapi.com/Geocode"
-        querystring = {"address": self.address_for_api_requests, "language": "pl", "country": "pl"}
-        headers = {"x-rapidapi-key": getenv("XRAPID_API_KEY"), "x-rapidapi-host": "trueway-geocoding.p.rapidapi.com"}
-        response = requests.get(url, headers=headers, params=querystring).json()
-        coordinates = response["results"][0]["location"]
-        self.latitude = coordinates["lat"]
-        self.longitude = coordinates["lng"]
+        self.latitude, self.longitude = GeocodeAddressUsingAPI(self.address_for_api_requests)
 
     def SavePlaceCoordinatesToFile(self, target_csv_file: str = PLACES_CSV_FILE):
         if not self.AreCoordinatesPresent():
@@ -128,53 +169,61 @@ class PlaceAddress:
             raise RuntimeError("Współrzędne nie zostały jeszcze zakodowane, nie można obliczyć odległości")
         if self == other:
             return 0, 0
-        saved_distance_and_duration: Optional[Tuple[float, float]] = self.ReadDistanceAndDurationFromFile(other)
+        distance_store: DistanceSource = GetDistanceStore()
+        saved_distance_and_duration: Optional[Tuple[float, float]] = distance_store.ReadDistanceAndDuration(
+            self.address_for_api_requests, other.address_for_api_requests
+        )
         if saved_distance_and_duration:
             return saved_distance_and_duration
-        distance, duration = self.CalculateDistanceAndDurationToOtherPlaceUsingAPI(other)
-        self.SaveDistanceAndDurationToFile(distance, duration, other)
+        estimator, estimation_mode = GetTravelTimeEstimator()
+        if estimation_mode == EstimationMode.PRIMARY:
+            return self.EstimateDistanceAndDurationToOtherPlace(other, estimator)
+        try:
+            distance, duration = self.CalculateDistanceAndDurationToOtherPlaceUsingAPI(other)
+        except (requests.RequestException, KeyError, ValueError):
+            if estimation_mode == EstimationMode.FALLBACK:
+                return self.EstimateDistanceAndDurationToOtherPlace(other, estimator)
+            raise
+        distance_store.SaveDistanceAndDuration(
+            self.address_for_api_requests, other.address_for_api_requests, distance, duration
+        )
         return distance, duration
 
+    def EstimateDistanceAndDurationToOtherPlace(self, other: PlaceAddress,
+                                                estimator: TravelTimeEstimator) -> Tuple[float, float]:
+        """Szacunki nie są zapisywane w magazynie odległości, aby nie mieszały się z danymi z API"""
+        return estimator.EstimateDistanceAndDuration((self.latitude, self.longitude), (other.latitude, other.longitude))
+
     def ReadDistanceAndDurationFromFile(self, other_place: PlaceAddress, filename: str = DISTANCES_JSON_FILE) \
             -> Optional[Tuple[float, float]]:
-        with open(filename, "r", encoding="utf-8") as file:
-            file_contents: str = file.read()
-        if not file_contents:
-            return None
-        saved_distances: Dict[str, Dict[str, Dict[str, float]]] = json.loads(file_contents)
-        for origin, info_for_origin in saved_distances.items():
-            if origin == self.address_for_api_requests:
-                for destination, info_for_origin_destination in info_for_origin.items():
-                    if destination == other_place.address_for_api_requests:
-                        return info_for_origin_destination[DISTANCE_KEY], info_for_origin_destination[DURATION_KEY]
-        return None
+        distance_store: DistanceSource = GetDistanceStoreForFile(filename) or DistanceStore(filename)
+        return distance_store.ReadDistanceAndDuration(
+            self.address_for_api_requests, other_place.address_for_api_requests
+        )
 
     def CalculateDistanceAndDurationToOtherPlaceUsingAPI(self, other: PlaceAddress) -> Tuple[float, float]:
-        url = "https://trueway-matrix.p.rapidapi.com/CalculateDrivingMatrix"
-        querystring = {"origins": f"{str(self.latitude)},{str(self.longitude)}",
-                       "destinations": f"{str(other.latitude)},{str(other.longitude)}"}
-        headers = {"X-RapidAPI-key": getenv("XRAPID_API_KEY"), "X-RapidAPI-Host": "trueway-matrix.p.rapidapi.com"}
-        response = requests.get(url, headers=headers, params=querystring).json()
+        distances, durations = CalculateDrivingMatrixUsingAPI([self], [other])
         origin_index: int = 0
         destination_index: int = 0
-        distance: float = response["distances"][origin_index][destination_index] / 1000
-        duration: float = response["durations"][origin_index][destination_index] / 60
-        return distance, duration
+        return distances[origin_index][destination_index], durations[origin_index][destination_index]
 
     def SaveDistanceAndDurationToFile(
             self, distance: float, duration: float, other: PlaceAddress, target_json_file: str = DISTANCES_JSON_FILE
     ):
-        if self.IsDistanceAndDurationPresentInTheFile(other, target_json_file):
+        """
+        Para zapisywana do pliku magazynu używanego w procesie trafia przez ten magazyn, do innego pliku jest dopisywana
+        do dziennika bez wczytywania zapisanych już par
+        """
+        distance_store: Optional[DistanceSource] = GetDistanceStoreForFile(target_json_file)
+        if distance_store is None:
+            AppendPairsToJournal(GetJournalFilename(target_json_file), [
+                ((self.address_for_api_requests, other.address_for_api_requests), (distance, duration))
+            ])
             return
-        with (open(target_json_file, "r+", encoding="utf-8") as file):
-            file_contents: str = file.read()
-            saved_distances: Dict[str, Dict[str, Dict[str, float]]] = {}
-            if file_contents:
-                saved_distances = json.loads(file_contents)
-            saved_distances = self.AddDistanceAndDurationToDictionary(saved_distances, other, distance, duration)
-            file.seek(0)
-            file.truncate()
-            json.dump(saved_distances, file, ensure_ascii=False, indent=2)
+        distance_store.SaveDistanceAndDuration(
+            self.address_for_api_requests, other.address_for_api_requests, distance, duration
+        )
+        distance_store.Flush()
 
     def IsDistanceAndDurationPresentInTheFile(self, other_place: PlaceAddress,
                                               filename: str = DISTANCES_JSON_FILE) -> bool:
@@ -196,6 +245,45 @@ class PlaceAddress:
         return dictionary
 
 
+addresses_registry: Dict[str, PlaceAddress] = {}
+
+
+def NormalizeAddressString(address_string: str) -> str:
+    """Usuwa przecinki i nadmiarowe białe znaki, aby różne zapisy tego samego adresu dawały ten sam klucz"""
+    return " ".join(address_string.replace(",", " ").split())
+
+
+def ClearAddressesRegistry():
+    addresses_registry.clear()
+
+
+def GeocodeAddressUsingAPI(address_for_api_requests: str, url: str = GEOCODING_API_URL,
+                           session: Optional[requests.Session] = None) -> Tuple[float, float]:
+    """Zwraca szerokość i długość geograficzną adresu - sesja pozwala na ponowne użycie połączeń"""
+    querystring = {"address": address_for_api_requests, "language": "pl", "country": "pl"}
+    headers = {"x-rapidapi-key": getenv("XRAPID_API_KEY"), "x-rapidapi-host": "trueway-geocoding.p.rapidapi.com"}
+    response = (session or requests).get(url, headers=headers, params=querystring)
+    response.raise_for_status()
+    coordinates = response.json()["results"][0]["location"]
+    return coordinates["lat"], coordinates["lng"]
+
+
+def CalculateDrivingMatrixUsingAPI(origins: List[PlaceAddress], destinations: List[PlaceAddress],
+                                   url: str = MATRIX_API_URL) -> Tuple[List[List[float]], List[List[float]]]:
+    """Funkcja uzyskująca w jednym zapytaniu macierze dystansów w kilometrach i czasów w minutach między miejscami"""
+    if len(origins) > MATRIX_API_MAX_PLACES_PER_REQUEST or len(destinations) > MATRIX_API_MAX_PLACES_PER_REQUEST:
+        raise ValueError(
+            f"Zapytanie może obejmować maksymalnie {MATRIX_API_MAX_PLACES_PER_REQUEST} miejsc początkowych i docelowych"
+        )
+    querystring = {"origins": ";".join(f"{str(place.latitude)},{str(place.longitude)}" for place in origins),
+                   "destinations": ";".join(f"{str(place.latitude)},{str(place.longitude)}" for place in destinations)}
+    headers = {"X-RapidAPI-key": getenv("XRAPID_API_KEY"), "X-RapidAPI-Host": "trueway-matrix.p.rapidapi.com"}
+    response = requests.get(url, headers=headers, params=querystring).json()
+    distances: List[List[float]] = [[distance / 1000 for distance in row] for row in response["distances"]]
+    durations: List[List[float]] = [[duration / 60 for duration in row] for row in response["durations"]]
+    return distances, durations
+
+
 class TargetDestination:
     address: PlaceAddress
 
@@ -220,6 +220,44 @@ class Victim:
         return base_problems.difference(healed_problems)
 
 
+class DeteriorationScheduler:
+    """
+    Przechowuje poszkodowanych jeszcze nieprzyjętych do szpitala i obniża ich RPM jedną partią na granicy każdego
+    przedziału pogorszenia - przyjęci poszkodowani są usuwani na stałe
+    """
+    not_admitted_victims: Dict[int, Victim]
+
+    def __init__(self, victims: List[Victim]):
+        self.not_admitted_victims = {
+            victim.id_: victim for victim in victims if not victim.HasBeenAdmittedToHospital()
+        }
+
+    def __repr__(self):
+        return f"DeteriorationScheduler(nieprzyjęci poszkodowani: {len(self.not_admitted_victims)})"
+
+    def RemoveAdmittedVictim(self, victim: Victim):
+        self.not_admitted_victims.pop(victim.id_, None)
+
+    @staticmethod
+    def IsDeteriorationTime(time_from_simulation_start: int) -> bool:
+        return time_from_simulation_start % RPM_DETERIORATION_INTERVAL_MINUTES == 0
+
+    @staticmethod
+    def GetNextDeteriorationTime(time_from_simulation_start: int) -> int:
+        next_interval_index: int = time_from_simulation_start // RPM_DETERIORATION_INTERVAL_MINUTES + 1
+        return next_interval_index * RPM_DETERIORATION_INTERVAL_MINUTES
+
+    def LowerRPMOfNotAdmittedVictims(self, time_from_simulation_start: int):
+        """Poza granicami przedziałów nic nie robi - nie trzeba przeglądać poszkodowanych w każdej minucie"""
+        if not self.IsDeteriorationTime(time_from_simulation_start):
+            return
+        for victim_id, victim in list(self.not_admitted_victims.items()):
+            if victim.HasBeenAdmittedToHospital():
+                del self.not_admitted_victims[victim_id]
+                continue
+            victim.LowerRPM(time_from_simulation_start)
+
+
 class TransitionData(NamedTuple):
     """Reprezentuje przejście między stanami poszkodowanego"""
     parent_state_number: StateNumber
@@ -260,6 +298,14 @@ class State:
         self.timed_next_state_transition = timed_next_state_transition
         self.intervention_next_state_transition = intervention_next_state_transition
 
+    def CreateCopy(self) -> State:
+        """Kopia dla nowego poszkodowanego - kolor triażu stanu zmienia się w trakcie symulacji po zgonie"""
+        return State(
+            self.number, self.is_victim_walking, self.respiratory_rate, self.pulse_rate,
+            self.is_victim_following_orders, self.triage_colour, list(self.health_problems), self.description,
+            self.timed_next_state_transition, self.intervention_next_state_transition
+        )
+
     @staticmethod
     def CheckInitArguments(number: StateNumber, respiratory_rate: int, pulse_rate: int):
         if number < 1:
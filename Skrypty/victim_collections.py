@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import bisect
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from victim_classes import TriageColour, Victim
+
+# Własne typy
+EntryId = int
+# (RPM, pozycja na liście, numer wpisu)
+QueueKey = Tuple[int, int, EntryId]
+TriageKey = Tuple[TriageColour, int]
+
+
+class VictimsCollection:
+    """
+    Zbiór poszkodowanych udostępniający operacje listy używane w symulacji (append, remove, in, len, iteracja).
+    Każde dodanie tworzy osobny wpis, więc ten sam poszkodowany może wystąpić wielokrotnie, tak jak na liście.
+    Numery wpisów rosną, więc lista ordered_entries jest posortowana - indeksowanie nie wymaga kopiowania i kosztuje
+    O(1), a usuwany wpis jest wyszukiwany binarnie w O(log n). Samo usunięcie z listy przesuwa dalsze wpisy, więc
+    remove kosztuje O(n) - pozostaje ono tańsze od list.remove, bo nie porównuje poszkodowanych, a tylko przesuwa
+    pamięć
+    """
+    victims_by_entry: Dict[EntryId, Victim]
+    entries_by_victim: Dict[int, List[EntryId]]
+    positions_by_entry: Dict[EntryId, int]
+    ordered_entries: List[EntryId]
+    next_entry_id: EntryId
+    next_position: int
+
+    def __init__(self, victims: Iterable[Victim] = ()):
+        self.victims_by_entry = {}
+        self.entries_by_victim = {}
+        self.positions_by_entry = {}
+        self.ordered_entries = []
+        self.next_entry_id = self.next_position = 0
+        for victim in victims:
+            self.append(victim)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({[victim.id_ for victim in self]})"
+
+    def __len__(self) -> int:
+        return len(self.victims_by_entry)
+
+    def __iter__(self) -> Iterator[Victim]:
+        """Zbioru nie należy zmieniać w trakcie iteracji"""
+        return map(self.victims_by_entry.__getitem__, self.ordered_entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.victims_by_entry[entry_id] for entry_id in self.ordered_entries[index]]
+        return self.victims_by_entry[self.ordered_entries[index]]
+
+    def __contains__(self, victim: Victim) -> bool:
+        return victim.id_ in self.entries_by_victim
+
+    def append(self, victim: Victim):
+        entry_id: EntryId = self.next_entry_id
+        self.next_entry_id += 1
+        self.victims_by_entry[entry_id] = victim
+        self.ordered_entries.append(entry_id)
+        self.entries_by_victim.setdefault(victim.id_, []).append(entry_id)
+        self.positions_by_entry[entry_id] = self.TakeNextPosition()
+        self.OnEntryAdded(entry_id)
+
+    def remove(self, victim: Victim):
+        """Usuwa pierwsze wystąpienie poszkodowanego, tak jak list.remove"""
+        entries: Optional[List[EntryId]] = self.entries_by_victim.get(victim.id_)
+        if not entries:
+            raise ValueError(f"Poszkodowanego {victim.id_} nie ma w zbiorze")
+        self.RemoveEntry(min(entries, key=lambda entry_id: self.positions_by_entry[entry_id]))
+
+    def RemoveEntry(self, entry_id: EntryId):
+        """Wyszukiwanie wpisu kosztuje O(log n), ale usunięcie go z ordered_entries - O(n)"""
+        victim: Victim = self.victims_by_entry.pop(entry_id)
+        del self.positions_by_entry[entry_id]
+        del self.ordered_entries[bisect.bisect_left(self.ordered_entries, entry_id)]
+        entries: List[EntryId] = self.entries_by_victim[victim.id_]
+        entries.remove(entry_id)
+        if not entries:
+            del self.entries_by_victim[victim.id_]
+        self.OnEntryRemoved(entry_id)
+
+    def TakeNextPosition(self) -> int:
+        position: int = self.next_position
+        self.next_position += 1
+        return position
+
+    def OnEntryAdded(self, entry_id: EntryId):
+        pass
+
+    def OnEntryRemoved(self, entry_id: EntryId):
+        pass
+
+
+class TransportReadyVictimsQueue(VictimsCollection):
+    """
+    Kolejka priorytetowa poszkodowanych gotowych do transportu, uporządkowana rosnąco po RPM. Zachowuje się jak
+    lista sortowana stabilnie po RPM przy każdym wyborze poszkodowanego - remisy są rozstrzygane pozycją na liście.
+    Klucze są przeliczane tylko po zmianie RPM na granicy przedziału pogorszenia, a wybór kolejnego poszkodowanego
+    kosztuje O(log n)
+    """
+    keys_by_entry: Dict[EntryId, QueueKey]
+    heap: List[QueueKey]
+    last_sort_position_limit: int
+    is_rekey_needed: bool
+
+    def __init__(self, victims: Iterable[Victim] = ()):
+        self.keys_by_entry = {}
+        self.heap = []
+        self.last_sort_position_limit = 0
+        self.is_rekey_needed = False
+        super().__init__(victims)
+
+    def OnEntryAdded(self, entry_id: EntryId):
+        self.SetKey(entry_id, self.victims_by_entry[entry_id].current_RPM_number)
+
+    def OnEntryRemoved(self, entry_id: EntryId):
+        del self.keys_by_entry[entry_id]
+
+    def SetKey(self, entry_id: EntryId, RPM_number: int):
+        key: QueueKey = (RPM_number, self.positions_by_entry[entry_id], entry_id)
+        self.keys_by_entry[entry_id] = key
+        heapq.heappush(self.heap, key)
+
+    def MarkRPMChanged(self):
+        """Wywoływane po zmianie RPM poszkodowanych - klucze zostaną przeliczone przy najbliższym sortowaniu"""
+        self.is_rekey_needed = True
+
+    def SortByRPM(self):
+        """
+        Odpowiednik stabilnego sortowania listy po RPM. Po zmianie RPM pozycje są nadawane od nowa w kolejności,
+        jaką miałaby lista: najpierw wpisy z ostatniego sortowania (po ówczesnym RPM), potem dodane później
+        """
+        if self.is_rekey_needed:
+            entries_in_list_order: List[EntryId] = sorted(
+                self.keys_by_entry,
+                key=lambda entry_id: self.GetListOrderKey(self.keys_by_entry[entry_id])
+            )
+            self.keys_by_entry = {}
+            self.heap = []
+            for entry_id in entries_in_list_order:
+                self.positions_by_entry[entry_id] = self.TakeNextPosition()
+                self.SetKey(entry_id, self.victims_by_entry[entry_id].current_RPM_number)
+            self.is_rekey_needed = False
+        self.last_sort_position_limit = self.next_position
+
+    def GetListOrderKey(self, key: QueueKey) -> Tuple[int, int, int]:
+        RPM_number, position, _ = key
+        if position < self.last_sort_position_limit:
+            return 0, RPM_number, position
+        return 1, 0, position
+
+    def PeekFirst(self) -> Optional[Victim]:
+        """Zwraca poszkodowanego z najniższym RPM, po drodze usuwając z kopca nieaktualne klucze"""
+        while self.heap:
+            key: QueueKey = self.heap[0]
+            if self.keys_by_entry.get(key[2]) == key:
+                return self.victims_by_entry[key[2]]
+            heapq.heappop(self.heap)
+        return None
+
+    def PopFirst(self) -> Optional[Victim]:
+        victim: Optional[Victim] = self.PeekFirst()
+        if victim is not None:
+            self.RemoveEntry(heapq.heappop(self.heap)[2])
+        return victim
+
+
+class AssessedVictims(VictimsCollection):
+    """
+    Poszkodowani po triażu z osobnym kopcem dla każdego koloru triażu. Kopce zawierają poszkodowanych żywych i nie
+    poddawanych procedurze, uporządkowanych po RPM i pozycji na liście. Nieaktualne wpisy są usuwane przy odczycie,
+    a po zmianie RPM na granicy przedziału kopce są budowane od nowa. Po rozpoczęciu i zakończeniu procedury na
+    poszkodowanym należy wywołać RefreshVictim, żeby liczniki żywych i czekających na procedurę były aktualne
+    """
+    triage_keys_by_entry: Dict[EntryId, Optional[TriageKey]]
+    alive_by_entry: Dict[EntryId, bool]
+    heaps: Dict[TriageColour, List[QueueKey]]
+    alive_victims_count: int
+    waiting_victims_count: int
+
+    def __init__(self, victims: Iterable[Victim] = ()):
+        self.triage_keys_by_entry = {}
+        self.alive_by_entry = {}
+        self.heaps = {colour: [] for colour in TriageColour if colour != TriageColour.BLACK}
+        self.alive_victims_count = self.waiting_victims_count = 0
+        super().__init__(victims)
+
+    def OnEntryAdded(self, entry_id: EntryId):
+        self.UpdateEntry(entry_id)
+
+    def OnEntryRemoved(self, entry_id: EntryId):
+        self.alive_victims_count -= self.alive_by_entry.pop(entry_id)
+        self.waiting_victims_count -= self.triage_keys_by_entry.pop(entry_id) is not None
+
+    def GetCurrentTriageKey(self, entry_id: EntryId) -> Optional[TriageKey]:
+        """Zwraca None dla poszkodowanych, którzy nie czekają na procedurę"""
+        victim: Victim = self.victims_by_entry[entry_id]
+        if victim.under_procedure or victim.IsDead():
+            return None
+        return victim.current_state.triage_colour, victim.current_RPM_number
+
+    def UpdateEntry(self, entry_id: EntryId):
+        """Zapisuje obecny stan wpisu, poprawia liczniki i wstawia do kopca nowy klucz, jeśli się zmienił"""
+        triage_key: Optional[TriageKey] = self.GetCurrentTriageKey(entry_id)
+        is_alive: bool = not self.victims_by_entry[entry_id].IsDead()
+        previous_triage_key: Optional[TriageKey] = self.triage_keys_by_entry.get(entry_id)
+        self.alive_victims_count += is_alive - self.alive_by_entry.get(entry_id, False)
+        self.waiting_victims_count += (triage_key is not None) - (previous_triage_key is not None)
+        self.alive_by_entry[entry_id] = is_alive
+        self.triage_keys_by_entry[entry_id] = triage_key
+        if triage_key is not None and triage_key != previous_triage_key:
+            colour, RPM_number = triage_key
+            heapq.heappush(self.heaps[colour], (RPM_number, self.positions_by_entry[entry_id], entry_id))
+
+    def RefreshVictim(self, victim: Victim):
+        """Należy wywołać po rozpoczęciu lub zakończeniu procedury na poszkodowanym"""
+        for entry_id in self.entries_by_victim.get(victim.id_, []):
+            self.UpdateEntry(entry_id)
+
+    def MarkRPMChanged(self):
+        """
+        Na granicy przedziału zmieniają się RPM i stany wielu poszkodowanych naraz, a część z nich umiera - kopce
+        i liczniki są wtedy liczone od nowa
+        """
+        for heap in self.heaps.values():
+            heap.clear()
+        self.triage_keys_by_entry = {}
+        self.alive_by_entry = {}
+        self.alive_victims_count = self.waiting_victims_count = 0
+        for entry_id in self.victims_by_entry:
+            self.UpdateEntry(entry_id)
+
+    def PeekBest(self, colour: TriageColour) -> Optional[Victim]:
+        """Zwraca czekającego na procedurę poszkodowanego o danym kolorze z najniższym RPM"""
+        heap: List[QueueKey] = self.heaps[colour]
+        while heap:
+            RPM_number, _, entry_id = heap[0]
+            if self.triage_keys_by_entry.get(entry_id, False) == (colour, RPM_number):
+                if self.GetCurrentTriageKey(entry_id) == (colour, RPM_number):
+                    return self.victims_by_entry[entry_id]
+                heapq.heappop(heap)
+                self.UpdateEntry(entry_id)
+            else:
+                heapq.heappop(heap)
+        return None
+
+    def AnyAliveVictim(self) -> bool:
+        return self.alive_victims_count > 0
+
+    def AnyVictimWaitingForProcedure(self) -> bool:
+        """Licznik może zawyżać liczbę czekających, dopóki nie wywołano RefreshVictim - rozstrzyga wtedy PeekBest"""
+        if self.waiting_victims_count == 0:
+            return False
+        return any(self.PeekBest(colour) is not None for colour in self.heaps)
@@ -2,8 +2,9 @@
 from __future__ import annotations
 import enum
 import math
-from typing import List, Optional
+from typing import Dict, Iterable, KeysView, List, Optional
 
+from travel_time_matrix import GetTravelTimeMatrix
 from victim_classes import Procedure, Victim
 from utilities import PlaceAddress, TargetDestination
 
@@ -39,14 +40,26 @@ class Specialist:
         self.time_until_procedure_is_finished = procedure.time_needed_to_perform
         self.is_idle = False
 
-    def ContinuePerformingProcedure(self):
+    def ContinuePerformingProcedure(self) -> Optional[Victim]:
+        """Zwraca poszkodowanego, na którym właśnie zakończono procedurę"""
         if self.time_until_procedure_is_finished is not None:
             if self.target_victim and self.target_victim.IsDead():
                 self.ClearAfterProcedure()
-                return
+                return None
             self.time_until_procedure_is_finished -= 1
             if self.time_until_procedure_is_finished == 0:
+                helped_victim: Optional[Victim] = self.target_victim
                 self.FinishProcedure()
+                return helped_victim
+        return None
+
+    def SkipMinutesOfProcedure(self, minutes: int):
+        """Skraca trwającą procedurę o podaną liczbę minut, w czasie których nie może się ona zakończyć"""
+        if self.time_until_procedure_is_finished is None:
+            return
+        if self.time_until_procedure_is_finished <= minutes:
+            raise RuntimeError(f"Procedura specjalisty {self.id_} z ZRM {self.origin_zrm_id} zakończy się wcześniej")
+        self.time_until_procedure_is_finished -= minutes
 
     def ClearAfterProcedure(self):
         self.time_until_procedure_is_finished = self.target_victim = self.stored_procedure = None
@@ -116,8 +129,9 @@ class ZRM:
         self.CalculateTimeForTheNextDestination()
 
     def CalculateTimeForTheNextDestination(self):
-        distance, duration = self.origin_location_address.GetDistanceAndDurationToOtherPlace(
-            self.target_location.address)
+        distance, duration = GetTravelTimeMatrix().GetDistanceAndDuration(
+            self.origin_location_address, self.target_location.address
+        )
         self.time_until_destination_in_minutes = math.ceil(0.64 * duration)
 
     def DriveOrFinishDrivingAndReturnVictim(self) -> Optional[Victim]:
@@ -129,6 +143,19 @@ class ZRM:
             return self.FinishDrivingAndReturnVictim()
         return None
 
+    def SkipMinutesWithoutEvents(self, minutes: int):
+        """
+        Odpowiada podanej liczbie wywołań DriveOrFinishDrivingAndReturnVictim i SpecialistsContinuePerformingProcedures,
+        w czasie których nie kończy się ani dojazd, ani żadna procedura
+        """
+        if self.IsDriving():
+            if self.time_until_destination_in_minutes <= minutes:
+                raise RuntimeError(f"ZRM {self.id_} dojedzie na miejsce wcześniej")
+            self.time_until_destination_in_minutes -= minutes
+        if self.are_specialists_outside:
+            for specialist in self.specialists:
+                specialist.SkipMinutesOfProcedure(minutes)
+
     def FinishDrivingAndReturnVictim(self) -> Optional[Victim]:
         victim_to_return: Optional[Victim] = self.transported_victim
         self.transported_victim = None
@@ -166,10 +193,87 @@ class ZRM:
     def AreSpecialistsIdle(self) -> bool:
         return all([specialist.is_idle for specialist in self.specialists])
 
-    def SpecialistsContinuePerformingProcedures(self):
+    def SpecialistsContinuePerformingProcedures(self) -> List[Victim]:
+        """Zwraca poszkodowanych, na których w tej minucie zakończono procedury"""
+        helped_victims: List[Victim] = []
         if self.are_specialists_outside:
             for specialist in self.specialists:
-                specialist.ContinuePerformingProcedure()
+                helped_victim: Optional[Victim] = specialist.ContinuePerformingProcedure()
+                if helped_victim is not None:
+                    helped_victims.append(helped_victim)
+        return helped_victims
+
+
+class TeamRegistry:
+    """
+    Rejestr zespołów ze słownikiem po id_ - zbiory zespołów wolnych i w akcji są słownikami, bo zachowują kolejność
+    dodania, od której zależy kolejność wydawania poleceń w symulacji. Wolne zespoły stoją w swoich bazach (zespół
+    rusza dopiero po przeniesieniu do akcji), więc rejestr grupuje je dodatkowo według miejsca bazy i aktualizuje
+    te grupy przy każdym przeniesieniu zespołu do akcji
+    """
+    teams_by_id: Dict[str, ZRM]
+    idle_teams: Dict[str, ZRM]
+    teams_in_action: Dict[str, ZRM]
+    # Pozycja zespołu na liście wolnych zespołów - rozstrzyga remisy czasów dojazdu tak jak stabilne sortowanie
+    teams_orders: Dict[str, int]
+    idle_teams_by_place: Dict[str, Dict[str, ZRM]]
+    idle_teams_places_keys: Dict[str, str]
+
+    def __init__(self, teams: List[ZRM]):
+        self.teams_by_id = {}
+        self.idle_teams = {}
+        self.teams_in_action = {}
+        self.teams_orders = {}
+        self.idle_teams_by_place = {}
+        self.idle_teams_places_keys = {}
+        for order, team in enumerate(teams):
+            if team.id_ in self.teams_by_id:
+                raise ValueError(f"Zespół {team.id_} występuje więcej niż raz")
+            self.teams_by_id[team.id_] = self.idle_teams[team.id_] = team
+            self.teams_orders[team.id_] = order
+            place_key: str = team.origin_location_address.address_for_api_requests
+            self.idle_teams_by_place.setdefault(place_key, {})[team.id_] = team
+            self.idle_teams_places_keys[team.id_] = place_key
+
+    def __repr__(self):
+        return f"TeamRegistry(wolne: {list(self.idle_teams)}, w akcji: {list(self.teams_in_action)})"
+
+    def GetTeamById(self, team_id: str) -> Optional[ZRM]:
+        return self.teams_by_id.get(team_id)
+
+    def GetIdleTeams(self) -> List[ZRM]:
+        return list(self.idle_teams.values())
+
+    def GetTeamsInAction(self) -> List[ZRM]:
+        return list(self.teams_in_action.values())
+
+    def GetIdleTeamsPlacesKeys(self) -> KeysView[str]:
+        """Klucze (adresy dla zapytań API) miejsc, w których stoi co najmniej jeden wolny zespół"""
+        return self.idle_teams_by_place.keys()
+
+    def GetIdleTeamsAtPlace(self, place_key: str) -> Iterable[ZRM]:
+        return self.idle_teams_by_place.get(place_key, {}).values()
+
+    def GetTeamOrder(self, team_id: str) -> int:
+        return self.teams_orders[team_id]
+
+    def AnyIdleTeams(self) -> bool:
+        return bool(self.idle_teams)
+
+    def IsIdle(self, team_id: str) -> bool:
+        return team_id in self.idle_teams
+
+    def TeamIntoAction(self, team: ZRM):
+        """Przenosi zespół o id_ przekazanego zespołu do akcji - od tej chwili rejestr przechowuje przekazany obiekt"""
+        if team.id_ not in self.idle_teams:
+            return
+        del self.idle_teams[team.id_]
+        place_key: str = self.idle_teams_places_keys.pop(team.id_)
+        place_teams: Dict[str, ZRM] = self.idle_teams_by_place[place_key]
+        del place_teams[team.id_]
+        if not place_teams:
+            del self.idle_teams_by_place[place_key]
+        self.teams_by_id[team.id_] = self.teams_in_action[team.id_] = team
 
 
 class ZRMType(enum.Enum):
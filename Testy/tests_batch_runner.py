@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from typing import List
+
+import batch_runner as br
+import distance_store as dist
+import random_streams as rs
+import replicate_statistics as rep_stat
+import results_store as rs_store
+import simulation as sim
+
+
+class TestBatchRunner(unittest.TestCase):
+    scenario_path: str = "../Scenariusze/Scenariusz 1.txt"
+
+    def testRunReplicateSameAsSimulationWithReplicateGenerator(self):
+        simulation: sim.Simulation = sim.Simulation(
+            self.scenario_path, random_generator=rs.CreateReplicateRandomGenerator(7, 3)
+        )
+        expected_results: sim.SimulationResultsTuple = simulation.PerformSimulation()
+
+        self.assertEqual(
+            br.RunReplicate(br.ReplicateTask(self.scenario_path, 7, 3)),
+            br.ReplicateResult(3, expected_results, simulation.solution)
+        )
+
+    def testRunReplicateFlushesDistanceStore(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sample_store: dist.DistanceStore = dist.DistanceStore(os.path.join(directory, "odleglosci.json"))
+            for (origin, destination), (distance, duration) in dist.GetDistanceStore().IterateStoredPairs():
+                sample_store.SaveDistanceAndDuration(origin, destination, distance, duration)
+            previous_store: dist.DistanceSource = dist.SetDistanceStore(sample_store)
+            try:
+                br.RunReplicate(br.ReplicateTask(self.scenario_path, 7, 3))
+                unsaved_pairs_count: int = len(sample_store.unsaved_pairs)
+            finally:
+                dist.SetDistanceStore(previous_store)
+
+            self.assertEqual(unsaved_pairs_count, 0)
+            self.assertTrue(os.path.exists(sample_store.journal_filename))
+
+    def testIterateReplicatesResults(self):
+        throughput_meter: br.ThroughputMeter = br.ThroughputMeter()
+        replicates_results: List[br.ReplicateResult] = list(br.IterateReplicatesResults(
+            self.scenario_path, 4, master_seed=10, workers_count=2, throughput_meter=throughput_meter
+        ))
+
+        self.assertEqual([result.replicate_index for result in replicates_results], [0, 1, 2, 3])
+        self.assertEqual(
+            replicates_results[2], br.RunReplicate(br.ReplicateTask(self.scenario_path, 10, 2))
+        )
+        self.assertEqual(throughput_meter.runs_count, 4)
+        self.assertGreater(throughput_meter.GetRunsPerSecond(), 0)
+
+    def testRunReplicatesUntilPrecisionReached(self):
+        aggregator: rep_stat.ReplicatesAggregator = br.RunReplicatesUntilPrecisionReached(
+            self.scenario_path, 10, target_half_width=1000.0, master_seed=3, workers_count=2, min_replicates_count=4
+        )
+
+        self.assertEqual(aggregator.count, 4)
+
+    def testRunReplicatesUntilPrecisionReachedMaxCount(self):
+        aggregator: rep_stat.ReplicatesAggregator = br.RunReplicatesUntilPrecisionReached(
+            self.scenario_path, 5, target_half_width=None, master_seed=3, workers_count=2
+        )
+
+        self.assertEqual(aggregator.count, 5)
+
+    def testRunReplicatesUntilPrecisionReachedResultsStore(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results_store: rs_store.ResultsStore = rs_store.ResultsStore(directory)
+            br.RunReplicatesUntilPrecisionReached(
+                self.scenario_path, 3, target_half_width=None, master_seed=3, workers_count=2,
+                results_store=results_store
+            )
+
+            self.assertEqual([run.replicate_index for run in results_store.pending_runs], [0, 1, 2])
+            self.assertEqual({run.scenario_name for run in results_store.pending_runs}, {"Scenariusz 1"})
+
+    def testIterateReplicatesResultsNegativeCount(self):
+        self.assertRaises(ValueError, list, br.IterateReplicatesResults(self.scenario_path, -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
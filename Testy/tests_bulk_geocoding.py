@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import http.server
+import json
+import os
+import threading
+import time
+import unittest
+import urllib.parse
+from typing import List
+
+import pandas as pd
+
+import bulk_geocoding as geo
+import tests_utilities as tests_util
+import utilities
+
+SAMPLE_FILENAME: str = "test_bulk_geocoding.csv"
+UNKNOWN_ADDRESS: str = "Nieznana 1, 00-000 Nigdzie"
+# Adres odrzucany kodem 429 przy pierwszych dwóch zapytaniach i adres zawsze odrzucany kodem 503
+THROTTLED_ADDRESS: str = "Oblężona 2, 00-000 Testowo"
+THROTTLED_REQUESTS_COUNT: int = 2
+UNAVAILABLE_ADDRESS: str = "Niedostępna 3, 00-000 Testowo"
+
+
+class StubGeocodingRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Zastępuje API geokodowania - zwraca stałe współrzędne, a dla UNKNOWN_ADDRESS pustą listę wyników. Zapytania
+    o THROTTLED_ADDRESS i UNAVAILABLE_ADDRESS są odrzucane jak przez przeciążony serwer
+    """
+    requested_addresses: List[str] = []
+
+    def do_GET(self):
+        address: str = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["address"][0]
+        StubGeocodingRequestHandler.requested_addresses.append(address)
+        if address == UNAVAILABLE_ADDRESS or (
+                address == THROTTLED_ADDRESS and
+                StubGeocodingRequestHandler.requested_addresses.count(address) <= THROTTLED_REQUESTS_COUNT):
+            self.send_error(503 if address == UNAVAILABLE_ADDRESS else 429)
+            return
+        results = [] if address == UNKNOWN_ADDRESS else [{"location": {"lat": 50.0, "lng": 19.0}}]
+        body: bytes = json.dumps({"results": results}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBulkGeocoding(unittest.TestCase):
+    stub_server: http.server.ThreadingHTTPServer
+    stub_url: str
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubGeocodingRequestHandler)
+        cls.stub_url = f"http://127.0.0.1:{cls.stub_server.server_port}/Geocode"
+        threading.Thread(target=cls.stub_server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_server.shutdown()
+        cls.stub_server.server_close()
+
+    def setUp(self):
+        tests_util.CreateSampleDataFrameWithPlacesCoordinates().to_csv(SAMPLE_FILENAME, index_label="Lp.")
+        StubGeocodingRequestHandler.requested_addresses = []
+
+    def tearDown(self):
+        os.remove(SAMPLE_FILENAME)
+
+    def testRateLimiter(self):
+        rate_limiter: geo.RateLimiter = geo.RateLimiter(requests_per_second=50)
+        start_time: float = time.monotonic()
+        for _ in range(6):
+            rate_limiter.Wait()
+
+        self.assertGreaterEqual(time.monotonic() - start_time, 5 / 50 - 0.01)
+
+    def testRateLimiterInvalid(self):
+        self.assertRaises(ValueError, geo.RateLimiter, 0)
+
+    def testToAddressForAPIRequests(self):
+        self.assertEqual(geo.ToAddressForAPIRequests("Topolowa 16 32-500 Chrzanów "), "Topolowa 16, 32-500 Chrzanów")
+
+    def testReadAddressesFromDataFiles(self):
+        addresses: List[str] = geo.ReadAddressesFromDataFiles(scenarios_paths=["../Scenariusze/Scenariusz 2.txt"])
+
+        self.assertEqual(len(addresses), len(set(addresses)))
+        self.assertTrue("Topolowa 16, 32-500 Chrzanów" in addresses)
+        self.assertTrue("Głowackiego 91, 32-540 Trzebinia" in addresses)
+
+    def testGeocodeAddresses(self):
+        sample_addresses: List[str] = [f"Testowa {i}, 00-000 Testowo" for i in range(10)] + [UNKNOWN_ADDRESS]
+        coordinates, failed_addresses = geo.GeocodeAddresses(
+            sample_addresses, self.stub_url, requests_per_second=100, workers_count=4
+        )
+
+        self.assertEqual(len(coordinates), 10)
+        self.assertEqual(coordinates["Testowa 3, 00-000 Testowo"], (50.0, 19.0))
+        self.assertEqual(failed_addresses, [UNKNOWN_ADDRESS])
+        self.assertEqual(sorted(StubGeocodingRequestHandler.requested_addresses), sorted(sample_addresses))
+
+    def testGeocodeAddressesRetriesThroughRateLimiter(self):
+        start_time: float = time.monotonic()
+        coordinates, failed_addresses = geo.GeocodeAddresses(
+            [THROTTLED_ADDRESS], self.stub_url, requests_per_second=20, workers_count=1, retry_backoff_seconds=0
+        )
+
+        self.assertEqual(coordinates, {THROTTLED_ADDRESS: (50.0, 19.0)})
+        self.assertEqual(failed_addresses, [])
+        self.assertEqual(
+            StubGeocodingRequestHandler.requested_addresses, [THROTTLED_ADDRESS] * (THROTTLED_REQUESTS_COUNT + 1)
+        )
+        self.assertGreaterEqual(time.monotonic() - start_time, THROTTLED_REQUESTS_COUNT / 20 - 0.01)
+
+    def testGeocodeAddressesGivesUpAfterRetries(self):
+        coordinates, failed_addresses = geo.GeocodeAddresses(
+            [UNAVAILABLE_ADDRESS], self.stub_url, requests_per_second=100, workers_count=1, retry_backoff_seconds=0
+        )
+
+        self.assertEqual(coordinates, {})
+        self.assertEqual(failed_addresses, [UNAVAILABLE_ADDRESS])
+        self.assertEqual(
+            StubGeocodingRequestHandler.requested_addresses, [UNAVAILABLE_ADDRESS] * (geo.RETRIES_COUNT + 1)
+        )
+
+    def testGeocodeUnknownAddresses(self):
+        sample_addresses: List[str] = ["Testowa 1, 00-000 Testowo", "Testowa 2, 00-000 Testowo", UNKNOWN_ADDRESS]
+        summary: geo.BulkGeocodingSummary = geo.GeocodeUnknownAddresses(
+            sample_addresses, self.stub_url, requests_per_second=100, places_csv_file=SAMPLE_FILENAME
+        )
+        places_coordinates_df: pd.DataFrame = pd.read_csv(SAMPLE_FILENAME, header=0, index_col=0)
+
+        self.assertEqual(summary, geo.BulkGeocodingSummary(3, 2, [UNKNOWN_ADDRESS]))
+        self.assertEqual(
+            places_coordinates_df[utilities.PLACES_CSV_FILE_ADDRESS_COLUMN_NAME].dropna().tolist(),
+            sample_addresses[:2]
+        )
+        self.assertEqual(
+            geo.GeocodeUnknownAddresses(
+                sample_addresses[:2], self.stub_url, requests_per_second=100, places_csv_file=SAMPLE_FILENAME
+            ),
+            geo.BulkGeocodingSummary(0, 0, [])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import http.server
+import json
+import os
+import threading
+import unittest
+import urllib.parse
+from typing import List
+
+import distance_prefetch as prefetch
+import distance_store as dist
+import scenario_classes as scenario
+import utilities as util
+
+SAMPLE_FILENAME: str = "test_distance_prefetch.json"
+SAMPLE_JOURNAL_FILENAME: str = "test_distance_prefetch_dziennik.jsonl"
+
+
+class StubMatrixRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Zastępuje API macierzy odległości - odległość to 1 km, a czas 1 min na każdą parę miejsc"""
+    requests_count: int = 0
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        n_origins: int = len(query["origins"][0].split(";"))
+        n_destinations: int = len(query["destinations"][0].split(";"))
+        StubMatrixRequestHandler.requests_count += 1
+        body: bytes = json.dumps({
+            "distances": [[1000] * n_destinations for _ in range(n_origins)],
+            "durations": [[60] * n_destinations for _ in range(n_origins)]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDistancePrefetch(unittest.TestCase):
+    stub_server: http.server.HTTPServer
+    stub_url: str
+    sample_scenario: scenario.Scenario
+    sample_store: dist.DistanceStore
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub_server = http.server.HTTPServer(("127.0.0.1", 0), StubMatrixRequestHandler)
+        cls.stub_url = f"http://127.0.0.1:{cls.stub_server.server_port}/CalculateDrivingMatrix"
+        threading.Thread(target=cls.stub_server.serve_forever, daemon=True).start()
+        cls.sample_scenario = scenario.Scenario("../Scenariusze/Scenariusz 2.txt")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_server.shutdown()
+        cls.stub_server.server_close()
+
+    def setUp(self):
+        open(SAMPLE_FILENAME, "w", encoding="utf-8").close()
+        self.sample_store = dist.DistanceStore(SAMPLE_FILENAME)
+        StubMatrixRequestHandler.requests_count = 0
+
+    def tearDown(self):
+        os.remove(SAMPLE_FILENAME)
+        if os.path.exists(SAMPLE_JOURNAL_FILENAME):
+            os.remove(SAMPLE_JOURNAL_FILENAME)
+
+    def testGetRequiredPlacesPairs(self):
+        required_pairs: List[prefetch.PlacesPair] = prefetch.GetRequiredPlacesPairs(self.sample_scenario)
+        incident_address: util.PlaceAddress = self.sample_scenario.address
+
+        self.assertTrue(all(incident_address in pair for pair in required_pairs))
+        self.assertTrue(all(origin != destination for origin, destination in required_pairs))
+        for hospital in self.sample_scenario.hospitals:
+            self.assertTrue((incident_address, hospital.address) in required_pairs)
+        for team in self.sample_scenario.teams:
+            self.assertTrue((team.origin_location_address, incident_address) in required_pairs)
+
+    def testPrefetchMissingDistances(self):
+        summary: prefetch.PrefetchSummary = prefetch.PrefetchMissingDistances(
+            self.sample_scenario, self.sample_store, self.stub_url
+        )
+        reloaded_store: dist.DistanceStore = dist.DistanceStore(SAMPLE_FILENAME)
+
+        self.assertEqual(summary.missing_pairs_count, summary.required_pairs_count)
+        self.assertEqual(summary.requests_count, 2)
+        self.assertEqual(StubMatrixRequestHandler.requests_count, 2)
+        for origin, destination in prefetch.GetRequiredPlacesPairs(self.sample_scenario):
+            self.assertEqual(
+                reloaded_store.ReadDistanceAndDuration(
+                    origin.address_for_api_requests, destination.address_for_api_requests
+                ),
+                (1.0, 1.0)
+            )
+
+    def testPrefetchMissingDistancesNothingMissing(self):
+        prefetch.PrefetchMissingDistances(self.sample_scenario, self.sample_store, self.stub_url)
+        summary: prefetch.PrefetchSummary = prefetch.PrefetchMissingDistances(
+            self.sample_scenario, self.sample_store, self.stub_url
+        )
+
+        self.assertEqual(summary.missing_pairs_count, 0)
+        self.assertEqual(summary.requests_count, 0)
+        self.assertEqual(StubMatrixRequestHandler.requests_count, 2)
+
+    def testCountPairsCoveredByReverseDirection(self):
+        incident_address: util.PlaceAddress = self.sample_scenario.address
+        for hospital in self.sample_scenario.hospitals:
+            self.sample_store.SaveDistanceAndDuration(
+                incident_address.address_for_api_requests, hospital.address.address_for_api_requests, 1.0, 1.0
+            )
+        report: prefetch.ReverseDirectionReport = prefetch.CountPairsCoveredByReverseDirection(
+            self.sample_scenario, self.sample_store
+        )
+
+        self.assertEqual(report.missing_pairs_count, report.required_pairs_count - len(self.sample_scenario.hospitals))
+        self.assertEqual(report.covered_by_reverse_direction_count, len(self.sample_scenario.hospitals))
+        self.assertFalse(self.sample_store.reverse_direction_fallback)
+
+    def testDivideMissingPairsIntoBatchesRequestLimit(self):
+        sample_addresses: List[util.PlaceAddress] = [
+            util.PlaceAddress("Testowa", str(i), "00-000", "Testowo", latitude=50.0, longitude=19.0 + i / 100)
+            for i in range(util.MATRIX_API_MAX_PLACES_PER_REQUEST + 5)
+        ]
+        sample_pairs: List[prefetch.PlacesPair] = [
+            (origin, self.sample_scenario.address) for origin in sample_addresses
+        ]
+        batches = prefetch.DivideMissingPairsIntoBatches(sample_pairs)
+
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(len(batches[0][0]), util.MATRIX_API_MAX_PLACES_PER_REQUEST)
+        self.assertEqual(len(batches[1][0]), 5)
+        self.assertEqual(batches[0][1], [self.sample_scenario.address])
+
+
+if __name__ == "__main__":
+    unittest.main()
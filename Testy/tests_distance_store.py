@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import unittest
+from typing import List
+
+import distance_store as dist
+import tests_utilities as tests_util
+
+SAMPLE_FILENAME: str = "test_distance_store.json"
+SAMPLE_JOURNAL_FILENAME: str = "test_distance_store_dziennik.jsonl"
+
+
+def CreateSampleDistancesFile(filename: str = SAMPLE_FILENAME):
+    sample_distance, sample_duration = tests_util.CreateSampleDistanceAndDurationData()
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump({
+            "Topolowa 16, 32-500 Chrzanów": {
+                "Magnoliowa 10, 32-500 Chrzanów": {
+                    dist.DISTANCE_KEY: sample_distance, dist.DURATION_KEY: sample_duration
+                }
+            }
+        }, file, ensure_ascii=False, indent=2)
+
+
+class TestDistanceStore(unittest.TestCase):
+    sample_store: dist.DistanceStore
+
+    def setUp(self):
+        CreateSampleDistancesFile()
+        self.sample_store = dist.DistanceStore(SAMPLE_FILENAME)
+
+    def tearDown(self):
+        os.remove(SAMPLE_FILENAME)
+        if os.path.exists(SAMPLE_JOURNAL_FILENAME):
+            os.remove(SAMPLE_JOURNAL_FILENAME)
+
+    def testReadDistanceAndDurationHit(self):
+        results = self.sample_store.ReadDistanceAndDuration(
+            "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"
+        )
+
+        self.assertEqual(results, tests_util.CreateSampleDistanceAndDurationData())
+        self.assertEqual(self.sample_store.GetStatistics(), dist.DistanceStoreStatistics(1, 0, 1))
+
+    def testReadDistanceAndDurationMiss(self):
+        results = self.sample_store.ReadDistanceAndDuration(
+            "Magnoliowa 10, 32-500 Chrzanów", "Topolowa 16, 32-500 Chrzanów"
+        )
+
+        self.assertIsNone(results)
+        self.assertEqual(self.sample_store.GetStatistics(), dist.DistanceStoreStatistics(0, 1, 1))
+
+    def testReadDistanceAndDurationReverseDirection(self):
+        self.sample_store.SetReverseDirectionFallback(True, asymmetry_factor=2.0)
+        sample_distance, sample_duration = tests_util.CreateSampleDistanceAndDurationData()
+        results = self.sample_store.ReadDistanceAndDuration(
+            "Magnoliowa 10, 32-500 Chrzanów", "Topolowa 16, 32-500 Chrzanów"
+        )
+
+        self.assertEqual(results, (2 * sample_distance, 2 * sample_duration))
+        self.assertEqual(self.sample_store.GetStatistics(), dist.DistanceStoreStatistics(0, 0, 1, 1))
+        self.assertTrue(self.sample_store.IsPairPresent(
+            "Magnoliowa 10, 32-500 Chrzanów", "Topolowa 16, 32-500 Chrzanów"
+        ))
+
+    def testSetReverseDirectionFallbackInvalidFactor(self):
+        self.assertRaises(ValueError, self.sample_store.SetReverseDirectionFallback, True, 0)
+
+    def testReadDistanceAndDurationFileReadOnce(self):
+        self.sample_store.ReadDistanceAndDuration("Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów")
+        os.remove(SAMPLE_FILENAME)
+        results = self.sample_store.ReadDistanceAndDuration(
+            "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"
+        )
+        CreateSampleDistancesFile()
+
+        self.assertEqual(results, tests_util.CreateSampleDistanceAndDurationData())
+
+    def testSaveDistanceAndDurationNotWrittenBeforeFlush(self):
+        with open(SAMPLE_FILENAME, encoding="utf-8") as f1:
+            file1 = f1.read()
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        with open(SAMPLE_FILENAME, encoding="utf-8") as f2:
+            file2 = f2.read()
+
+        self.assertEqual(file1, file2)
+        self.assertEqual(self.sample_store.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))
+
+    def testFlush(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        reloaded_store: dist.DistanceStore = dist.DistanceStore(SAMPLE_FILENAME)
+
+        self.assertEqual(self.sample_store.unsaved_pairs, set())
+        self.assertEqual(reloaded_store.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))
+        self.assertEqual(
+            reloaded_store.ReadDistanceAndDuration("Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"),
+            tests_util.CreateSampleDistanceAndDurationData()
+        )
+
+    def testFlushAppendsToJournalOnly(self):
+        with open(SAMPLE_FILENAME, encoding="utf-8") as f1:
+            file1 = f1.read()
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        self.sample_store.SaveDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X", 3.0, 4.0)
+        self.sample_store.Flush()
+        with open(SAMPLE_FILENAME, encoding="utf-8") as f2:
+            file2 = f2.read()
+        with open(SAMPLE_JOURNAL_FILENAME, encoding="utf-8") as journal:
+            journal_lines = journal.readlines()
+
+        self.assertEqual(file1, file2)
+        self.assertEqual(len(journal_lines), 2)
+        self.assertEqual(self.sample_store.journal_pairs_count, 2)
+
+    def testLoadIgnoresUnfinishedJournalLine(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        with open(SAMPLE_JOURNAL_FILENAME, "a", encoding="utf-8") as journal:
+            journal.write('{"miejsce początkowe": "B 2, 00-0')
+        reloaded_store: dist.DistanceStore = dist.DistanceStore(SAMPLE_FILENAME)
+
+        self.assertEqual(reloaded_store.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))
+        self.assertEqual(reloaded_store.GetStatistics().stored_pairs_count, 2)
+
+    def testCompact(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        self.sample_store.Compact()
+        with open(SAMPLE_FILENAME, encoding="utf-8") as file:
+            saved_distances = json.load(file)
+
+        self.assertFalse(os.path.exists(SAMPLE_JOURNAL_FILENAME))
+        self.assertEqual(self.sample_store.journal_pairs_count, 0)
+        self.assertEqual(
+            saved_distances["A 1, 00-000 X"]["B 2, 00-000 Y"], {dist.DISTANCE_KEY: 1.0, dist.DURATION_KEY: 2.0}
+        )
+        self.assertTrue("Topolowa 16, 32-500 Chrzanów" in saved_distances)
+
+    def testCompactInBackground(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        self.sample_store.CompactInBackground().join()
+        reloaded_store: dist.DistanceStore = dist.DistanceStore(SAMPLE_FILENAME)
+
+        self.assertFalse(os.path.exists(SAMPLE_JOURNAL_FILENAME))
+        self.assertEqual(reloaded_store.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))
+
+    def testCompactInBackgroundSkippedWhileCompactionRuns(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        compaction_may_finish: threading.Event = threading.Event()
+        running_thread: threading.Thread = threading.Thread(target=compaction_may_finish.wait)
+        running_thread.start()
+        self.sample_store.compaction_thread = running_thread
+        returned_thread: threading.Thread = self.sample_store.CompactInBackground()
+        compaction_may_finish.set()
+        running_thread.join()
+
+        self.assertIs(returned_thread, running_thread)
+        self.assertTrue(os.path.exists(SAMPLE_JOURNAL_FILENAME))
+        self.sample_store.CompactInBackground().join()
+        self.assertFalse(os.path.exists(SAMPLE_JOURNAL_FILENAME))
+
+    def testFlushCountsPairsAppendedDuringCompaction(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_store.Flush()
+        compaction_thread: threading.Thread = self.sample_store.CompactInBackground()
+        self.sample_store.SaveDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X", 3.0, 4.0)
+        self.sample_store.Flush()
+        compaction_thread.join()
+        # Zależnie od kolejności wątków druga para trafia do scalonej migawki albo do nowego dziennika
+        journal_lines: List[str] = []
+        if os.path.exists(SAMPLE_JOURNAL_FILENAME):
+            with open(SAMPLE_JOURNAL_FILENAME, encoding="utf-8") as journal:
+                journal_lines = journal.readlines()
+
+        self.assertEqual(self.sample_store.journal_pairs_count, len(journal_lines))
+
+    def testIterateStoredPairs(self):
+        self.sample_store.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+
+        self.assertEqual(
+            dict(self.sample_store.IterateStoredPairs()),
+            {
+                ("Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"):
+                    tests_util.CreateSampleDistanceAndDurationData(),
+                ("A 1, 00-000 X", "B 2, 00-000 Y"): (1.0, 2.0)
+            }
+        )
+
+    def testAppendPairsToJournal(self):
+        dist.AppendPairsToJournal(SAMPLE_JOURNAL_FILENAME, [(("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))])
+
+        self.assertEqual(
+            dist.DistanceStore(SAMPLE_FILENAME).ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0)
+        )
+
+    def testGetDistanceStoreForFile(self):
+        previous_store: dist.DistanceStore = dist.SetDistanceStore(self.sample_store)
+
+        self.assertIs(dist.GetDistanceStoreForFile(os.path.abspath(SAMPLE_FILENAME)), self.sample_store)
+        self.assertIsNone(dist.GetDistanceStoreForFile("inny_plik.json"))
+        dist.SetDistanceStore(previous_store)
+
+    def testSaveDistanceAndDurationExistingPairIgnored(self):
+        self.sample_store.SaveDistanceAndDuration(
+            "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów", 100.0, 200.0
+        )
+
+        self.assertEqual(self.sample_store.unsaved_pairs, set())
+        self.assertEqual(
+            self.sample_store.ReadDistanceAndDuration(
+                "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"
+            ),
+            tests_util.CreateSampleDistanceAndDurationData()
+        )
+
+    def testSetDistanceStore(self):
+        previous_store: dist.DistanceStore = dist.SetDistanceStore(self.sample_store)
+
+        self.assertIs(dist.GetDistanceStore(), self.sample_store)
+        dist.SetDistanceStore(previous_store)
+        self.assertIs(dist.GetDistanceStore(), previous_store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from typing import List
+import unittest
+
+import hospital_availability as ha
+import sor_classes as sor
+import victim_classes as victim
+import tests_sor_classes as tests_sor
+
+
+def CreateSampleHospitals() -> List[sor.Hospital]:
+    return [
+        sor.Hospital(
+            id_=1, name="Szpital Powiatowy w Chrzanowie",
+            address=sor.PlaceAddress("Topolowa", "16", "32-500", "Chrzanów"),
+            departments=[
+                sor.Department(id_=1, name="Oddział chirurgii urazowo-ortopedycznej", medical_categories=[25],
+                               current_beds_count=1)
+            ]
+        ),
+        sor.Hospital(
+            id_=2, name="Szpital Specjalistyczny w Jaworznie",
+            address=sor.PlaceAddress("Chełmońskiego", "28", "43-600", "Jaworzno"),
+            departments=[
+                tests_sor.CreateSampleDepartment(),
+                sor.Department(id_=6, name="Szpitalny Oddział Ratunkowy", medical_categories=[15, 25],
+                               current_beds_count=12)
+            ]
+        )
+    ]
+
+
+class HospitalAvailabilityIndexTests(unittest.TestCase):
+    sample_hospitals: List[sor.Hospital]
+    sample_index: ha.HospitalAvailabilityIndex
+
+    def setUp(self):
+        self.sample_hospitals = CreateSampleHospitals()
+        self.sample_index = ha.HospitalAvailabilityIndex(self.sample_hospitals)
+
+    def testFindFirstHospital(self):
+        self.assertEqual(self.sample_index.FindFirstHospital({25}), self.sample_hospitals[0])
+        self.assertEqual(self.sample_index.FindFirstHospital({15, 39}), self.sample_hospitals[1])
+        self.assertIsNone(self.sample_index.FindFirstHospital({1}))
+
+    def testRefreshHospitalAfterReservation(self):
+        sample_victim: victim.Victim = tests_sor.CreateSampleVictims()[0]
+        self.assertTrue(self.sample_hospitals[0].CanVictimBeTakenIn(sample_victim))
+        self.sample_index.RefreshHospital(self.sample_hospitals[0])
+
+        self.assertEqual(self.sample_index.FindFirstHospital({25}), self.sample_hospitals[1])
+
+        self.sample_hospitals[0].RemoveVictimFromIncoming(sample_victim)
+        self.sample_index.RefreshHospital(self.sample_hospitals[0])
+
+        self.assertEqual(self.sample_index.FindFirstHospital({25}), self.sample_hospitals[0])
+
+    def testDuplicateHospitalId(self):
+        self.assertRaises(
+            ValueError, ha.HospitalAvailabilityIndex, self.sample_hospitals + [CreateSampleHospitals()[0]]
+        )
+
+    def testIsBuiltFrom(self):
+        self.assertTrue(self.sample_index.IsBuiltFrom(self.sample_hospitals))
+        self.assertFalse(self.sample_index.IsBuiltFrom(self.sample_hospitals[:]))
+
+        self.sample_hospitals.pop()
+        self.assertFalse(self.sample_index.IsBuiltFrom(self.sample_hospitals))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+import distance_store as dist
+import places_database as db
+import tests_utilities as tests_util
+import travel_time_estimator as tte
+import utilities
+
+SAMPLE_FILENAME: str = "test_places_database.sqlite"
+
+
+class TestPlacesDatabase(unittest.TestCase):
+    sample_database: db.PlacesDatabase
+
+    def setUp(self):
+        self.sample_database = db.PlacesDatabase(SAMPLE_FILENAME)
+
+    def tearDown(self):
+        self.sample_database.Close()
+        for filename in [SAMPLE_FILENAME, SAMPLE_FILENAME + "-wal", SAMPLE_FILENAME + "-shm"]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def testIsDistanceSource(self):
+        self.assertIsInstance(self.sample_database, dist.DistanceSource)
+        self.assertIsInstance(dist.DistanceStore(), dist.DistanceSource)
+
+    def testIterateStoredPairs(self):
+        self.sample_database.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+
+        self.assertEqual(
+            list(self.sample_database.IterateStoredPairs()), [(("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))]
+        )
+
+    def testFromPlacesDatabaseSameAsFromDistanceStore(self):
+        self.sample_database.ImportFromFiles()
+
+        self.assertEqual(
+            repr(tte.TravelTimeEstimator.FromDistanceStore(self.sample_database)),
+            repr(tte.TravelTimeEstimator.FromDistanceStore(dist.DistanceStore()))
+        )
+
+    def testWALMode(self):
+        journal_mode: str = self.sample_database.GetConnection().execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+
+    def testImportFromFiles(self):
+        summary: db.ImportSummary = self.sample_database.ImportFromFiles()
+        sample_distance, sample_duration = tests_util.CreateSampleDistanceAndDurationData()
+        sample_latitude, sample_longitude = tests_util.CreateSampleCoordinates()
+        results = self.sample_database.ReadDistanceAndDuration(
+            "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów"
+        )
+        coordinates = self.sample_database.ReadCoordinates("Topolowa 16, 32-500 Chrzanów")
+
+        self.assertGreater(summary.imported_places_count, 0)
+        self.assertEqual(summary.imported_pairs_count, self.sample_database.GetStatistics().stored_pairs_count)
+        self.assertAlmostEqual(results[0], sample_distance, delta=0.1)
+        self.assertAlmostEqual(results[1], sample_duration, delta=1)
+        self.assertAlmostEqual(coordinates[0], sample_latitude, delta=0.0015)
+        self.assertAlmostEqual(coordinates[1], sample_longitude, delta=0.015)
+
+    def testImportFromFilesTwice(self):
+        self.sample_database.ImportFromFiles()
+
+        self.assertEqual(self.sample_database.ImportFromFiles(), db.ImportSummary(0, 0))
+
+    def testReadDistanceAndDurationStatistics(self):
+        self.sample_database.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_database.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y")
+        self.sample_database.ReadDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X")
+
+        self.assertEqual(self.sample_database.GetStatistics(), dist.DistanceStoreStatistics(1, 1, 1))
+        self.assertFalse(self.sample_database.IsPairPresent("B 2, 00-000 Y", "A 1, 00-000 X"))
+
+    def testReadDistanceAndDurationReverseDirection(self):
+        self.sample_database.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        self.sample_database.SetReverseDirectionFallback(True, asymmetry_factor=1.5)
+
+        self.assertEqual(self.sample_database.ReadDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X"), (1.5, 3.0))
+        self.assertEqual(self.sample_database.GetStatistics(), dist.DistanceStoreStatistics(0, 0, 1, 1))
+
+    def testConcurrentConnections(self):
+        other_database: db.PlacesDatabase = db.PlacesDatabase(SAMPLE_FILENAME)
+        self.sample_database.SaveDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y", 1.0, 2.0)
+        other_database.SaveDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X", 3.0, 4.0)
+
+        self.assertEqual(other_database.ReadDistanceAndDuration("A 1, 00-000 X", "B 2, 00-000 Y"), (1.0, 2.0))
+        self.assertEqual(self.sample_database.ReadDistanceAndDuration("B 2, 00-000 Y", "A 1, 00-000 X"), (3.0, 4.0))
+        other_database.Close()
+
+    def testUsePlacesDatabase(self):
+        self.sample_database.SaveCoordinates("Topolowa 16, 32-500 Chrzanów", 50.0, 19.0)
+        self.sample_database.SaveDistanceAndDuration(
+            "Topolowa 16, 32-500 Chrzanów", "Magnoliowa 10, 32-500 Chrzanów", 5.0, 6.0
+        )
+        previous_store: dist.DistanceStore = dist.GetDistanceStore()
+        utilities.ClearAddressesRegistry()
+        db.UsePlacesDatabase(self.sample_database)
+        sample_address: utilities.PlaceAddress = tests_util.CreateSampleAddressHospital()
+        sample_address_2: utilities.PlaceAddress = utilities.PlaceAddress(
+            "Magnoliowa", "10", "32-500", "Chrzanów", latitude=50.1, longitude=19.4
+        )
+        results = sample_address.GetDistanceAndDurationToOtherPlace(sample_address_2)
+        db.UsePlacesDatabase(None)
+
+        self.assertEqual((sample_address.latitude, sample_address.longitude), (50.0, 19.0))
+        self.assertEqual(results, (5.0, 6.0))
+        self.assertIsNone(db.GetPlacesDatabase())
+        self.assertIs(dist.GetDistanceStore(), previous_store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import procedure_catalog as pc
+import victim_classes as victim
+
+
+class TestProcedureCatalog(unittest.TestCase):
+    def testGetProcedureCatalogShared(self):
+        self.assertIs(pc.GetProcedureCatalog(), pc.GetProcedureCatalog())
+        self.assertEqual(len(pc.GetProcedureCatalog().procedures), 15)
+
+    def testGetProcedure(self):
+        self.assertEqual(
+            pc.GetProcedureCatalog().GetProcedure(victim.HealthProblem(15, 6)),
+            victim.Procedure.FromDisciplineAndNumber(15, 6, 10)
+        )
+        self.assertIsNone(pc.GetProcedureCatalog().GetProcedure(victim.HealthProblem(-1, -1)))
+
+    def testDuplicatedHealthProblemKeepsFirstProcedure(self):
+        sample_catalog: pc.ProcedureCatalog = pc.ProcedureCatalog([
+            victim.Procedure.FromDisciplineAndNumber(0, 1, 1), victim.Procedure.FromDisciplineAndNumber(0, 1, 5)
+        ])
+
+        self.assertEqual(sample_catalog.GetProcedure(victim.HealthProblem(0, 1)).time_needed_to_perform, 1)
+
+    def testCatalogIsImmutable(self):
+        sample_catalog: pc.ProcedureCatalog = pc.GetProcedureCatalog()
+
+        with self.assertRaises(TypeError):
+            sample_catalog.procedures_by_health_problem[victim.HealthProblem(0, 0)] = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+import random_streams as rs
+import simulation as sim
+
+
+class TestRandomStreams(unittest.TestCase):
+    def testCreateReplicateRandomGeneratorReproducible(self):
+        self.assertEqual(
+            rs.CreateReplicateRandomGenerator(5, 2).random(), rs.CreateReplicateRandomGenerator(5, 2).random()
+        )
+
+    def testCreateReplicateRandomGeneratorIndependentStreams(self):
+        self.assertNotEqual(
+            rs.CreateReplicateRandomGenerator(5, 2).random(), rs.CreateReplicateRandomGenerator(5, 3).random()
+        )
+        self.assertNotEqual(
+            rs.CreateReplicateRandomGenerator(5, 2).random(), rs.CreateReplicateRandomGenerator(6, 2).random()
+        )
+
+    def testSimulationWithGeneratorIgnoresGlobalRandomState(self):
+        scenario_path: str = "../Scenariusze/Scenariusz 2.txt"
+        random.seed(1)
+        simulation: sim.Simulation = sim.Simulation(
+            scenario_path, random_generator=rs.CreateReplicateRandomGenerator(0, 0)
+        )
+        results: sim.SimulationResultsTuple = simulation.PerformSimulation()
+        random.seed(2)
+        other_simulation: sim.Simulation = sim.Simulation(
+            scenario_path, random_generator=rs.CreateReplicateRandomGenerator(0, 0)
+        )
+
+        self.assertEqual(other_simulation.PerformSimulation(), results)
+        self.assertEqual(other_simulation.solution, simulation.solution)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import math
+import statistics
+import unittest
+from typing import List
+
+import replicate_statistics as rep_stat
+import simulation as sim
+
+
+class TestObjectiveFunction(unittest.TestCase):
+    def testCalculateObjectiveFunctionValueDefaultWeights(self):
+        sample_results: sim.SimulationResultsTuple = sim.SimulationResultsTuple(12, 7.5, 100, 60.0)
+
+        self.assertAlmostEqual(
+            rep_stat.CalculateObjectiveFunctionValue(sample_results), -12 + 4 * 7.5 - 0.25 * 100 - 0.3 * 60.0
+        )
+
+    def testCalculateObjectiveFunctionValueCustomWeights(self):
+        sample_results: sim.SimulationResultsTuple = sim.SimulationResultsTuple(12, 7.5, 100, 60.0)
+        sample_weights: rep_stat.ObjectiveFunctionWeights = rep_stat.ObjectiveFunctionWeights(1, 0, 0, 0)
+
+        self.assertEqual(rep_stat.CalculateObjectiveFunctionValue(sample_results, sample_weights), 12)
+
+
+class TestRunningStatistics(unittest.TestCase):
+    sample_values: List[float] = [4.0, 7.0, 13.0, 16.0, 10.5]
+
+    def testMeanAndVariance(self):
+        running_statistics: rep_stat.RunningStatistics = rep_stat.RunningStatistics()
+        for value in self.sample_values:
+            running_statistics.Add(value)
+
+        self.assertEqual(running_statistics.count, 5)
+        self.assertAlmostEqual(running_statistics.mean, statistics.mean(self.sample_values))
+        self.assertAlmostEqual(running_statistics.GetVariance(), statistics.variance(self.sample_values))
+
+    def testConfidenceInterval(self):
+        running_statistics: rep_stat.RunningStatistics = rep_stat.RunningStatistics()
+        for value in self.sample_values:
+            running_statistics.Add(value)
+        expected_half_width: float = 1.959964 * statistics.stdev(self.sample_values) / math.sqrt(5)
+
+        self.assertAlmostEqual(running_statistics.GetConfidenceInterval(0.95).half_width, expected_half_width, 5)
+
+    def testConfidenceIntervalTooFewValues(self):
+        running_statistics: rep_stat.RunningStatistics = rep_stat.RunningStatistics()
+        running_statistics.Add(1.0)
+
+        self.assertTrue(math.isnan(running_statistics.GetVariance()))
+        self.assertEqual(running_statistics.GetConfidenceInterval().half_width, math.inf)
+
+    def testConfidenceIntervalWrongLevel(self):
+        self.assertRaises(ValueError, rep_stat.RunningStatistics().GetConfidenceInterval, 1.5)
+
+
+class TestReplicatesAggregator(unittest.TestCase):
+    aggregator: rep_stat.ReplicatesAggregator
+
+    def setUp(self):
+        self.aggregator = rep_stat.ReplicatesAggregator()
+        for dead_victims_count in [10, 12, 11, 13]:
+            self.aggregator.AddResults(sim.SimulationResultsTuple(dead_victims_count, 7.0, 100, 50.0))
+
+    def testAddResults(self):
+        confidence_intervals = self.aggregator.GetConfidenceIntervals()
+
+        self.assertEqual(self.aggregator.count, 4)
+        self.assertAlmostEqual(confidence_intervals["dead_victims_count"].mean, 11.5)
+        self.assertAlmostEqual(confidence_intervals["total_simulation_time_minutes"].half_width, 0.0)
+        self.assertAlmostEqual(
+            confidence_intervals[rep_stat.OBJECTIVE_FUNCTION_NAME].mean, -11.5 + 4 * 7.0 - 0.25 * 100 - 0.3 * 50.0
+        )
+
+    def testIsPrecisionReached(self):
+        self.assertFalse(self.aggregator.IsPrecisionReached(None, min_replicates_count=0))
+        self.assertFalse(self.aggregator.IsPrecisionReached(100.0))
+        self.assertTrue(self.aggregator.IsPrecisionReached(100.0, min_replicates_count=4))
+        self.assertFalse(self.aggregator.IsPrecisionReached(0.1, min_replicates_count=4))
+
+
+if __name__ == "__main__":
+    unittest.main()
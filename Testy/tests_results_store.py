@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import unittest
+from typing import Dict, List
+
+import numpy as np
+
+import replicate_statistics as rep_stat
+import results_store as rs
+import simulation as sim
+
+# Stałe
+SAMPLE_STORE_DIRECTORY: str = "test_results_store"
+SAMPLE_RESULTS_DIRECTORY: str = "test_results_text_files"
+SAMPLE_RESULTS_FILE_CONTENTS: str = (
+    "Liczba zmarłych: 12, waga: -1.0\n"
+    "Średnia ocena RPM poszkodowanych: 7.5, waga: 4.0\n"
+    "Całkowity czas symulacji: 104, waga: -0.25\n"
+    "Średni czas pomocy: 59.25, waga: -0.3\n"
+    "Obliczona wartość funkcji celu: -26.78\n"
+    "\n"
+    "Rozwiązanie\n"
+    "1. (id poszkodowanego: 5, id zespołu: K01 138, id oddziału szpitalnego: 1-5, czas przyjęcia do szpitala: 30)\n"
+    "2. (id poszkodowanego: 2, id zespołu: S02 214, id oddziału szpitalnego: 2-6, czas przyjęcia do szpitala: 41)"
+)
+
+
+def CreateSampleRun(replicate_index: int, solution_length: int) -> rs.RunRecord:
+    results: sim.SimulationResultsTuple = sim.SimulationResultsTuple(replicate_index, 7.0, 100 + replicate_index, 50.5)
+    return rs.RunRecord(
+        "Scenariusz 1", 3, replicate_index, results, rep_stat.CalculateObjectiveFunctionValue(results),
+        [sim.SolutionRecord(i + 1, i, f"ZRM {i}", f"1-{i}", 10 * i) for i in range(solution_length)]
+    )
+
+
+class TestResultsStore(unittest.TestCase):
+    sample_runs: List[rs.RunRecord]
+
+    def setUp(self):
+        self.sample_runs = [CreateSampleRun(i, i % 3) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(SAMPLE_STORE_DIRECTORY, ignore_errors=True)
+
+    def testAppendRunFlushesFullChunks(self):
+        results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY, chunk_size=2)
+        for run in self.sample_runs:
+            results_store.AppendRun(run)
+
+        self.assertEqual(len(results_store.ListChunkFiles()), 2)
+        self.assertEqual(len(results_store.pending_runs), 1)
+        self.assertEqual(len(results_store.ReadRunsColumns()[rs.RUN_ID_COLUMN]), 4)
+
+    def testReadRunsColumns(self):
+        results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY, chunk_size=2)
+        for run in self.sample_runs:
+            results_store.AppendRun(run)
+        results_store.Flush()
+        runs_columns: Dict[str, np.ndarray] = results_store.ReadRunsColumns()
+
+        np.testing.assert_array_equal(runs_columns[rs.RUN_ID_COLUMN], np.arange(5))
+        np.testing.assert_array_equal(runs_columns["dead_victims_count"], np.arange(5))
+        np.testing.assert_array_equal(runs_columns[rs.MASTER_SEED_COLUMN], np.full(5, 3))
+        np.testing.assert_allclose(
+            runs_columns[rep_stat.OBJECTIVE_FUNCTION_NAME], [run.objective_function_value for run in self.sample_runs]
+        )
+        self.assertEqual(runs_columns[rs.SCENARIO_NAME_COLUMN][4], "Scenariusz 1")
+
+    def testReadSolutionColumns(self):
+        results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY, chunk_size=2)
+        for run in self.sample_runs:
+            results_store.AppendRun(run)
+        results_store.Flush()
+        solution_columns: Dict[str, np.ndarray] = results_store.ReadSolutionColumns()
+
+        np.testing.assert_array_equal(solution_columns[rs.RUN_ID_COLUMN], [1, 2, 2, 4])
+        np.testing.assert_array_equal(solution_columns["team_id"], ["ZRM 0", "ZRM 0", "ZRM 1", "ZRM 0"])
+        np.testing.assert_array_equal(solution_columns["elapsed_simulation_time"], [0, 0, 10, 0])
+
+    def testReopenContinuesRunsIds(self):
+        results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY)
+        results_store.AppendRun(self.sample_runs[0])
+        results_store.Flush()
+        reopened_results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY)
+        reopened_results_store.AppendRun(self.sample_runs[1])
+        reopened_results_store.Flush()
+
+        self.assertEqual(len(reopened_results_store.ListChunkFiles()), 2)
+        np.testing.assert_array_equal(reopened_results_store.ReadRunsColumns()[rs.RUN_ID_COLUMN], [0, 1])
+
+    def testReadEmptyStore(self):
+        self.assertEqual(len(rs.ResultsStore(SAMPLE_STORE_DIRECTORY).ReadRunsColumns()[rs.RUN_ID_COLUMN]), 0)
+
+    def testWrongChunkSize(self):
+        self.assertRaises(ValueError, rs.ResultsStore, SAMPLE_STORE_DIRECTORY, 0)
+
+
+class TestResultsImport(unittest.TestCase):
+    sample_file_path: str = f"{SAMPLE_RESULTS_DIRECTORY}/Scenariusz 3 - wyniki 20230601-120000.txt"
+
+    def setUp(self):
+        os.makedirs(SAMPLE_RESULTS_DIRECTORY, exist_ok=True)
+        with open(self.sample_file_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_RESULTS_FILE_CONTENTS)
+
+    def tearDown(self):
+        shutil.rmtree(SAMPLE_RESULTS_DIRECTORY, ignore_errors=True)
+        shutil.rmtree(SAMPLE_STORE_DIRECTORY, ignore_errors=True)
+
+    def testReadRunFromResultsFile(self):
+        self.assertEqual(
+            rs.ReadRunFromResultsFile(self.sample_file_path),
+            rs.RunRecord(
+                "Scenariusz 3", rs.UNKNOWN_SEED, rs.UNKNOWN_SEED, sim.SimulationResultsTuple(12, 7.5, 104, 59.25),
+                -26.78, [sim.SolutionRecord(1, 5, "K01 138", "1-5", 30), sim.SolutionRecord(2, 2, "S02 214", "2-6", 41)]
+            )
+        )
+
+    def testReadRunFromIncompleteResultsFile(self):
+        with open(self.sample_file_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(SAMPLE_RESULTS_FILE_CONTENTS.splitlines()[:4] + ["", "Rozwiązanie"]))
+
+        self.assertRaises(ValueError, rs.ReadRunFromResultsFile, self.sample_file_path)
+
+    def testImportResultsDirectory(self):
+        results_store: rs.ResultsStore = rs.ResultsStore(SAMPLE_STORE_DIRECTORY)
+
+        self.assertEqual(rs.ImportResultsDirectory(SAMPLE_RESULTS_DIRECTORY, results_store), 1)
+        self.assertEqual(len(results_store.ReadSolutionColumns()[rs.RUN_ID_COLUMN]), 2)
+        self.assertEqual(results_store.ReadRunsColumns()["total_simulation_time_minutes"][0], 104)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -147,6 +147,49 @@ class TestScenario(unittest.TestCase):
 
         self.assertEqual(self.sample_scenario.address, sample_address)
 
+    def testFromParts(self):
+        sample_hospital, sample_teams, sample_victims, sample_address = CreateSampleScenarioData()
+        sample_scenario: scenario.Scenario = scenario.Scenario.FromParts(
+            [sample_hospital], sample_teams, sample_victims, sample_address
+        )
+
+        self.assertEqual(sample_scenario.hospitals, [sample_hospital])
+        self.assertIs(sample_scenario.victims, sample_victims)
+        self.assertEqual(sample_scenario.address, sample_address)
+
+
+class TestScenarioTemplate(unittest.TestCase):
+    sample_template: scenario.ScenarioTemplate
+
+    def setUp(self):
+        self.sample_template = scenario.ScenarioTemplate("../Scenariusze/Scenariusz 1.txt")
+
+    def testInstantiateEqualToParsedScenario(self):
+        parsed_scenario: scenario.Scenario = scenario.Scenario("../Scenariusze/Scenariusz 1.txt")
+        instantiated_scenario: scenario.Scenario = self.sample_template.Instantiate()
+
+        self.assertEqual(instantiated_scenario.hospitals, parsed_scenario.hospitals)
+        self.assertEqual(instantiated_scenario.teams, parsed_scenario.teams)
+        self.assertEqual(instantiated_scenario.victims, parsed_scenario.victims)
+        self.assertEqual(instantiated_scenario.address, parsed_scenario.address)
+
+    def testInstantiateCreatesIndependentObjects(self):
+        first_scenario: scenario.Scenario = self.sample_template.Instantiate()
+        first_scenario.hospitals[0].departments[0].current_beds_count -= 1
+        first_scenario.victims[0].current_state.triage_colour = victim.TriageColour.BLACK
+        first_scenario.teams[0].are_specialists_outside = True
+        second_scenario: scenario.Scenario = self.sample_template.Instantiate()
+
+        self.assertEqual(second_scenario.hospitals, [CreateSampleHospital()])
+        self.assertEqual(second_scenario.victims, tests_sor.CreateSampleVictims())
+        self.assertEqual(second_scenario.teams, CreateSampleTeams())
+
+    def testGetScenarioTemplateShared(self):
+        self.assertIs(
+            scenario.GetScenarioTemplate("../Scenariusze/Scenariusz 1.txt"),
+            scenario.GetScenarioTemplate("../Scenariusze/Scenariusz 1.txt")
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
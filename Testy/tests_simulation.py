@@ -3,8 +3,10 @@ import random
 from typing import List, Optional, Tuple
 import unittest
 
+import scenario_classes as sc
 import simulation as sim
 import sor_classes as sor
+import travel_time_matrix as ttm
 import utilities as util
 import victim_classes as victim
 import zrm_classes as zrm
@@ -93,6 +95,47 @@ class TestSimulation(unittest.TestCase):
         self.assertTrue(results in possible_results)
         self.assertEqual(len(simulation.solution) + results.dead_victims_count, len(simulation.all_victims))
 
+    def testPerformSimulationFastForwardSameResults(self):
+        for seed in range(3):
+            random.seed(seed)
+            simulation: sim.Simulation = sim.Simulation("../Scenariusze/Scenariusz 2.txt", fast_forward=False)
+            results: sim.SimulationResultsTuple = simulation.PerformSimulation()
+            random.seed(seed)
+            fast_forward_simulation: sim.Simulation = sim.Simulation("../Scenariusze/Scenariusz 2.txt")
+
+            self.assertEqual(fast_forward_simulation.PerformSimulation(), results)
+            self.assertEqual(fast_forward_simulation.solution, simulation.solution)
+
+    def testPerformSimulationFromScenarioTemplateSameResults(self):
+        scenario_template: sc.ScenarioTemplate = sc.ScenarioTemplate("../Scenariusze/Scenariusz 2.txt")
+        for seed in range(2):
+            random.seed(seed)
+            simulation: sim.Simulation = sim.Simulation("../Scenariusze/Scenariusz 2.txt")
+            results: sim.SimulationResultsTuple = simulation.PerformSimulation()
+            random.seed(seed)
+            template_simulation: sim.Simulation = sim.Simulation(scenario_template)
+
+            self.assertEqual(template_simulation.PerformSimulation(), results)
+            self.assertEqual(template_simulation.solution, simulation.solution)
+
+    def testGetMinutesUntilNextEvent(self):
+        self.assertEqual(self.simulation.GetMinutesUntilNextEvent(), 30)
+
+        first_team: zrm.ZRM = self.simulation.SendOutNTeamsToTheIncidentReturnFirst(self.simulation.incidents[0], 1)
+        first_team.time_until_destination_in_minutes = 12
+        self.assertEqual(self.simulation.GetMinutesUntilNextEvent(), 12)
+
+        first_team.time_until_destination_in_minutes = 0
+        self.assertEqual(self.simulation.GetMinutesUntilNextEvent(), 1)
+
+    def testFastForward(self):
+        first_team: zrm.ZRM = self.simulation.SendOutNTeamsToTheIncidentReturnFirst(self.simulation.incidents[0], 1)
+        first_team.time_until_destination_in_minutes = 12
+        self.simulation.FastForward()
+
+        self.assertEqual(self.simulation.elapsed_simulation_time, 11)
+        self.assertEqual(first_team.time_until_destination_in_minutes, 1)
+
     def testSendOutNTeamsToTheIncidentReturnFirstLessThanMaxTeams(self):
         sample_reported_victims_count: int = 15
         self.simulation.incidents[0].reported_victims_count = sample_reported_victims_count
@@ -170,6 +213,53 @@ class TestSimulation(unittest.TestCase):
             sample_teams_times_to_reach_incident
         )
 
+    def testGetNIdleTeamsAndTimesToReachTheAddressAscendingSpatialIndex(self):
+        for team_id in ["K01 47", "K01 100", "S02 348"]:
+            self.simulation.TeamIntoAction(self.simulation.GetTeamById(team_id))
+        self.simulation.spatial_index_min_teams_count = 0
+
+        for n_teams in [1, 5, 20]:
+            self.assertEqual(
+                self.simulation.GetNIdleTeamsAndTimesToReachTheAddressAscending(
+                    self.simulation.incidents[0].address, n_teams
+                ),
+                self.simulation.GetTeamsWithoutQueueAndTimesToReachTheAddressAscending(
+                    self.simulation.idle_teams, self.simulation.incidents[0].address
+                )[:n_teams]
+            )
+
+    def testGetNIdleTeamsAndTimesToReachTheAddressAscendingUnboundedDurations(self):
+        self.simulation.spatial_index_min_teams_count = 0
+        travel_time_matrix: ttm.TravelTimeMatrix = ttm.GetTravelTimeMatrix()
+        travel_time_matrix.has_durations_below_straight_line_bound = True
+        # Bez przycinania indeks przestrzenny nie jest używany
+        self.simulation.places_spatial_index = None
+        results = self.simulation.GetNIdleTeamsAndTimesToReachTheAddressAscending(
+            self.simulation.incidents[0].address, 5
+        )
+        travel_time_matrix.has_durations_below_straight_line_bound = False
+
+        self.assertEqual(
+            results,
+            self.simulation.GetTeamsWithoutQueueAndTimesToReachTheAddressAscending(
+                self.simulation.idle_teams, self.simulation.incidents[0].address
+            )[:5]
+        )
+
+    def testPerformSimulationSpatialIndexSameResults(self):
+        for scenario_path in ["../Scenariusze/Scenariusz 2.txt", "../Scenariusze/Scenariusz 8.txt"]:
+            for seed in range(2):
+                random.seed(seed)
+                simulation: sim.Simulation = sim.Simulation(scenario_path)
+                simulation.spatial_index_min_teams_count = len(simulation.idle_teams) + 1
+                results: sim.SimulationResultsTuple = simulation.PerformSimulation()
+                random.seed(seed)
+                indexed_simulation: sim.Simulation = sim.Simulation(scenario_path)
+                indexed_simulation.spatial_index_min_teams_count = 0
+
+                self.assertEqual(indexed_simulation.PerformSimulation(), results)
+                self.assertEqual(indexed_simulation.solution, simulation.solution)
+
     def MakeIdleTeamClosestToTargetLocation(self, target_location: zrm.TargetDestination, team_id: str = None) \
             -> zrm.ZRM:
         if not team_id:
@@ -280,6 +280,13 @@ class HospitalTests(unittest.TestCase):
 
         self.assertEqual(self.sample_hospital.IsVictimInIncomingVictims(sample_victims[3]), False)
 
+    def testIsVictimInIncomingVictimsComparesIds(self):
+        sample_victims: List[victim.Victim] = CreateSampleVictims()
+        self.sample_hospital.incoming_victims[self.sample_departments[0].id_] = [sample_victims[0]]
+        sample_victims[0].current_RPM_number -= 1
+
+        self.assertEqual(self.sample_hospital.IsVictimInIncomingVictims(CreateSampleVictims()[0]), True)
+
     def testRemoveVictimFromIncomingNoSuchVictim(self):
         sample_victim, sample_victim_2 = CreateSampleVictims()[:2]
         prev_incoming_victims = self.sample_hospital.incoming_victims = {
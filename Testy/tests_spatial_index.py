@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import math
+import random
+import unittest
+from typing import List, Tuple
+
+import distance_store as dist
+import spatial_index as spatial
+import travel_time_estimator as tte
+import utilities
+
+
+def CreateSamplePlaces() -> List[utilities.PlaceAddress]:
+    random_generator: random.Random = random.Random(0)
+    return [
+        utilities.PlaceAddress(
+            "Testowa", str(i), "00-000", "Testowo",
+            latitude=random_generator.uniform(49.8, 50.4), longitude=random_generator.uniform(18.8, 19.8)
+        )
+        for i in range(40)
+    ]
+
+
+class TestSpatialIndex(unittest.TestCase):
+    sample_places: List[utilities.PlaceAddress]
+    sample_index: spatial.SpatialIndex
+
+    def setUp(self):
+        self.sample_places = CreateSamplePlaces()
+        self.sample_index = spatial.SpatialIndex(self.sample_places)
+
+    def testIterateNearestPlaces(self):
+        query_address: utilities.PlaceAddress = self.sample_places[7]
+        query_point: spatial.ProjectedPoint = self.sample_index.ProjectCoordinates(query_address)
+        brute_force_distances: List[float] = sorted(
+            math.dist(query_point, self.sample_index.ProjectCoordinates(place)) for place in self.sample_places
+        )
+        results: List[Tuple[float, utilities.PlaceAddress]] = list(
+            self.sample_index.IterateNearestPlaces(query_address)
+        )
+
+        self.assertEqual(len(results), len(self.sample_places))
+        self.assertEqual(results[0], (0.0, query_address))
+        for (distance, _), brute_force_distance in zip(results, brute_force_distances):
+            self.assertAlmostEqual(distance, brute_force_distance)
+
+    def testQueryKNearestPlaces(self):
+        nearest_places: List[utilities.PlaceAddress] = self.sample_index.QueryKNearestPlaces(self.sample_places[3], 4)
+
+        self.assertEqual(len(nearest_places), 4)
+        self.assertEqual(nearest_places[0], self.sample_places[3])
+
+    def testDuplicatePlacesIndexedOnce(self):
+        self.assertEqual(len(spatial.SpatialIndex(self.sample_places + self.sample_places[:5]).places), 40)
+
+    def testEmptyIndex(self):
+        self.assertEqual(spatial.SpatialIndex([]).QueryKNearestPlaces(self.sample_places[0], 3), [])
+
+    def testProjectedDistance(self):
+        # Jeden stopień szerokości geograficznej to około 111,2 km
+        sample_address: utilities.PlaceAddress = utilities.PlaceAddress(
+            "Testowa", "1", "00-000", "Testowo", latitude=51.0, longitude=19.0
+        )
+        sample_address_2: utilities.PlaceAddress = utilities.PlaceAddress(
+            "Testowa", "2", "00-000", "Testowo", latitude=50.0, longitude=19.0
+        )
+
+        self.assertAlmostEqual(
+            math.dist(self.sample_index.ProjectCoordinates(sample_address),
+                      self.sample_index.ProjectCoordinates(sample_address_2)),
+            111.2, delta=0.1
+        )
+
+
+class TestDurationsBound(unittest.TestCase):
+    def testAreDurationsBoundedByStraightLineDefault(self):
+        self.assertTrue(spatial.AreDurationsBoundedByStraightLine())
+
+    def testAreDurationsBoundedByStraightLineNegativeIntercept(self):
+        previous_settings = tte.UseTravelTimeEstimator(
+            tte.TravelTimeEstimator(duration_intercept=-2.0), tte.EstimationMode.FALLBACK
+        )
+        results: bool = spatial.AreDurationsBoundedByStraightLine()
+        tte.UseTravelTimeEstimator(*previous_settings)
+
+        self.assertFalse(results)
+
+    def testAreDurationsBoundedByStraightLineReverseDirectionShortened(self):
+        distance_store: dist.DistanceStore = dist.GetDistanceStore()
+        previous_fallback: Tuple[bool, float] = (
+            distance_store.reverse_direction_fallback, distance_store.asymmetry_factor
+        )
+        distance_store.SetReverseDirectionFallback(True, asymmetry_factor=1.2)
+        longer_reverse_results: bool = spatial.AreDurationsBoundedByStraightLine()
+        distance_store.SetReverseDirectionFallback(True, asymmetry_factor=0.8)
+        shorter_reverse_results: bool = spatial.AreDurationsBoundedByStraightLine()
+        distance_store.SetReverseDirectionFallback(*previous_fallback)
+
+        self.assertTrue(longer_reverse_results)
+        self.assertFalse(shorter_reverse_results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import unittest
+from typing import Dict, Tuple
+
+import distance_store as dist
+import tests_utilities as tests_util
+import travel_time_estimator as tte
+import utilities
+
+
+def CreateSamplePlacesCoordinates() -> Dict[str, tte.Coordinates]:
+    return {"A": (50.0, 19.0), "B": (50.0, 19.1), "C": (50.1, 19.0)}
+
+
+def CreateSampleDistances() -> Dict[Tuple[str, str], Tuple[float, float]]:
+    places_coordinates: Dict[str, tte.Coordinates] = CreateSamplePlacesCoordinates()
+    return {
+        (origin, destination): (
+            1.5 * tte.HaversineDistance(places_coordinates[origin], places_coordinates[destination]),
+            2.0 + 1.5 * tte.HaversineDistance(places_coordinates[origin], places_coordinates[destination])
+        )
+        for origin, destination in [("A", "B"), ("A", "C"), ("B", "C")]
+    }
+
+
+class TestTravelTimeEstimator(unittest.TestCase):
+    sample_estimator: tte.TravelTimeEstimator
+
+    def setUp(self):
+        self.sample_estimator = tte.TravelTimeEstimator()
+
+    def testHaversineDistance(self):
+        # Jeden stopień szerokości geograficznej to około 111,2 km
+        self.assertAlmostEqual(tte.HaversineDistance((50.0, 19.0), (51.0, 19.0)), 111.19, delta=0.01)
+        self.assertEqual(tte.HaversineDistance((50.0, 19.0), (50.0, 19.0)), 0)
+
+    def testFit(self):
+        fit_statistics: tte.FitStatistics = self.sample_estimator.Fit(
+            CreateSampleDistances(), CreateSamplePlacesCoordinates()
+        )
+
+        self.assertEqual(fit_statistics.pairs_count, 3)
+        self.assertAlmostEqual(self.sample_estimator.circuity_factor, 1.5)
+        self.assertAlmostEqual(self.sample_estimator.minutes_per_km, 1.0)
+        self.assertAlmostEqual(self.sample_estimator.duration_intercept, 2.0)
+        self.assertAlmostEqual(fit_statistics.duration_rmse, 0)
+
+    def testFitNotEnoughPairs(self):
+        self.assertRaises(RuntimeError, self.sample_estimator.Fit, CreateSampleDistances(), {})
+
+    def testFitSamePlacesCoordinates(self):
+        same_places_coordinates: Dict[str, tte.Coordinates] = {place: (50.0, 19.0) for place in ["A", "B", "C"]}
+
+        self.assertRaises(RuntimeError, self.sample_estimator.Fit, CreateSampleDistances(), same_places_coordinates)
+
+    def testIsDurationAtLeast(self):
+        self.assertTrue(tte.TravelTimeEstimator(1.3, 0.0, 1.2).IsDurationAtLeast(60 / 140))
+        self.assertFalse(tte.TravelTimeEstimator(1.3, -1.0, 1.2).IsDurationAtLeast(60 / 140))
+        self.assertFalse(tte.TravelTimeEstimator(1.0, 0.0, 0.3).IsDurationAtLeast(60 / 140))
+
+    def testEstimateDistanceAndDurationSamePlace(self):
+        self.assertEqual(self.sample_estimator.EstimateDistanceAndDuration((50.0, 19.0), (50.0, 19.0)), (0, 0))
+
+    def testFromDistanceStore(self):
+        estimator: tte.TravelTimeEstimator = tte.TravelTimeEstimator.FromDistanceStore(dist.DistanceStore())
+        sample_distance, sample_duration = tests_util.CreateSampleDistanceAndDurationData()
+        results = estimator.EstimateDistanceAndDuration(
+            (tests_util.CreateSampleAddressHospital().latitude, tests_util.CreateSampleAddressHospital().longitude),
+            (tests_util.CreateSampleAddressIncident().latitude, tests_util.CreateSampleAddressIncident().longitude)
+        )
+
+        self.assertGreater(estimator.fit_statistics.pairs_count, 0)
+        self.assertAlmostEqual(results[0], sample_distance, delta=estimator.fit_statistics.distance_rmse)
+        self.assertAlmostEqual(results[1], sample_duration, delta=2 * estimator.fit_statistics.duration_rmse)
+
+    def testUseTravelTimeEstimatorPrimary(self):
+        self.sample_estimator.Fit(CreateSampleDistances(), CreateSamplePlacesCoordinates())
+        previous_settings = tte.UseTravelTimeEstimator(self.sample_estimator, tte.EstimationMode.PRIMARY)
+        sample_address: utilities.PlaceAddress = utilities.PlaceAddress(
+            "Testowa", "1", "00-000", "Testowo", latitude=50.0, longitude=19.0
+        )
+        sample_address_2: utilities.PlaceAddress = utilities.PlaceAddress(
+            "Testowa", "2", "00-000", "Testowo", latitude=50.0, longitude=19.1
+        )
+        results = sample_address.GetDistanceAndDurationToOtherPlace(sample_address_2)
+        tte.UseTravelTimeEstimator(*previous_settings)
+
+        self.assertEqual(results, self.sample_estimator.EstimateDistanceAndDuration((50.0, 19.0), (50.0, 19.1)))
+        self.assertFalse(dist.GetDistanceStore().IsPairPresent(
+            sample_address.address_for_api_requests, sample_address_2.address_for_api_requests
+        ))
+        self.assertEqual(tte.GetTravelTimeEstimator(), (None, tte.EstimationMode.DISABLED))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+from typing import List
+
+import numpy as np
+
+import tests_utilities as tests_util
+import travel_time_matrix as ttm
+import utilities
+
+
+class TestTravelTimeMatrix(unittest.TestCase):
+    sample_matrix: ttm.TravelTimeMatrix
+    sample_address: utilities.PlaceAddress
+    sample_address_2: utilities.PlaceAddress
+
+    def setUp(self):
+        self.sample_matrix = ttm.TravelTimeMatrix(capacity=2)
+        self.sample_address = tests_util.CreateSampleAddressHospital()
+        self.sample_address_2 = tests_util.CreateSampleAddressIncident()
+
+    def testGetPlaceId(self):
+        self.assertEqual(self.sample_matrix.GetPlaceId(self.sample_address), 0)
+        self.assertEqual(self.sample_matrix.GetPlaceId(self.sample_address_2), 1)
+        self.assertEqual(self.sample_matrix.GetPlaceId(tests_util.CreateSampleAddressHospital()), 0)
+        self.assertEqual(self.sample_address_2.place_id, 1)
+
+    def testIncreaseCapacity(self):
+        sample_addresses: List[utilities.PlaceAddress] = [
+            utilities.PlaceAddress("Testowa", str(i), "00-000", "Testowo", latitude=50.0, longitude=19.0)
+            for i in range(5)
+        ]
+        for address in sample_addresses:
+            self.sample_matrix.GetPlaceId(address)
+
+        self.assertEqual(self.sample_matrix.durations.shape, (8, 8))
+        self.assertTrue(np.all(np.diag(self.sample_matrix.durations)[:5] == 0))
+
+    def testBuild(self):
+        self.sample_matrix.Build([self.sample_address, self.sample_address_2, tests_util.CreateSampleAddressHospital()])
+
+        self.assertEqual(len(self.sample_matrix.places), 2)
+        self.assertAlmostEqual(
+            self.sample_matrix.durations[0, 1], tests_util.CreateSampleDistanceAndDurationData()[1], delta=1
+        )
+
+    def testGetDistanceAndDuration(self):
+        self.assertEqual(
+            self.sample_matrix.GetDistanceAndDuration(self.sample_address, self.sample_address_2),
+            self.sample_address.GetDistanceAndDurationToOtherPlace(self.sample_address_2)
+        )
+        self.assertEqual(self.sample_matrix.GetKnownPairsCount(), 3)
+
+    def testGetDurationsToDestination(self):
+        durations: np.ndarray = self.sample_matrix.GetDurationsToDestination(
+            [self.sample_address, self.sample_address_2], self.sample_address_2
+        )
+
+        self.assertEqual(durations.tolist(), [
+            self.sample_address.GetDistanceAndDurationToOtherPlace(self.sample_address_2)[1], 0
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
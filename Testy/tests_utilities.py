@@ -4,6 +4,7 @@ import pandas as pd
 import unittest
 from typing import Dict, Tuple
 
+import distance_store
 import utilities
 
 
@@ -75,6 +76,17 @@ class TestPlaceAddress(unittest.TestCase):
 
         self.assertEqual(utilities.PlaceAddress.FromString(sample_address_string), self.sample_address)
 
+    def testFromStringSharedInstance(self):
+        sample_address: utilities.PlaceAddress = utilities.PlaceAddress.FromString("Topolowa 16 32-500 Chrzanów")
+
+        self.assertIs(utilities.PlaceAddress.FromString("Topolowa  16, 32-500 Chrzanów"), sample_address)
+        self.assertEqual(hash(sample_address), hash(self.sample_address))
+
+    def testNormalizeAddressString(self):
+        self.assertEqual(
+            utilities.NormalizeAddressString(" Topolowa 16,  32-500 Chrzanów "), "Topolowa 16 32-500 Chrzanów"
+        )
+
     def testDivideAddressIntoParts(self):
         sample_address_parts: Tuple[str, str, str, str] = ("30 Maja 1960r.", "9B", "65-072", "Zielona Góra")
 
@@ -282,6 +294,30 @@ class TestPlaceAddress(unittest.TestCase):
             )
         )
         os.remove(sample_filename)
+        os.remove("test_dziennik.jsonl")
+
+    def testSaveDistanceAndDurationToFileUsesCurrentDistanceStore(self):
+        sample_address_2: utilities.PlaceAddress = CreateSampleAddressHospital2()
+        sample_filename: str = "test.json"
+        open(sample_filename, "w", encoding="utf-8").close()
+        previous_store: distance_store.DistanceStore = distance_store.SetDistanceStore(
+            distance_store.DistanceStore(sample_filename)
+        )
+        self.sample_address.SaveDistanceAndDurationToFile(1.0, 2.0, sample_address_2, sample_filename)
+        self.sample_address.SaveDistanceAndDurationToFile(1.0, 2.0, sample_address_2, sample_filename)
+        current_store: distance_store.DistanceStore = distance_store.SetDistanceStore(previous_store)
+        with open("test_dziennik.jsonl", encoding="utf-8") as journal:
+            journal_lines = journal.readlines()
+        os.remove(sample_filename)
+        os.remove("test_dziennik.jsonl")
+
+        self.assertEqual(len(journal_lines), 1)
+        self.assertEqual(
+            current_store.ReadDistanceAndDuration(
+                self.sample_address.address_for_api_requests, sample_address_2.address_for_api_requests
+            ),
+            (1.0, 2.0)
+        )
 
     def testIsDistancePresentInTheFile(self):
         sample_address_2: utilities.PlaceAddress = CreateSampleAddressIncident()
@@ -338,6 +338,52 @@ class VictimClassTests(unittest.TestCase):
         self.assertEqual(self.sample_victim.GetCurrentCriticalHealthProblems(), set())
 
 
+class DeteriorationSchedulerTests(unittest.TestCase):
+    sample_victims: List[victim.Victim]
+    sample_scheduler: victim.DeteriorationScheduler
+
+    def setUp(self):
+        self.sample_victims = [victim.Victim(i + 1, CreateStatesForSampleVictim()) for i in range(3)]
+        self.sample_scheduler = victim.DeteriorationScheduler(self.sample_victims)
+
+    def testInitSkipsAdmittedVictims(self):
+        self.sample_victims[0].AdmitToHospital(10)
+
+        self.assertEqual(
+            list(victim.DeteriorationScheduler(self.sample_victims).not_admitted_victims.values()),
+            self.sample_victims[1:]
+        )
+
+    def testGetNextDeteriorationTime(self):
+        self.assertEqual(victim.DeteriorationScheduler.GetNextDeteriorationTime(0), 30)
+        self.assertEqual(victim.DeteriorationScheduler.GetNextDeteriorationTime(29), 30)
+        self.assertEqual(victim.DeteriorationScheduler.GetNextDeteriorationTime(30), 60)
+
+    def testLowerRPMOfNotAdmittedVictimsWrongInterval(self):
+        RPM_before: int = self.sample_victims[0].current_RPM_number
+        self.sample_scheduler.LowerRPMOfNotAdmittedVictims(victim.RPM_DETERIORATION_INTERVAL_MINUTES + 1)
+
+        self.assertEqual([victim_.current_RPM_number for victim_ in self.sample_victims], [RPM_before] * 3)
+
+    def testLowerRPMOfNotAdmittedVictims(self):
+        RPM_before: int = self.sample_victims[0].current_RPM_number
+        RPM_number_after_one_interval: int = 4  # od RPM = 6
+        self.sample_victims[1].AdmitToHospital(10)
+        self.sample_scheduler.LowerRPMOfNotAdmittedVictims(victim.RPM_DETERIORATION_INTERVAL_MINUTES)
+
+        self.assertEqual(
+            [victim_.current_RPM_number for victim_ in self.sample_victims],
+            [RPM_number_after_one_interval, RPM_before, RPM_number_after_one_interval]
+        )
+        self.assertEqual(list(self.sample_scheduler.not_admitted_victims), [1, 3])
+
+    def testRemoveAdmittedVictim(self):
+        self.sample_scheduler.RemoveAdmittedVictim(self.sample_victims[2])
+        self.sample_scheduler.RemoveAdmittedVictim(self.sample_victims[2])
+
+        self.assertEqual(list(self.sample_scheduler.not_admitted_victims), [1, 2])
+
+
 def CreateSampleStateLines() -> List[str]:
     sample_profile_file: str = "../Profile pacjentów/Czerwony/Profil5.txt"
     with open(sample_profile_file, encoding="utf-8") as f:
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from typing import List
+
+import victim_classes as victim
+import victim_collections as vc
+import tests_victim_classes as tests_victim
+
+
+def CreateSampleVictimsWithRPM(RPM_numbers: List[int]) -> List[victim.Victim]:
+    sample_victims: List[victim.Victim] = []
+    for i, RPM_number in enumerate(RPM_numbers):
+        sample_victim: victim.Victim = victim.Victim(i + 1, tests_victim.CreateStatesForSampleVictim())
+        sample_victim.current_RPM_number = RPM_number
+        sample_victims.append(sample_victim)
+    return sample_victims
+
+
+class VictimsCollectionTests(unittest.TestCase):
+    sample_victims: List[victim.Victim]
+    sample_collection: vc.VictimsCollection
+
+    def setUp(self):
+        self.sample_victims = CreateSampleVictimsWithRPM([7, 5, 9, 5])
+        self.sample_collection = vc.VictimsCollection(self.sample_victims)
+
+    def testRemoveKeepsListOrder(self):
+        self.sample_collection.remove(self.sample_victims[1])
+
+        self.assertEqual(self.sample_collection[:], [self.sample_victims[0]] + self.sample_victims[2:])
+        self.assertEqual(self.sample_collection[1], self.sample_victims[2])
+
+    def testIndexingAfterRemovingDuplicateEntry(self):
+        self.sample_collection.append(self.sample_victims[0])
+        self.sample_collection.remove(self.sample_victims[0])
+
+        self.assertEqual(list(self.sample_collection), self.sample_victims[1:] + [self.sample_victims[0]])
+        self.assertEqual(self.sample_collection[-1], self.sample_victims[0])
+        self.assertEqual(self.sample_collection.ordered_entries, [1, 2, 3, 4])
+
+    def testRandomChoiceSameAsList(self):
+        sample_list: List[victim.Victim] = list(self.sample_victims)
+        self.sample_collection.remove(self.sample_victims[2])
+        sample_list.remove(self.sample_victims[2])
+
+        self.assertEqual(random.Random(5).choice(self.sample_collection), random.Random(5).choice(sample_list))
+
+    def testContainsComparesIds(self):
+        other_victim: victim.Victim = CreateSampleVictimsWithRPM([1])[0]
+
+        self.assertTrue(other_victim in self.sample_collection)
+        self.assertFalse(CreateSampleVictimsWithRPM([1] * 5)[4] in self.sample_collection)
+
+
+class TransportReadyVictimsQueueTests(unittest.TestCase):
+    sample_victims: List[victim.Victim]
+    sample_queue: vc.TransportReadyVictimsQueue
+
+    def setUp(self):
+        self.sample_victims = CreateSampleVictimsWithRPM([7, 5, 9, 5])
+        self.sample_queue = vc.TransportReadyVictimsQueue(self.sample_victims)
+
+    def PopAll(self) -> List[victim.Victim]:
+        popped_victims: List[victim.Victim] = []
+        while self.sample_queue:
+            popped_victims.append(self.sample_queue.PopFirst())
+        return popped_victims
+
+    def testListOperations(self):
+        self.assertEqual(len(self.sample_queue), 4)
+        self.assertTrue(self.sample_victims[2] in self.sample_queue)
+        self.assertEqual(self.sample_queue[:], self.sample_victims)
+
+        self.sample_queue.remove(self.sample_victims[2])
+        self.assertFalse(self.sample_victims[2] in self.sample_queue)
+        self.assertRaises(ValueError, self.sample_queue.remove, self.sample_victims[2])
+
+    def testPopFirstStableByRPM(self):
+        self.sample_queue.SortByRPM()
+
+        self.assertEqual(self.PopAll(), [self.sample_victims[i] for i in [1, 3, 0, 2]])
+        self.assertIsNone(self.sample_queue.PopFirst())
+
+    def testDuplicatedVictim(self):
+        self.sample_queue.append(self.sample_victims[2])
+        self.sample_queue.remove(self.sample_victims[2])
+
+        self.assertTrue(self.sample_victims[2] in self.sample_queue)
+        self.assertEqual(len(self.sample_queue), 4)
+
+    def testSortByRPMAfterRPMChanged(self):
+        """Remisy po zmianie RPM rozstrzyga kolejność z poprzedniego sortowania, a nie kolejność dodania"""
+        self.sample_queue.SortByRPM()
+        late_victim: victim.Victim = CreateSampleVictimsWithRPM([1, 1, 1, 1, 1])[-1]
+        self.sample_queue.append(late_victim)
+        for sample_victim in self.sample_victims + [late_victim]:
+            sample_victim.current_RPM_number = 3
+        self.sample_queue.MarkRPMChanged()
+        self.sample_queue.SortByRPM()
+
+        self.assertEqual(self.PopAll(), [self.sample_victims[i] for i in [1, 3, 0, 2]] + [late_victim])
+
+    def testSortByRPMWithoutMarkKeepsKeys(self):
+        self.sample_victims[2].current_RPM_number = 1
+        self.sample_queue.SortByRPM()
+
+        self.assertEqual(self.sample_queue.PeekFirst(), self.sample_victims[1])
+
+
+class AssessedVictimsTests(unittest.TestCase):
+    sample_victims: List[victim.Victim]
+    sample_assessed_victims: vc.AssessedVictims
+
+    def setUp(self):
+        self.sample_victims = CreateSampleVictimsWithRPM([7, 5, 9, 5])
+        self.sample_victims[2].current_state.triage_colour = victim.TriageColour.YELLOW
+        self.sample_assessed_victims = vc.AssessedVictims(self.sample_victims)
+
+    def testPeekBest(self):
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.RED), self.sample_victims[1])
+        self.assertIsNone(self.sample_assessed_victims.PeekBest(victim.TriageColour.GREEN))
+
+    def testPeekBestSkipsVictimsUnderProcedureAndRemoved(self):
+        self.sample_victims[1].under_procedure = True
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.RED), self.sample_victims[3])
+
+        self.sample_assessed_victims.remove(self.sample_victims[3])
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.RED), self.sample_victims[0])
+
+    def testRefreshVictim(self):
+        self.sample_victims[1].under_procedure = True
+        self.sample_assessed_victims.PeekBest(victim.TriageColour.RED)
+        self.sample_victims[1].under_procedure = False
+        self.sample_assessed_victims.RefreshVictim(self.sample_victims[1])
+
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.RED), self.sample_victims[1])
+
+    def testMarkRPMChanged(self):
+        self.sample_victims[0].current_RPM_number = 1
+        self.sample_victims[3].current_state.triage_colour = victim.TriageColour.BLACK
+        self.sample_assessed_victims.MarkRPMChanged()
+
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.RED), self.sample_victims[0])
+        self.assertEqual(self.sample_assessed_victims.PeekBest(victim.TriageColour.YELLOW), self.sample_victims[2])
+
+    def testAnyVictimWaitingForProcedure(self):
+        self.assertTrue(self.sample_assessed_victims.AnyVictimWaitingForProcedure())
+
+        for sample_victim in self.sample_victims:
+            sample_victim.under_procedure = True
+        self.assertFalse(self.sample_assessed_victims.AnyVictimWaitingForProcedure())
+
+    def testCountersFollowProceduresAndRemovals(self):
+        self.assertEqual(self.sample_assessed_victims.waiting_victims_count, 4)
+        self.sample_victims[0].under_procedure = True
+        self.sample_assessed_victims.RefreshVictim(self.sample_victims[0])
+        self.assertEqual(self.sample_assessed_victims.waiting_victims_count, 3)
+        self.sample_victims[0].under_procedure = False
+        self.sample_assessed_victims.RefreshVictim(self.sample_victims[0])
+        self.assertEqual(self.sample_assessed_victims.waiting_victims_count, 4)
+
+        self.sample_assessed_victims.remove(self.sample_victims[1])
+        self.assertEqual(self.sample_assessed_victims.alive_victims_count, 3)
+        self.assertEqual(self.sample_assessed_victims.waiting_victims_count, 3)
+
+    def testCountersAfterDeathOnDeteriorationBoundary(self):
+        self.sample_victims[3].current_state.triage_colour = victim.TriageColour.BLACK
+        self.sample_assessed_victims.MarkRPMChanged()
+
+        self.assertEqual(self.sample_assessed_victims.alive_victims_count, 3)
+        self.assertEqual(self.sample_assessed_victims.waiting_victims_count, 3)
+
+    def testAnyAliveVictim(self):
+        self.assertTrue(self.sample_assessed_victims.AnyAliveVictim())
+        self.assertFalse(vc.AssessedVictims().AnyAliveVictim())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import math
+from typing import List
 import unittest
 
 import sor_classes as sor
@@ -116,6 +117,14 @@ class SpecialistTests(unittest.TestCase):
         self.assertEqual(target_victim.under_procedure, False)
         self.assertEqual(target_victim.procedures_performed_so_far, [sample_procedure])
 
+    def testContinuePerformingProcedureReturnsHelpedVictim(self):
+        target_victim: victim.Victim = tests_victim.CreateSampleVictim()
+        self.sample_specialist.StartPerformingProcedure(tests_victim.CreateSampleProcedure(), target_victim)
+        self.sample_specialist.time_until_procedure_is_finished = 2
+
+        self.assertIsNone(self.sample_specialist.ContinuePerformingProcedure())
+        self.assertIs(self.sample_specialist.ContinuePerformingProcedure(), target_victim)
+
 
 def CreateSampleZRM() -> zrm.ZRM:
     return zrm.ZRM(
@@ -305,12 +314,82 @@ class ZRMTests(unittest.TestCase):
         self.sample_zrm.SpecialistsLeaveTheVehicle()
         self.sample_zrm.specialists[0].StartPerformingProcedure(tests_victim.CreateSampleProcedure())
         time_needed_to_perform: int = tests_victim.CreateSampleProcedure().time_needed_to_perform
-        self.sample_zrm.SpecialistsContinuePerformingProcedures()
+        helped_victims = self.sample_zrm.SpecialistsContinuePerformingProcedures()
 
         self.assertEqual(
             self.sample_zrm.specialists[0].time_until_procedure_is_finished,
             time_needed_to_perform - 1
         )
+        self.assertEqual(helped_victims, [])
+
+    def testSkipMinutesWithoutEvents(self):
+        self.sample_zrm.StartDriving(self.sample_target_location)
+        time_until_destination: int = self.sample_zrm.time_until_destination_in_minutes
+        self.sample_zrm.SkipMinutesWithoutEvents(time_until_destination - 1)
+
+        self.assertEqual(self.sample_zrm.time_until_destination_in_minutes, 1)
+        self.assertRaises(RuntimeError, self.sample_zrm.SkipMinutesWithoutEvents, 1)
+
+    def testSkipMinutesWithoutEventsSpecialists(self):
+        self.sample_zrm.SpecialistsLeaveTheVehicle()
+        self.sample_zrm.specialists[0].StartPerformingProcedure(tests_victim.CreateSampleProcedure())
+        time_needed_to_perform: int = tests_victim.CreateSampleProcedure().time_needed_to_perform
+        self.sample_zrm.SkipMinutesWithoutEvents(time_needed_to_perform - 1)
+
+        self.assertEqual(self.sample_zrm.specialists[0].time_until_procedure_is_finished, 1)
+        self.assertEqual(self.sample_zrm.specialists[1].time_until_procedure_is_finished, None)
+        self.assertRaises(RuntimeError, self.sample_zrm.SkipMinutesWithoutEvents, 1)
+
+
+class TeamRegistryTests(unittest.TestCase):
+    sample_teams: List[zrm.ZRM]
+    sample_registry: zrm.TeamRegistry
+
+    def setUp(self):
+        self.sample_teams = [CreateSampleZRM(), CreateSampleZRM()]
+        self.sample_teams[1].id_ = BAD_TEAM_ID
+        self.sample_registry = zrm.TeamRegistry(self.sample_teams)
+
+    def testInit(self):
+        self.assertEqual(self.sample_registry.GetIdleTeams(), self.sample_teams)
+        self.assertEqual(self.sample_registry.GetTeamsInAction(), [])
+
+    def testInitDuplicatedId(self):
+        self.assertRaises(ValueError, zrm.TeamRegistry, [CreateSampleZRM(), CreateSampleZRM()])
+
+    def testGetTeamById(self):
+        self.assertIs(self.sample_registry.GetTeamById(BAD_TEAM_ID), self.sample_teams[1])
+        self.assertIsNone(self.sample_registry.GetTeamById("K01 99"))
+
+    def testTeamIntoAction(self):
+        self.sample_registry.TeamIntoAction(self.sample_teams[1])
+        self.sample_registry.TeamIntoAction(self.sample_teams[1])
+
+        self.assertEqual(self.sample_registry.GetIdleTeams(), self.sample_teams[:1])
+        self.assertEqual(self.sample_registry.GetTeamsInAction(), self.sample_teams[1:])
+        self.assertFalse(self.sample_registry.IsIdle(BAD_TEAM_ID))
+        self.assertTrue(self.sample_registry.AnyIdleTeams())
+
+    def testIdleTeamsAtPlace(self):
+        place_key: str = self.sample_teams[0].origin_location_address.address_for_api_requests
+
+        self.assertEqual(list(self.sample_registry.GetIdleTeamsPlacesKeys()), [place_key])
+        self.assertEqual(list(self.sample_registry.GetIdleTeamsAtPlace(place_key)), self.sample_teams)
+        self.assertEqual(self.sample_registry.GetTeamOrder(BAD_TEAM_ID), 1)
+
+        self.sample_registry.TeamIntoAction(self.sample_teams[0])
+        self.assertEqual(list(self.sample_registry.GetIdleTeamsAtPlace(place_key)), self.sample_teams[1:])
+
+        self.sample_registry.TeamIntoAction(self.sample_teams[1])
+        self.assertEqual(list(self.sample_registry.GetIdleTeamsPlacesKeys()), [])
+        self.assertEqual(list(self.sample_registry.GetIdleTeamsAtPlace(place_key)), [])
+
+    def testTeamIntoActionEqualTeam(self):
+        equal_team: zrm.ZRM = CreateSampleZRM()
+        self.sample_registry.TeamIntoAction(equal_team)
+
+        self.assertIs(self.sample_registry.GetTeamById(equal_team.id_), equal_team)
+        self.assertIs(self.sample_registry.GetTeamsInAction()[0], equal_team)
 
 
 if __name__ == '__main__':